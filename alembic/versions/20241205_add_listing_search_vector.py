@@ -0,0 +1,46 @@
+"""Add generated full-text search vector on listings
+
+Revision ID: 20241205_listing_search_vector
+Revises: 20241123_add_notifications
+Create Date: 2025-12-05 09:30:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20241205_listing_search_vector"
+down_revision = "20241123_add_notifications"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(brand, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "listings",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_listings_search_vector",
+        "listings",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_listings_search_vector", table_name="listings")
+    op.drop_column("listings", "search_vector")
@@ -0,0 +1,41 @@
+"""Add trigram indexes for listing title and brand suggestions
+
+Revision ID: 20241207_listing_trigram
+Revises: 20241205_listing_search_vector
+Create Date: 2025-12-07 11:15:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20241207_listing_trigram"
+down_revision = "20241205_listing_search_vector"
+branch_labels = None
+depends_on = None
+
+
+PUBLIC_LISTINGS = "status = 'approved' AND is_locked IS false AND sold_at IS NULL"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_listings_title_trgm",
+        "listings",
+        [sa.text("lower(title) gin_trgm_ops")],
+        postgresql_using="gin",
+        postgresql_where=sa.text(PUBLIC_LISTINGS),
+    )
+    op.create_index(
+        "ix_listings_brand_trgm",
+        "listings",
+        [sa.text("lower(brand) gin_trgm_ops")],
+        postgresql_using="gin",
+        postgresql_where=sa.text(f"{PUBLIC_LISTINGS} AND brand IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_listings_brand_trgm", table_name="listings")
+    op.drop_index("ix_listings_title_trgm", table_name="listings")
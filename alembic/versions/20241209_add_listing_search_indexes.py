@@ -0,0 +1,46 @@
+"""Add partial listing indexes matching the public search sort orders
+
+Revision ID: 20241209_listing_search_indexes
+Revises: 20241207_listing_trigram
+Create Date: 2025-12-09 10:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20241209_listing_search_indexes"
+down_revision = "20241207_listing_trigram"
+branch_labels = None
+depends_on = None
+
+
+PUBLIC_LISTINGS = "status = 'approved' AND is_locked IS false AND sold_at IS NULL"
+
+NEWEST = [sa.text("created_at DESC"), sa.text("id DESC")]
+PRICE = [sa.text("price"), *NEWEST]
+
+SEARCH_INDEXES = {
+    "ix_listings_public_newest": NEWEST,
+    "ix_listings_public_price": PRICE,
+    "ix_listings_public_category_newest": [sa.text("category"), *NEWEST],
+    "ix_listings_public_category_price": [sa.text("category"), *PRICE],
+    "ix_listings_public_city_newest": [sa.text("city"), *NEWEST],
+    "ix_listings_public_city_price": [sa.text("city"), *PRICE],
+}
+
+
+def upgrade() -> None:
+    for name, columns in SEARCH_INDEXES.items():
+        op.create_index(name, "listings", columns, postgresql_where=sa.text(PUBLIC_LISTINGS))
+    # Superseded by the partial indexes above: it covers sold and pending rows and its
+    # column order serves none of the search sorts.
+    op.execute("DROP INDEX IF EXISTS idx_listings_filters")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_listings_filters ON listings (status, category, city, price, created_at)"
+    )
+    for name in reversed(list(SEARCH_INDEXES)):
+        op.drop_index(name, table_name="listings")
@@ -0,0 +1,35 @@
+"""Add denormalized cover image url on listings
+
+Revision ID: 20241211_listing_cover_image
+Revises: 20241209_listing_search_indexes
+Create Date: 2025-12-11 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20241211_listing_cover_image"
+down_revision = "20241209_listing_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("listings", sa.Column("cover_image_url", sa.String(), nullable=True))
+    op.execute(
+        """
+        UPDATE listings
+        SET cover_image_url = covers.url
+        FROM (
+            SELECT DISTINCT ON (listing_id) listing_id, url
+            FROM listing_images
+            ORDER BY listing_id, position, created_at
+        ) AS covers
+        WHERE listings.id = covers.listing_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("listings", "cover_image_url")
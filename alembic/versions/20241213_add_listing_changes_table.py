@@ -0,0 +1,32 @@
+"""Add listing change log for incremental client sync
+
+Revision ID: 20241213_listing_changes
+Revises: 20241211_listing_cover_image
+Create Date: 2025-12-13 10:30:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20241213_listing_changes"
+down_revision = "20241211_listing_cover_image"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "listing_changes",
+        sa.Column("seq", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("listing_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("deleted", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_listing_changes_listing_id", "listing_changes", ["listing_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_listing_changes_listing_id", table_name="listing_changes")
+    op.drop_table("listing_changes")
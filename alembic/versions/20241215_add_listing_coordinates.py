@@ -0,0 +1,47 @@
+"""Add listing coordinates for proximity search
+
+Revision ID: 20241215_listing_coordinates
+Revises: 20241213_listing_changes
+Create Date: 2025-12-15 09:45:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.gazetteer import resolve_city
+
+
+revision = "20241215_listing_coordinates"
+down_revision = "20241213_listing_changes"
+branch_labels = None
+depends_on = None
+
+
+PUBLIC_LISTINGS = "status = 'approved' AND is_locked IS false AND sold_at IS NULL"
+
+
+def upgrade() -> None:
+    op.add_column("listings", sa.Column("latitude", sa.Float(), nullable=True))
+    op.add_column("listings", sa.Column("longitude", sa.Float(), nullable=True))
+
+    # Cities are free text, so resolve each distinct spelling once through the gazetteer.
+    bind = op.get_bind()
+    cities = bind.execute(sa.text("SELECT DISTINCT city FROM listings")).scalars().all()
+    update = sa.text("UPDATE listings SET latitude = :latitude, longitude = :longitude WHERE city = :city")
+    for city in cities:
+        coordinates = resolve_city(city)
+        if coordinates:
+            bind.execute(update, {"city": city, "latitude": coordinates[0], "longitude": coordinates[1]})
+
+    op.create_index(
+        "ix_listings_public_location",
+        "listings",
+        ["latitude", "longitude"],
+        postgresql_where=sa.text(PUBLIC_LISTINGS),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_listings_public_location", table_name="listings")
+    op.drop_column("listings", "longitude")
+    op.drop_column("listings", "latitude")
@@ -0,0 +1,69 @@
+"""Add saved searches and the saved_search_match notification event
+
+Revision ID: 20241217_saved_searches
+Revises: 20241215_listing_coordinates
+Create Date: 2025-12-17 11:15:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20241217_saved_searches"
+down_revision = "20241215_listing_coordinates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A new enum value cannot be used in the transaction that adds it.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE notificationevent ADD VALUE IF NOT EXISTS 'saved_search_match'")
+
+    op.create_table(
+        "saved_searches",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            primary_key=True,
+            nullable=False,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("name", sa.String(length=100), nullable=True),
+        sa.Column("q", sa.String(length=100), nullable=True),
+        sa.Column(
+            "category_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("categories.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column("city", sa.String(length=60), nullable=True),
+        sa.Column("condition", postgresql.ENUM(name="listingcondition", create_type=False), nullable=True),
+        sa.Column("min_price", sa.Numeric(12, 2), nullable=True),
+        sa.Column("max_price", sa.Numeric(12, 2), nullable=True),
+        sa.Column("near", sa.String(length=60), nullable=True),
+        sa.Column("latitude", sa.Float(), nullable=True),
+        sa.Column("longitude", sa.Float(), nullable=True),
+        sa.Column("radius_km", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_saved_searches_user_id", "saved_searches", ["user_id"])
+    op.create_index("ix_saved_searches_category_id", "saved_searches", ["category_id"])
+    op.create_index("ix_saved_searches_city", "saved_searches", ["city"])
+    op.create_index("ix_saved_searches_price", "saved_searches", ["min_price", "max_price"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_saved_searches_price", table_name="saved_searches")
+    op.drop_index("ix_saved_searches_city", table_name="saved_searches")
+    op.drop_index("ix_saved_searches_category_id", table_name="saved_searches")
+    op.drop_index("ix_saved_searches_user_id", table_name="saved_searches")
+    op.drop_table("saved_searches")
+    # Postgres cannot drop a value from an enum; saved_search_match stays on notificationevent.
@@ -0,0 +1,50 @@
+"""Add precomputed similar listings and batch job checkpoints
+
+Revision ID: 20241219_listing_similarities
+Revises: 20241217_saved_searches
+Create Date: 2025-12-19 14:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20241219_listing_similarities"
+down_revision = "20241217_saved_searches"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_checkpoints",
+        sa.Column("name", sa.String(length=64), primary_key=True),
+        sa.Column("position", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+    op.create_table(
+        "listing_similarities",
+        sa.Column(
+            "listing_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("position", sa.SmallInteger(), primary_key=True),
+        sa.Column(
+            "similar_listing_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("score", sa.Float(), nullable=False),
+    )
+    op.create_index("ix_listing_similarities_similar_listing_id", "listing_similarities", ["similar_listing_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_listing_similarities_similar_listing_id", table_name="listing_similarities")
+    op.drop_table("listing_similarities")
+    op.drop_table("job_checkpoints")
@@ -0,0 +1,86 @@
+"""Add listing fingerprints, LSH buckets and duplicate flags
+
+Revision ID: 20241221_listing_duplicates
+Revises: 20241219_listing_similarities
+Create Date: 2025-12-21 10:20:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20241221_listing_duplicates"
+down_revision = "20241219_listing_similarities"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "listing_fingerprints",
+        sa.Column(
+            "listing_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("signature", sa.LargeBinary(), nullable=False),
+    )
+
+    op.create_table(
+        "listing_fingerprint_buckets",
+        sa.Column("bucket", sa.BigInteger(), primary_key=True),
+        sa.Column(
+            "listing_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+    )
+    op.create_index("ix_listing_fingerprint_buckets_listing_id", "listing_fingerprint_buckets", ["listing_id"])
+
+    duplicate_flag_status = sa.Enum("open", "dismissed", name="duplicateflagstatus")
+    duplicate_flag_status.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "listing_duplicate_flags",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            primary_key=True,
+            nullable=False,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column(
+            "listing_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "duplicate_of_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("similarity", sa.Float(), nullable=False),
+        sa.Column("status", duplicate_flag_status, nullable=False, server_default="open"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("reviewed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("listing_id", "duplicate_of_id", name="uq_listing_duplicate_flags_pair"),
+    )
+    op.create_index(
+        "ix_listing_duplicate_flags_status_created_at",
+        "listing_duplicate_flags",
+        ["status", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_listing_duplicate_flags_status_created_at", table_name="listing_duplicate_flags")
+    op.drop_table("listing_duplicate_flags")
+    sa.Enum(name="duplicateflagstatus").drop(op.get_bind(), checkfirst=True)
+    op.drop_index("ix_listing_fingerprint_buckets_listing_id", table_name="listing_fingerprint_buckets")
+    op.drop_table("listing_fingerprint_buckets")
+    op.drop_table("listing_fingerprints")
@@ -0,0 +1,43 @@
+"""Add precomputed price suggestion bands
+
+Revision ID: 20241223_price_suggestions
+Revises: 20241221_listing_duplicates
+Create Date: 2025-12-23 10:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20241223_price_suggestions"
+down_revision = "20241221_listing_duplicates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "price_suggestions",
+        sa.Column(
+            "category_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("categories.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("condition", sa.String(length=20), primary_key=True),
+        sa.Column("brand", sa.String(length=255), primary_key=True),
+        sa.Column("sample_size", sa.Integer(), nullable=False),
+        sa.Column("low", sa.Numeric(12, 2), nullable=False),
+        sa.Column("median", sa.Numeric(12, 2), nullable=False),
+        sa.Column("high", sa.Numeric(12, 2), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_orders_created_at", "orders", ["created_at"])
+    op.create_index("ix_orders_updated_at", "orders", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_orders_updated_at", table_name="orders")
+    op.drop_index("ix_orders_created_at", table_name="orders")
+    op.drop_table("price_suggestions")
@@ -0,0 +1,42 @@
+"""Add the precomputed listing relevance score
+
+Revision ID: 20241225_listing_relevance
+Revises: 20241223_price_suggestions
+Create Date: 2025-12-25 09:30:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.relevance import RECENCY_RATE
+
+
+revision = "20241225_listing_relevance"
+down_revision = "20241223_price_suggestions"
+branch_labels = None
+depends_on = None
+
+
+PUBLIC_LISTINGS = "status = 'approved' AND is_locked IS false AND sold_at IS NULL"
+
+
+def upgrade() -> None:
+    op.add_column("listings", sa.Column("relevance_score", sa.Float(), nullable=True))
+    # Recency only; run app.jobs.listing_relevance afterwards to add the quality signals.
+    op.execute(
+        sa.text(
+            "UPDATE listings SET relevance_score = extract(epoch FROM coalesce(created_at, now())) * :rate"
+        ).bindparams(rate=RECENCY_RATE)
+    )
+    op.alter_column("listings", "relevance_score", nullable=False)
+    op.create_index(
+        "ix_listings_public_relevance",
+        "listings",
+        [sa.text("relevance_score DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text(PUBLIC_LISTINGS),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_listings_public_relevance", table_name="listings")
+    op.drop_column("listings", "relevance_score")
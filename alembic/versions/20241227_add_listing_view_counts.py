@@ -0,0 +1,35 @@
+"""Add flushed listing view counters
+
+Revision ID: 20241227_listing_view_counts
+Revises: 20241225_listing_relevance
+Create Date: 2025-12-27 11:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20241227_listing_view_counts"
+down_revision = "20241225_listing_relevance"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "listing_view_counts",
+        sa.Column(
+            "listing_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("view_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("unique_viewer_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("listing_view_counts")
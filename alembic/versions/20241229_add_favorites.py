@@ -0,0 +1,50 @@
+"""Add favorites and the listing favorite counter
+
+Revision ID: 20241229_favorites
+Revises: 20241227_listing_view_counts
+Create Date: 2025-12-29 10:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20241229_favorites"
+down_revision = "20241227_listing_view_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "favorites",
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "listing_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_favorites_user_created",
+        "favorites",
+        ["user_id", sa.text("created_at DESC"), sa.text("listing_id DESC")],
+    )
+    op.create_index("ix_favorites_listing_id", "favorites", ["listing_id"])
+    # A constant default is a metadata-only change on PostgreSQL 11+, so no table rewrite.
+    op.add_column("listings", sa.Column("favorite_count", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("listings", "favorite_count")
+    op.drop_index("ix_favorites_listing_id", table_name="favorites")
+    op.drop_index("ix_favorites_user_created", table_name="favorites")
+    op.drop_table("favorites")
@@ -0,0 +1,34 @@
+"""Add the saved search alert outbox
+
+Revision ID: 20241231_saved_search_alerts
+Revises: 20241229_favorites
+Create Date: 2025-12-31 10:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20241231_saved_search_alerts"
+down_revision = "20241229_favorites"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "saved_search_alerts",
+        sa.Column(
+            "listing_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("after_user_id", postgresql.UUID(as_uuid=True)),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("saved_search_alerts")
@@ -6,27 +6,44 @@ from uuid import UUID
 from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
+from app.core.cache import listing_count_cache, listing_detail_cache, listing_facets_cache, listing_search_cache
 from app.core.config import get_settings
 from app.core.errors import ApplicationError, ErrorCode
+from app.core.home_feed import home_feed
 from app.core.rate_limit import listing_create_rate_limiter, login_rate_limiter, media_presign_rate_limiter
 from app.core.security import InvalidTokenError, TokenType, decode_token
+from app.core.trending import trending_listings
+from app.core.view_counter import listing_view_counter
 from app.db.models.user import User
 from app.db.session import SessionLocal
 from app.db.repositories.user_repository import UserRepository
 from app.db.repositories.address_repository import AddressRepository
 from app.db.repositories.listing_repository import ListingRepository
+from app.db.repositories.listing_duplicate_repository import ListingDuplicateRepository
 from app.db.repositories.listing_image_repository import ListingImageRepository
+from app.db.repositories.listing_view_repository import ListingViewRepository
 from app.db.repositories.category_repository import CategoryRepository
+from app.db.repositories.favorite_repository import FavoriteRepository
 from app.db.repositories.order_repository import OrderRepository
 from app.db.repositories.transaction_repository import TransactionRepository
 from app.db.repositories.wallet_repository import WalletRepository
 from app.db.repositories.withdrawal_request_repository import WithdrawalRequestRepository
 from app.db.repositories.notification_repository import NotificationRepository
+from app.db.repositories.price_suggestion_repository import PriceSuggestionRepository
+from app.db.repositories.saved_search_repository import SavedSearchRepository
 from app.services.address_service import AddressService
 from app.services.auth_service import AuthService
+from app.services.favorite_service import FavoriteService
+from app.services.listing_duplicate_service import ListingDuplicateService
+from app.services.listing_search_index import listing_search_index
 from app.services.listing_service import ListingService
+from app.services.listing_suggestion_service import ListingSuggestionService, listing_suggestion_cache
+from app.services.listing_totals import ListingTotalsStrategy
+from app.services.listing_view_service import ListingViewService
 from app.services.order_service import OrderService
+from app.services.price_suggestion_service import PriceSuggestionService, price_suggestion_book
 from app.services.s3_service import S3Service
+from app.services.saved_search_service import SavedSearchAlertService, SavedSearchService
 from app.services.wallet_service import WalletService
 from app.services.notification_service import NotificationService
 from app.utils.redis_client import get_redis_client
@@ -76,18 +93,92 @@ def get_address_service(
     return AddressService(db=db, address_repo=address_repo)
 
 
+def get_listing_duplicate_service(db: Session = Depends(get_db)) -> ListingDuplicateService:
+    return ListingDuplicateService(db=db, duplicate_repository=ListingDuplicateRepository(db))
+
+
 def get_listing_service(
     listing_repo: ListingRepository = Depends(get_listing_repository),
     listing_image_repo: ListingImageRepository = Depends(get_listing_image_repository),
     category_repo: CategoryRepository = Depends(get_category_repository),
+    duplicate_service: ListingDuplicateService = Depends(get_listing_duplicate_service),
 ) -> ListingService:
     return ListingService(
         listing_repository=listing_repo,
         listing_image_repository=listing_image_repo,
         category_repository=category_repo,
+        totals_strategy=ListingTotalsStrategy(
+            listing_repo,
+            cache=listing_count_cache,
+            estimate_threshold=get_settings().listing_count_estimate_threshold,
+        ),
+        search_cache=listing_search_cache,
+        facets_cache=listing_facets_cache,
+        detail_cache=listing_detail_cache,
+        search_index=listing_search_index if get_settings().listing_search_index_enabled else None,
+        duplicate_service=duplicate_service,
+        trending=trending_listings,
+        home_feed=home_feed,
+    )
+
+
+def get_listing_view_service(
+    db: Session = Depends(get_db),
+    listing_repo: ListingRepository = Depends(get_listing_repository),
+) -> ListingViewService:
+    return ListingViewService(
+        listing_repository=listing_repo,
+        view_repository=ListingViewRepository(db),
+        counter=listing_view_counter,
+    )
+
+
+def get_favorite_service(
+    db: Session = Depends(get_db),
+    listing_repo: ListingRepository = Depends(get_listing_repository),
+) -> FavoriteService:
+    return FavoriteService(
+        db=db,
+        favorite_repository=FavoriteRepository(db),
+        listing_repository=listing_repo,
+        detail_cache=listing_detail_cache,
+        trending=trending_listings,
+    )
+
+
+def get_saved_search_service(
+    db: Session = Depends(get_db),
+    listing_service: ListingService = Depends(get_listing_service),
+) -> SavedSearchService:
+    return SavedSearchService(
+        db=db,
+        saved_search_repository=SavedSearchRepository(db),
+        listing_service=listing_service,
+    )
+
+
+def get_saved_search_alert_service(
+    db: Session = Depends(get_db),
+    listing_repo: ListingRepository = Depends(get_listing_repository),
+) -> SavedSearchAlertService:
+    return SavedSearchAlertService(
+        db=db,
+        saved_search_repository=SavedSearchRepository(db),
+        listing_repository=listing_repo,
+        notification_service=_build_notification_service(db),
     )
 
 
+def get_listing_suggestion_service(
+    listing_repo: ListingRepository = Depends(get_listing_repository),
+) -> ListingSuggestionService:
+    return ListingSuggestionService(listing_repository=listing_repo, cache=listing_suggestion_cache)
+
+
+def get_price_suggestion_service(db: Session = Depends(get_db)) -> PriceSuggestionService:
+    return PriceSuggestionService(repository=PriceSuggestionRepository(db), book=price_suggestion_book)
+
+
 def get_s3_service() -> S3Service:
     settings = get_settings()
     return S3Service(settings)
@@ -108,6 +199,7 @@ def get_order_service(
         address_repository=address_repo,
         wallet_service=wallet_service,
         notification_service=notification_service,
+        trending=trending_listings,
     )
 
 
@@ -166,6 +258,18 @@ async def get_current_user(request: Request, db: Session = Depends(get_db)) -> U
     return user
 
 
+def get_viewer_key(request: Request) -> str:
+    # Signed-in viewers are counted once across devices; anonymous ones per address and browser.
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        try:
+            return f"user:{decode_token(auth_header.split(' ', 1)[1], expected_type=TokenType.ACCESS).sub}"
+        except InvalidTokenError:
+            pass
+    client_ip = request.client.host if request.client else "unknown"
+    return f"anon:{client_ip}:{request.headers.get('User-Agent', '')}"
+
+
 def enforce_login_rate_limit(request: Request) -> None:
     identifier = request.client.host if request.client else "unknown"
     if not login_rate_limiter.allow(identifier):
@@ -1,4 +1,14 @@
-from fastapi import APIRouter
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.api.v1 import deps
+from app.api.v1.schemas.listings import ListingDuplicateFlagResponse
+from app.core.cache import listing_detail_cache, listing_facets_cache, listing_search_cache
+from app.core.errors import ApplicationError, ErrorCode
+from app.db.models.listing_duplicate_flag import DuplicateFlagStatus
+from app.db.models.user import User, UserRole
+from app.services.listing_duplicate_service import ListingDuplicateService
 
 
 router = APIRouter(prefix='/admin', tags=['admin'])
@@ -7,3 +17,45 @@ router = APIRouter(prefix='/admin', tags=['admin'])
 @router.get('/ping')
 async def ping_admin() -> dict[str, str]:
     return {'router': 'admin', 'status': 'ok'}
+
+
+def _ensure_admin(current_user: User, message: str) -> None:
+    if current_user.role != UserRole.admin:
+        raise ApplicationError(
+            code=ErrorCode.ACCESS_DENIED,
+            message=message,
+            status_code=status.HTTP_403_FORBIDDEN,
+        )
+
+
+@router.get('/cache/stats')
+def read_cache_stats(current_user: User = Depends(deps.get_current_user)) -> dict[str, dict[str, int]]:
+    _ensure_admin(current_user, 'Only administrators can read cache statistics.')
+    return {
+        'listing_search': listing_search_cache.stats(),
+        'listing_facets': listing_facets_cache.stats(),
+        'listing_detail': listing_detail_cache.stats(),
+    }
+
+
+@router.get('/listings/duplicates', response_model=list[ListingDuplicateFlagResponse])
+def list_duplicate_flags(
+    flag_status: DuplicateFlagStatus = Query(DuplicateFlagStatus.open, alias='status'),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(deps.get_current_user),
+    duplicate_service: ListingDuplicateService = Depends(deps.get_listing_duplicate_service),
+) -> list[ListingDuplicateFlagResponse]:
+    _ensure_admin(current_user, 'Only administrators can review duplicate listings.')
+    flags = duplicate_service.list_flags(status=flag_status, limit=limit, offset=offset)
+    return [ListingDuplicateFlagResponse.model_validate(flag) for flag in flags]
+
+
+@router.post('/listings/duplicates/{flag_id}/dismiss', status_code=status.HTTP_204_NO_CONTENT)
+def dismiss_duplicate_flag(
+    flag_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+    duplicate_service: ListingDuplicateService = Depends(deps.get_listing_duplicate_service),
+) -> None:
+    _ensure_admin(current_user, 'Only administrators can review duplicate listings.')
+    duplicate_service.dismiss_flag(flag_id)
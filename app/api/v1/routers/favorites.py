@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.api.v1 import deps
+from app.api.v1.schemas.favorites import FavoriteListResponse
+from app.db.models.user import User
+from app.services.favorite_service import FavoriteService
+
+
+router = APIRouter(prefix="/favorites", tags=["favorites"])
+
+
+@router.get("/me", response_model=FavoriteListResponse)
+def list_my_favorites(
+    page_size: int = Query(20, ge=1, le=50),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous response."),
+    current_user: User = Depends(deps.get_current_user),
+    favorite_service: FavoriteService = Depends(deps.get_favorite_service),
+) -> FavoriteListResponse:
+    return favorite_service.list_favorites(current_user.id, page_size=page_size, cursor=cursor)
+
+
+@router.put("/{listing_id}", status_code=status.HTTP_204_NO_CONTENT)
+def add_favorite(
+    listing_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+    favorite_service: FavoriteService = Depends(deps.get_favorite_service),
+) -> None:
+    favorite_service.add_favorite(current_user.id, listing_id)
+
+
+@router.delete("/{listing_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_favorite(
+    listing_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+    favorite_service: FavoriteService = Depends(deps.get_favorite_service),
+) -> None:
+    favorite_service.remove_favorite(current_user.id, listing_id)
@@ -2,24 +2,39 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi import APIRouter, Body, Depends, Header, Query, Response, status
 
 from app.api.v1 import deps
 from app.api.v1.schemas.listings import (
     ListingCreate,
     ListingFilterParams,
     BulkListingCreateRequest,
+    ListingBatchResponse,
+    ListingChangesResponse,
     CreateListingImageRequest,
+    ListingFacetsResponse,
     ListingImageCreate,
     ListingImageResponse,
     ListingListResponse,
     ListingResponse,
+    ListingSimilarResponse,
+    ListingSuggestionsResponse,
+    ListingTrendingResponse,
     ListingUpdate,
+    ListingViewsResponse,
+    PriceSuggestionResponse,
 )
 from app.core.errors import ApplicationError, ErrorCode
+from app.db.models.listing import ListingCondition
+from app.db.models.listing_similarity import SIMILAR_LISTINGS_TOP_K
 from app.db.models.user import User, UserRole
 from app.services.listing_service import ListingService
+from app.services.listing_suggestion_service import ListingSuggestionService
+from app.services.listing_view_service import ListingViewService
+from app.services.price_suggestion_service import PriceSuggestionService
 from app.services.s3_service import S3Service
+from app.services.saved_search_service import SavedSearchAlertService
+from app.utils.etag import etag_matches, strong_etag
 
 
 router = APIRouter(prefix="/listings", tags=["listings"])
@@ -30,19 +45,79 @@ def search_listings(
     filters: ListingFilterParams = Depends(),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=50),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous response; overrides `page`."),
+    include_total: bool = Query(True, description="Set to false to skip computing `total`."),
+    fields: str | None = Query(None, description="Comma-separated response fields to return, e.g. `id,title,price`."),
     listing_service: ListingService = Depends(deps.get_listing_service),
-) -> ListingListResponse:
-    listings, total, page_value, resolved_page_size = listing_service.search_public_listings(
+) -> Response:
+    payload = listing_service.search_public_listings_payload(
         filters,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
+        fields=fields,
     )
-    return ListingListResponse(
-        items=[ListingResponse.from_orm(listing) for listing in listings],
-        total=total,
-        page=page_value,
-        page_size=resolved_page_size,
-    )
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get("/facets", response_model=ListingFacetsResponse)
+def get_listing_facets(
+    filters: ListingFilterParams = Depends(),
+    listing_service: ListingService = Depends(deps.get_listing_service),
+) -> Response:
+    payload = listing_service.get_search_facets_payload(filters)
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get("/suggestions", response_model=ListingSuggestionsResponse)
+def suggest_listings(
+    q: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(8, ge=1, le=10),
+    suggestion_service: ListingSuggestionService = Depends(deps.get_listing_suggestion_service),
+) -> ListingSuggestionsResponse:
+    return ListingSuggestionsResponse(suggestions=suggestion_service.suggest(q, limit=limit))
+
+
+@router.get("/trending", response_model=ListingTrendingResponse)
+def get_trending_listings(
+    page: int = Query(1, ge=1, le=100),
+    page_size: int = Query(20, ge=1, le=50),
+    fields: str | None = Query(None, description="Comma-separated response fields to return, e.g. `id,title,price`."),
+    listing_service: ListingService = Depends(deps.get_listing_service),
+) -> Response:
+    payload = listing_service.get_trending_listings_payload(page=page, page_size=page_size, fields=fields)
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get("/price-suggestion", response_model=PriceSuggestionResponse)
+def suggest_listing_price(
+    category_id: UUID = Query(...),
+    condition: ListingCondition | None = Query(None),
+    brand: str | None = Query(None, max_length=255),
+    price_suggestion_service: PriceSuggestionService = Depends(deps.get_price_suggestion_service),
+) -> PriceSuggestionResponse:
+    return price_suggestion_service.suggest(category_id, condition=condition, brand=brand)
+
+
+@router.get("/batch", response_model=ListingBatchResponse)
+def get_listings_batch(
+    ids: list[UUID] = Query(..., description="Listing ids, repeated; at most 50."),
+    fields: str | None = Query(None, description="Comma-separated response fields to return, e.g. `id,title,price`."),
+    listing_service: ListingService = Depends(deps.get_listing_service),
+) -> Response:
+    payload = listing_service.get_listings_batch_payload(ids, fields=fields)
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get("/changes", response_model=ListingChangesResponse)
+def get_listing_changes(
+    since: int = Query(0, ge=0, description="`next_since` from the previous response; 0 for the full history."),
+    limit: int = Query(100, ge=1, le=500),
+    listing_service: ListingService = Depends(deps.get_listing_service),
+) -> Response:
+    payload = listing_service.get_listing_changes_payload(since, limit=limit)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post(
@@ -92,10 +167,38 @@ def list_my_listings(
 @router.get("/{listing_id}", response_model=ListingResponse)
 def get_listing(
     listing_id: UUID,
+    if_none_match: str | None = Header(None),
+    fields: str | None = Query(None, description="Comma-separated response fields to return, e.g. `id,title,price`."),
+    viewer: str = Depends(deps.get_viewer_key),
     listing_service: ListingService = Depends(deps.get_listing_service),
-) -> ListingResponse:
-    listing = listing_service.get_listing(listing_id)
-    return ListingResponse.from_orm(listing)
+    listing_view_service: ListingViewService = Depends(deps.get_listing_view_service),
+) -> Response:
+    payload = listing_service.get_listing_payload(listing_id, fields=fields)
+    listing_view_service.record_view(listing_id, viewer)
+    etag = strong_etag(payload)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/{listing_id}/views", response_model=ListingViewsResponse)
+def get_listing_views(
+    listing_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+    listing_view_service: ListingViewService = Depends(deps.get_listing_view_service),
+) -> ListingViewsResponse:
+    return listing_view_service.get_views(listing_id, current_user)
+
+
+@router.get("/{listing_id}/similar", response_model=ListingSimilarResponse)
+def get_similar_listings(
+    listing_id: UUID,
+    limit: int = Query(12, ge=1, le=SIMILAR_LISTINGS_TOP_K),
+    fields: str | None = Query(None, description="Comma-separated response fields to return, e.g. `id,title,price`."),
+    listing_service: ListingService = Depends(deps.get_listing_service),
+) -> Response:
+    payload = listing_service.get_similar_listings_payload(listing_id, limit=limit, fields=fields)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.put("/{listing_id}", response_model=ListingResponse)
@@ -118,6 +221,26 @@ def delete_listing(
     listing_service.delete_listing(current_user.id, listing_id)
 
 
+@router.post("/{listing_id}/approve", response_model=ListingResponse)
+def approve_listing(
+    listing_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+    listing_service: ListingService = Depends(deps.get_listing_service),
+    saved_search_alerts: SavedSearchAlertService = Depends(deps.get_saved_search_alert_service),
+) -> ListingResponse:
+    if current_user.role != UserRole.admin:
+        raise ApplicationError(
+            code=ErrorCode.ACCESS_DENIED,
+            message="Only administrators can approve listings.",
+            status_code=status.HTTP_403_FORBIDDEN,
+        )
+
+    saved_search_alerts.queue(listing_id)
+    listing = listing_service.approve_listing(listing_id)
+    saved_search_alerts.notify_matches(listing_id)
+    return ListingResponse.from_orm(listing)
+
+
 @router.post(
     "/{listing_id}/images",
     response_model=ListingImageResponse,
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, status
+
+from app.api.v1 import deps
+from app.api.v1.schemas.saved_searches import SavedSearchCreate, SavedSearchResponse
+from app.db.models.user import User
+from app.services.saved_search_service import SavedSearchService
+
+
+router = APIRouter(prefix="/saved-searches", tags=["saved-searches"])
+
+
+@router.post("", response_model=SavedSearchResponse, status_code=status.HTTP_201_CREATED)
+def create_saved_search(
+    payload: SavedSearchCreate,
+    current_user: User = Depends(deps.get_current_user),
+    saved_search_service: SavedSearchService = Depends(deps.get_saved_search_service),
+) -> SavedSearchResponse:
+    saved_search = saved_search_service.create_saved_search(current_user.id, payload)
+    return SavedSearchResponse.model_validate(saved_search)
+
+
+@router.get("/me", response_model=list[SavedSearchResponse])
+def list_my_saved_searches(
+    current_user: User = Depends(deps.get_current_user),
+    saved_search_service: SavedSearchService = Depends(deps.get_saved_search_service),
+) -> list[SavedSearchResponse]:
+    saved_searches = saved_search_service.list_saved_searches(current_user.id)
+    return [SavedSearchResponse.model_validate(saved_search) for saved_search in saved_searches]
+
+
+@router.delete("/{saved_search_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_saved_search(
+    saved_search_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+    saved_search_service: SavedSearchService = Depends(deps.get_saved_search_service),
+) -> None:
+    saved_search_service.delete_saved_search(current_user.id, saved_search_id)
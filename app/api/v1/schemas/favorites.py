@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.api.v1.schemas.listings import ListingResponse
+
+
+class FavoriteResponse(BaseModel):
+    listing: ListingResponse
+    favorited_at: datetime
+
+
+class FavoriteListResponse(BaseModel):
+    items: list[FavoriteResponse]
+    page_size: int
+    next_cursor: Optional[str] = None
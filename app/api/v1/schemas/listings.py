@@ -4,11 +4,20 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
-
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl, condecimal
+from typing import Any, Optional
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    SerializerFunctionWrapHandler,
+    condecimal,
+    model_serializer,
+)
 
 from app.db.models.listing import ListingCondition, ListingStatus
+from app.db.models.listing_duplicate_flag import DuplicateFlagStatus
 
 
 DecimalMoney = condecimal(gt=0, max_digits=12, decimal_places=2)
@@ -48,22 +57,65 @@ class ListingResponse(ListingBase):
     status: ListingStatus
     created_at: datetime
     updated_at: datetime
+    cover_image_url: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    favorite_count: int = 0
     images: list["ListingImageResponse"] = Field(default_factory=list)
 
 
+class ListingSparseResponse(BaseModel):
+    # A ListingResponse narrowed with `fields=`; only the fields that were set are serialized.
+    id: uuid.UUID
+    user_id: Optional[uuid.UUID] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    category_id: Optional[uuid.UUID] = None
+    brand: Optional[str] = None
+    size: Optional[str] = None
+    condition: Optional[ListingCondition] = None
+    price: Optional[Decimal] = None
+    city: Optional[str] = None
+    status: Optional[ListingStatus] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    cover_image_url: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    favorite_count: Optional[int] = None
+    images: Optional[list["ListingImageResponse"]] = None
+
+    @model_serializer(mode="wrap")
+    def _serialize_set_fields(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
+        return {key: value for key, value in handler(self).items() if key in self.model_fields_set}
+
+
+LISTING_RESPONSE_FIELDS = frozenset(ListingResponse.model_fields)
+
+
 class ListingSortOption(str, Enum):
     price = "price"
     newest = "newest"
     oldest = "oldest"
+    distance = "distance"
+    relevance = "relevance"
+
+
+class ListingTotalKind(str, Enum):
+    exact = "exact"
+    estimated = "estimated"
 
 
 class ListingFilterParams(BaseModel):
+    q: Optional[str] = Field(default=None, max_length=100)
     category_id: Optional[str] = None
     city: Optional[str] = None
     condition: Optional[ListingCondition] = None
     min_price: Optional[Decimal] = Field(default=None, gt=0)
     max_price: Optional[Decimal] = Field(default=None, gt=0)
-    sort_by: ListingSortOption = Field(default=ListingSortOption.newest)
+    near: Optional[str] = Field(default=None, max_length=60)
+    radius_km: Optional[float] = Field(default=None, gt=0, le=500)
+    sort_by: Optional[ListingSortOption] = Field(default=None)
 
 
 class ListingImageCreate(BaseModel):
@@ -91,7 +143,112 @@ class BulkListingCreateRequest(BaseModel):
 
 
 class ListingListResponse(BaseModel):
-    items: list[ListingResponse]
-    total: int
+    items: list[ListingResponse | ListingSparseResponse]
+    total: Optional[int] = None
+    total_kind: Optional[ListingTotalKind] = None
+    page: Optional[int] = None
+    page_size: int
+    next_cursor: Optional[str] = None
+
+
+class ListingBatchResponse(BaseModel):
+    items: list[ListingResponse | ListingSparseResponse]
+    missing: list[uuid.UUID]
+
+
+class ListingSimilarResponse(BaseModel):
+    items: list[ListingResponse | ListingSparseResponse]
+
+
+class ListingTrendingResponse(BaseModel):
+    items: list[ListingResponse | ListingSparseResponse]
     page: int
     page_size: int
+    has_more: bool
+
+
+class ListingViewsResponse(BaseModel):
+    listing_id: uuid.UUID
+    view_count: int = 0
+    unique_viewer_count: int = 0
+    updated_at: Optional[datetime] = None
+
+
+class ListingDuplicateFlagResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    listing_id: uuid.UUID
+    duplicate_of_id: uuid.UUID
+    user_id: uuid.UUID
+    listing_title: str
+    duplicate_of_title: str
+    similarity: float
+    status: DuplicateFlagStatus
+    created_at: datetime
+    reviewed_at: Optional[datetime] = None
+
+
+class ListingChange(BaseModel):
+    seq: int
+    listing_id: uuid.UUID
+    deleted: bool
+    listing: Optional[ListingResponse] = None
+
+
+class ListingChangesResponse(BaseModel):
+    changes: list[ListingChange]
+    next_since: int
+    has_more: bool
+
+
+class ListingFacetValue(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+
+class ListingPriceBucket(BaseModel):
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    count: int
+
+
+class ListingFacetsResponse(BaseModel):
+    total: int
+    categories: list[ListingFacetValue]
+    conditions: list[ListingFacetValue]
+    cities: list[ListingFacetValue]
+    price_buckets: list[ListingPriceBucket]
+
+
+class ListingSuggestionKind(str, Enum):
+    brand = "brand"
+    title = "title"
+
+
+class ListingSuggestion(BaseModel):
+    text: str
+    kind: ListingSuggestionKind
+    count: int
+
+
+class ListingSuggestionsResponse(BaseModel):
+    suggestions: list[ListingSuggestion]
+
+
+class PriceSuggestionBasis(str, Enum):
+    brand = "brand"
+    condition = "condition"
+    category = "category"
+
+
+class PriceSuggestionResponse(BaseModel):
+    category_id: uuid.UUID
+    condition: Optional[ListingCondition] = None
+    brand: Optional[str] = None
+    basis: Optional[PriceSuggestionBasis] = None
+    sample_size: int = 0
+    low: Optional[Decimal] = None
+    median: Optional[Decimal] = None
+    high: Optional[Decimal] = None
+    computed_at: Optional[datetime] = None
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.api.v1.schemas.listings import ListingFilterParams
+from app.db.models.listing import ListingCondition
+
+
+class SavedSearchCreate(ListingFilterParams):
+    name: Optional[str] = Field(default=None, max_length=100)
+
+
+class SavedSearchResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    name: Optional[str] = None
+    q: Optional[str] = None
+    category_id: Optional[uuid.UUID] = None
+    city: Optional[str] = None
+    condition: Optional[ListingCondition] = None
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    near: Optional[str] = None
+    radius_km: Optional[float] = None
+    created_at: datetime
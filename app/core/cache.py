@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+
+import redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+
+
+@dataclass
+class RedisCache:
+    prefix: str
+    ttl_seconds: int
+    track_stats: bool = False
+
+    def __post_init__(self) -> None:
+        settings = get_settings()
+        self.client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+    def get(self, key: str) -> str | None:
+        try:
+            value = self.client.get(self._key(key))
+        except RedisError:
+            return None
+        self._record_lookup(hit=value is not None)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self.client.set(self._key(key), value, ex=self.ttl_seconds)
+        except RedisError:
+            pass
+
+    def get_many(self, keys: Sequence[str]) -> list[str | None]:
+        if not keys:
+            return []
+        try:
+            values = self.client.mget([self._key(key) for key in keys])
+        except RedisError:
+            return [None] * len(keys)
+        hits = sum(value is not None for value in values)
+        self._record_lookups(hits=hits, misses=len(values) - hits)
+        return values
+
+    def set_many(self, values: Mapping[str, str]) -> None:
+        if not values:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipeline.set(self._key(key), value, ex=self.ttl_seconds)
+            pipeline.execute()
+        except RedisError:
+            pass
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            self.client.delete(*(self._key(key) for key in keys))
+        except RedisError:
+            pass
+
+    def fetch(self, key: str, loader: Callable[[], str]) -> str:
+        # Resolve the full key once so a miss is stored under the same key it was looked up with.
+        try:
+            full_key = self._key(key)
+            value = self.client.get(full_key)
+        except RedisError:
+            return loader()
+
+        self._record_lookup(hit=value is not None)
+        if value is not None:
+            return value
+
+        value = loader()
+        try:
+            self.client.set(full_key, value, ex=self.ttl_seconds)
+        except RedisError:
+            pass
+        return value
+
+    def fetch_many(self, keys: Sequence[str], loader: Callable[[list[str]], Mapping[str, str]]) -> list[str | None]:
+        # The loader gets the missed keys and returns the values it found; keys it leaves out stay None.
+        values = self.get_many(keys)
+        misses = [key for key, value in zip(keys, values) if value is None]
+        if not misses:
+            return values
+        loaded = loader(misses)
+        self.set_many(loaded)
+        return [value if value is not None else loaded.get(key) for key, value in zip(keys, values)]
+
+    def stats(self) -> dict[str, int]:
+        try:
+            raw = self.client.hgetall(self._stats_key)
+        except RedisError:
+            raw = {}
+        return {"hits": int(raw.get("hits", 0)), "misses": int(raw.get("misses", 0))}
+
+    def _record_lookup(self, *, hit: bool) -> None:
+        self._record_lookups(hits=int(hit), misses=int(not hit))
+
+    def _record_lookups(self, *, hits: int, misses: int) -> None:
+        if not self.track_stats:
+            return
+        try:
+            if hits:
+                self.client.hincrby(self._stats_key, "hits", hits)
+            if misses:
+                self.client.hincrby(self._stats_key, "misses", misses)
+        except RedisError:
+            pass
+
+    @property
+    def _stats_key(self) -> str:
+        return f"{self.prefix}:stats"
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+
+@dataclass
+class GenerationalCache(RedisCache):
+    # Entries are tagged with the shared generation counter they were computed under; bumping
+    # the counter turns every older entry into a miss at once. The entry and the counter are
+    # read in a single MGET, and a stale entry is overwritten in place by the next miss.
+    generation_key: str = "cache:generation"
+
+    def invalidate(self) -> None:
+        try:
+            self.client.incr(self.generation_key)
+        except RedisError:
+            pass
+
+    def get(self, key: str) -> str | None:
+        try:
+            stored, generation = self.client.mget([self._key(key), self.generation_key])
+        except RedisError:
+            return None
+        value = self._current(stored, generation)
+        self._record_lookup(hit=value is not None)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            generation = self.client.get(self.generation_key)
+            self.client.set(self._key(key), self._tagged(value, generation), ex=self.ttl_seconds)
+        except RedisError:
+            pass
+
+    def get_many(self, keys: Sequence[str]) -> list[str | None]:
+        if not keys:
+            return []
+        try:
+            *stored, generation = self.client.mget([*(self._key(key) for key in keys), self.generation_key])
+        except RedisError:
+            return [None] * len(keys)
+        values = [self._current(entry, generation) for entry in stored]
+        hits = sum(value is not None for value in values)
+        self._record_lookups(hits=hits, misses=len(values) - hits)
+        return values
+
+    def set_many(self, values: Mapping[str, str]) -> None:
+        if not values:
+            return
+        try:
+            generation = self.client.get(self.generation_key)
+            pipeline = self.client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipeline.set(self._key(key), self._tagged(value, generation), ex=self.ttl_seconds)
+            pipeline.execute()
+        except RedisError:
+            pass
+
+    def fetch(self, key: str, loader: Callable[[], str]) -> str:
+        try:
+            stored, generation = self.client.mget([self._key(key), self.generation_key])
+        except RedisError:
+            return loader()
+
+        value = self._current(stored, generation)
+        self._record_lookup(hit=value is not None)
+        if value is not None:
+            return value
+
+        value = loader()
+        # Tagged with the generation read before loading: a write committed while the loader ran
+        # has bumped the counter already, so this entry is a miss for the next reader.
+        try:
+            self.client.set(self._key(key), self._tagged(value, generation), ex=self.ttl_seconds)
+        except RedisError:
+            pass
+        return value
+
+    @staticmethod
+    def _tagged(value: str, generation: str | None) -> str:
+        return f"{generation or '0'}:{value}"
+
+    @staticmethod
+    def _current(stored: str | None, generation: str | None) -> str | None:
+        if stored is None:
+            return None
+        tag, separator, value = stored.partition(":")
+        return value if separator and tag == (generation or "0") else None
+
+
+@dataclass
+class VersionedCache(RedisCache):
+    # Like GenerationalCache, but with a version per key: delete() gives the key a fresh random
+    # version instead of only dropping the entry. A value loaded from rows read before that write
+    # committed is stored under the older version, so it is a miss for the next reader rather than
+    # a stale entry pinned for the whole TTL. An expired version reads as "0"; versions outlive
+    # entries by a full TTL, so an entry stored under "0" before the last write is gone by then.
+
+    def get(self, key: str) -> str | None:
+        return self.get_many([key])[0]
+
+    def set(self, key: str, value: str) -> None:
+        self.set_many({key: value})
+
+    def get_many(self, keys: Sequence[str]) -> list[str | None]:
+        values, _ = self._read(keys)
+        return values
+
+    def set_many(self, values: Mapping[str, str]) -> None:
+        if not values:
+            return
+        try:
+            versions = self.client.mget([self._version_key(key) for key in values])
+        except RedisError:
+            return
+        self._write(values, dict(zip(values, versions)))
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.set(self._version_key(key), uuid.uuid4().hex, ex=2 * self.ttl_seconds)
+            pipeline.delete(*(self._key(key) for key in keys))
+            pipeline.execute()
+        except RedisError:
+            pass
+
+    def fetch(self, key: str, loader: Callable[[], str]) -> str:
+        (value,), versions = self._read([key])
+        if value is None:
+            value = loader()
+            self._write({key: value}, versions)
+        return value
+
+    def fetch_many(self, keys: Sequence[str], loader: Callable[[list[str]], Mapping[str, str]]) -> list[str | None]:
+        values, versions = self._read(keys)
+        misses = [key for key, value in zip(keys, values) if value is None]
+        if not misses:
+            return values
+        loaded = loader(misses)
+        self._write(loaded, versions)
+        return [value if value is not None else loaded.get(key) for key, value in zip(keys, values)]
+
+    def _read(self, keys: Sequence[str]) -> tuple[list[str | None], dict[str, str | None] | None]:
+        # Entries and their versions in one MGET. The versions are kept so a miss is stored under
+        # the version read before loading, for the same reason as in GenerationalCache.fetch.
+        if not keys:
+            return [], {}
+        try:
+            stored = self.client.mget([*(self._key(key) for key in keys), *(self._version_key(key) for key in keys)])
+        except RedisError:
+            return [None] * len(keys), None
+        versions = dict(zip(keys, stored[len(keys) :]))
+        values = [GenerationalCache._current(entry, versions[key]) for key, entry in zip(keys, stored)]
+        hits = sum(value is not None for value in values)
+        self._record_lookups(hits=hits, misses=len(values) - hits)
+        return values, versions
+
+    def _write(self, values: Mapping[str, str], versions: Mapping[str, str | None] | None) -> None:
+        if not values or versions is None:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipeline.set(self._key(key), GenerationalCache._tagged(value, versions[key]), ex=self.ttl_seconds)
+            pipeline.execute()
+        except RedisError:
+            pass
+
+    def _version_key(self, key: str) -> str:
+        return f"{self.prefix}:version:{key}"
+
+
+LISTINGS_GENERATION_KEY = "cache:listings:generation"
+
+listing_count_cache = GenerationalCache(
+    prefix="cache:listings:count",
+    ttl_seconds=get_settings().listing_count_cache_ttl_seconds,
+    generation_key=LISTINGS_GENERATION_KEY,
+)
+listing_search_cache = GenerationalCache(
+    prefix="cache:listings:search",
+    ttl_seconds=get_settings().listing_search_cache_ttl_seconds,
+    track_stats=True,
+    generation_key=LISTINGS_GENERATION_KEY,
+)
+listing_facets_cache = GenerationalCache(
+    prefix="cache:listings:facets",
+    ttl_seconds=get_settings().listing_facets_cache_ttl_seconds,
+    track_stats=True,
+    generation_key=LISTINGS_GENERATION_KEY,
+)
+listing_detail_cache = VersionedCache(
+    prefix="cache:listings:detail",
+    ttl_seconds=get_settings().listing_detail_cache_ttl_seconds,
+    track_stats=True,
+)
@@ -23,6 +23,30 @@ class Settings(BaseSettings):
     email_from: str | None = None
     email_from_name: str | None = None
     email_verification_exp_minutes: int = Field(default=10)
+    listing_count_cache_ttl_seconds: int = Field(default=30)
+    listing_count_estimate_threshold: int = Field(default=10_000)
+    listing_search_cache_ttl_seconds: int = Field(default=60)
+    listing_facets_cache_ttl_seconds: int = Field(default=120)
+    listing_detail_cache_ttl_seconds: int = Field(default=600)
+    listing_suggestions_cache_ttl_seconds: int = Field(default=60)
+    listing_suggestions_cache_size: int = Field(default=10_000)
+    listing_suggestions_refresh_seconds: float = Field(default=30.0)
+    listing_suggestions_hot_prefixes: int = Field(default=1_000)
+    listing_search_index_enabled: bool = Field(default=False)
+    listing_search_index_refresh_seconds: float = Field(default=2.0)
+    price_suggestion_window_days: int = Field(default=90)
+    price_suggestion_refresh_seconds: float = Field(default=60.0)
+    trending_half_life_hours: float = Field(default=24.0)
+    trending_max_listings: int = Field(default=10_000)
+    listing_view_flush_seconds: float = Field(default=30.0)
+    listing_viewers_ttl_seconds: int = Field(default=30 * 24 * 3600)
+    home_feed_cities: int = Field(default=40)
+    home_feed_categories: int = Field(default=10)
+    home_feed_pages: int = Field(default=3)
+    home_feed_page_size: int = Field(default=20)
+    home_feed_refresh_seconds: float = Field(default=5.0)
+    home_feed_ttl_seconds: int = Field(default=7200)
+    home_feed_max_lag_seconds: int = Field(default=30)
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from uuid import UUID
+
+import redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+
+
+def city_feed(city: str) -> str:
+    return f"city:{city}"
+
+
+def category_feed(category_id: UUID) -> str:
+    return f"category:{category_id}"
+
+
+# The first pages of GET /listings?sort_by=newest for the busiest cities and categories, stored
+# as the exact response payloads so serving one is a single GET. app.jobs.home_feed picks the
+# feeds and rebuilds the ones touched by listing changes; a hash records which listings each
+# feed holds, so a listing leaving a feed is noticed without rereading its pages. Each pass of
+# the job also sets a heartbeat that expires after max_lag_seconds: pages are only served while
+# it is set, so a stalled worker sends requests back to the search instead of serving stale pages.
+@dataclass
+class HomeFeedStore:
+    prefix: str
+    pages: int
+    page_size: int
+    ttl_seconds: int
+    max_lag_seconds: int
+
+    def __post_init__(self) -> None:
+        settings = get_settings()
+        self.client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+    def get(self, feed: str, page: int) -> str | None:
+        try:
+            payload, heartbeat = self.client.mget([self._page_key(feed, page), self._heartbeat_key])
+        except RedisError:
+            return None
+        return payload if heartbeat is not None else None
+
+    def record_pass(self, seq: int) -> None:
+        # The listing_changes seq the feeds are up to date with, kept for inspection.
+        self.client.set(self._heartbeat_key, seq, ex=self.max_lag_seconds)
+
+    def replace(self, feed: str, payloads: Sequence[str], listing_ids: Iterable[UUID]) -> None:
+        # Pages past the last stored one are deleted, so those requests fall back to a search.
+        pipeline = self.client.pipeline(transaction=True)
+        for page, payload in enumerate(payloads, start=1):
+            pipeline.set(self._page_key(feed, page), payload, ex=self.ttl_seconds)
+        stale = [self._page_key(feed, page) for page in range(len(payloads) + 1, self.pages + 1)]
+        if stale:
+            pipeline.delete(*stale)
+        pipeline.hset(self._members_key, feed, ",".join(str(listing_id) for listing_id in listing_ids))
+        pipeline.execute()
+
+    def remove(self, feeds: Iterable[str]) -> None:
+        feeds = list(feeds)
+        if not feeds:
+            return
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.delete(*(self._page_key(feed, page) for feed in feeds for page in range(1, self.pages + 1)))
+        pipeline.hdel(self._members_key, *feeds)
+        pipeline.execute()
+
+    def members(self) -> dict[str, set[UUID]]:
+        stored = self.client.hgetall(self._members_key)
+        return {feed: {UUID(member) for member in ids.split(",") if member} for feed, ids in stored.items()}
+
+    def _page_key(self, feed: str, page: int) -> str:
+        return f"{self.prefix}:{feed}:{page}"
+
+    @property
+    def _members_key(self) -> str:
+        return f"{self.prefix}:members"
+
+    @property
+    def _heartbeat_key(self) -> str:
+        return f"{self.prefix}:heartbeat"
+
+
+home_feed = HomeFeedStore(
+    prefix="home_feed",
+    pages=get_settings().home_feed_pages,
+    page_size=get_settings().home_feed_page_size,
+    ttl_seconds=get_settings().home_feed_ttl_seconds,
+    max_lag_seconds=get_settings().home_feed_max_lag_seconds,
+)
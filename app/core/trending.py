@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import enum
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from uuid import UUID
+
+import redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+
+
+class TrendingEvent(str, enum.Enum):
+    view = "view"
+    favorite = "favorite"
+    order = "order"
+
+
+TRENDING_EVENT_WEIGHTS = {
+    TrendingEvent.view: 1.0,
+    TrendingEvent.favorite: 5.0,
+    TrendingEvent.order: 20.0,
+}
+
+
+# Decayed popularity per listing in one sorted set, using forward decay: instead of shrinking
+# every old score, an event is weighted 2^((now - landmark) / half-life), so recording it is a
+# single ZINCRBY and the ranking reads straight from the set. app.jobs.trending_listings moves
+# the landmark forward and rescales the set before the weights grow large.
+@dataclass
+class TrendingRanking:
+    key: str
+    half_life_seconds: float
+    max_size: int
+
+    def __post_init__(self) -> None:
+        settings = get_settings()
+        self.client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+    def record(self, listing_id: UUID, event: TrendingEvent, *, now: float | None = None) -> None:
+        self.record_many({listing_id: 1}, event, now=now)
+
+    def record_many(self, counts: Mapping[UUID, int], event: TrendingEvent, *, now: float | None = None) -> None:
+        if not counts:
+            return
+        try:
+            weight = TRENDING_EVENT_WEIGHTS[event] * self._growth(now)
+            pipeline = self.client.pipeline(transaction=False)
+            for listing_id, count in counts.items():
+                pipeline.zincrby(self.key, weight * count, str(listing_id))
+            pipeline.execute()
+        except RedisError:
+            pass
+
+    def page(self, *, offset: int, limit: int) -> list[UUID]:
+        # ZREVRANGE by rank is O(log n + limit) however deep the page is.
+        try:
+            members = self.client.zrevrange(self.key, offset, offset + limit - 1)
+        except RedisError:
+            return []
+        return [UUID(member) for member in members]
+
+    def listing_ids(self) -> list[UUID]:
+        return [UUID(member) for member in self.client.zrange(self.key, 0, -1)]
+
+    def remove(self, listing_ids: Iterable[UUID]) -> None:
+        members = [str(listing_id) for listing_id in listing_ids]
+        if members:
+            self.client.zrem(self.key, *members)
+
+    def rescale(self, *, min_score: float, now: float | None = None) -> None:
+        # An event recorded between reading the landmark and this transaction keeps its
+        # pre-rescale weight, which overstates it by at most one interval's worth of decay.
+        now = time.time() if now is None else now
+        factor = 1 / self._growth(now)
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.zunionstore(self.key, {self.key: factor})
+        pipeline.zremrangebyscore(self.key, "-inf", f"({min_score}")
+        pipeline.zremrangebyrank(self.key, 0, -(self.max_size + 1))
+        pipeline.set(self._landmark_key, repr(now))
+        pipeline.execute()
+
+    def _growth(self, now: float | None) -> float:
+        now = time.time() if now is None else now
+        landmark = self.client.get(self._landmark_key)
+        if landmark is None:
+            self.client.set(self._landmark_key, repr(now), nx=True)
+            landmark = self.client.get(self._landmark_key)
+        return 2 ** ((now - float(landmark)) / self.half_life_seconds)
+
+    @property
+    def _landmark_key(self) -> str:
+        return f"{self.key}:landmark"
+
+
+trending_listings = TrendingRanking(
+    key="trending:listings",
+    half_life_seconds=get_settings().trending_half_life_hours * 3600,
+    max_size=get_settings().trending_max_listings,
+)
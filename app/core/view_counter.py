@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from uuid import UUID
+
+import redis
+from redis.exceptions import RedisError, ResponseError
+
+from app.core.config import get_settings
+
+
+# Buffers listing detail views in Redis so the read path never writes to Postgres: a hash of
+# pending view deltas plus one HyperLogLog of viewers per listing (~12 KB at most, with a 0.81%
+# standard error). app.jobs.listing_view_flusher drains the deltas into listing_view_counts.
+# Every view pushes the HyperLogLog's expiry out by viewers_ttl_seconds, so listings nobody reads
+# any more (sold, archived) stop holding memory; the last estimate stays in listing_view_counts.
+@dataclass
+class ListingViewCounter:
+    prefix: str
+    viewers_ttl_seconds: int
+
+    def __post_init__(self) -> None:
+        settings = get_settings()
+        self.client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+    def record(self, listing_id: UUID, viewer: str) -> None:
+        member = str(listing_id)
+        # Viewers are hashed so no user id or address is stored in Redis.
+        fingerprint = hashlib.blake2b(viewer.encode(), digest_size=8).hexdigest()
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            pipeline.hincrby(self._pending_key, member, 1)
+            pipeline.pfadd(self._viewers_key(member), fingerprint)
+            pipeline.expire(self._viewers_key(member), self.viewers_ttl_seconds)
+            pipeline.execute()
+        except RedisError:
+            pass
+
+    def take_pending(self) -> dict[UUID, int]:
+        # Renaming the hash swaps in an empty one atomically, so views recorded meanwhile land in
+        # the next flush. A batch left behind by a failed flush is retried before a new one is taken.
+        if not self.client.exists(self._flushing_key):
+            try:
+                self.client.rename(self._pending_key, self._flushing_key)
+            except ResponseError:
+                return {}
+        return {UUID(member): int(delta) for member, delta in self.client.hgetall(self._flushing_key).items()}
+
+    def finish_flush(self) -> None:
+        self.client.delete(self._flushing_key)
+
+    def unique_viewers(self, listing_ids: list[UUID]) -> list[int]:
+        pipeline = self.client.pipeline(transaction=False)
+        for listing_id in listing_ids:
+            pipeline.pfcount(self._viewers_key(str(listing_id)))
+        return [int(count) for count in pipeline.execute()]
+
+    def forget(self, listing_ids: list[UUID]) -> None:
+        if listing_ids:
+            self.client.delete(*(self._viewers_key(str(listing_id)) for listing_id in listing_ids))
+
+    @property
+    def _pending_key(self) -> str:
+        return f"{self.prefix}:pending"
+
+    @property
+    def _flushing_key(self) -> str:
+        return f"{self.prefix}:flushing"
+
+    def _viewers_key(self, member: str) -> str:
+        return f"{self.prefix}:viewers:{member}"
+
+
+listing_view_counter = ListingViewCounter(
+    prefix="views:listings",
+    viewers_ttl_seconds=get_settings().listing_viewers_ttl_seconds,
+)
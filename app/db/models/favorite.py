@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class Favorite(Base):
+    __tablename__ = "favorites"
+
+    # listings.favorite_count is kept in step with these rows by FavoriteService and
+    # reconciled by app.jobs.favorite_counts.
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    listing_id = Column(UUID(as_uuid=True), ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# "My favorites" pages newest first; counting and cascades go by listing.
+Index("ix_favorites_user_created", Favorite.user_id, Favorite.created_at.desc(), Favorite.listing_id.desc())
+Index("ix_favorites_listing_id", Favorite.listing_id)
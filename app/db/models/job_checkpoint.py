@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class JobCheckpoint(Base):
+    __tablename__ = "job_checkpoints"
+
+    # How far a batch job got, e.g. the last listing_changes seq it processed.
+    name = Column(String(64), primary_key=True)
+    position = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
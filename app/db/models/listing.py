@@ -2,13 +2,34 @@ from __future__ import annotations
 
 import enum
 import uuid
+from datetime import datetime, timezone
+from typing import Any
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Numeric, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    and_,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.db.base import Base
+from app.utils.relevance import recency_score
+
+
+# Text search configuration used for listing keywords. "simple" avoids stemming
+# because titles mix French, Arabic transliterations, English and brand names.
+LISTING_SEARCH_CONFIG = "simple"
 
 
 class ListingStatus(str, enum.Enum):
@@ -26,6 +47,12 @@ class ListingCondition(str, enum.Enum):
     poor = "poor"
 
 
+def _initial_relevance_score(context: Any) -> float:
+    # New listings start from recency alone; app.jobs.listing_relevance adds the quality signals.
+    created_at = context.get_current_parameters().get("created_at")
+    return recency_score(created_at or datetime.now(timezone.utc))
+
+
 class Listing(Base):
     __tablename__ = "listings"
 
@@ -39,9 +66,18 @@ class Listing(Base):
     condition = Column(Enum(ListingCondition), nullable=False)
     price = Column(Numeric(12, 2), nullable=False)
     city = Column(String(60), nullable=False)
+    # City centroid from app.utils.gazetteer; null when the city is not in the gazetteer.
+    latitude = Column(Float)
+    longitude = Column(Float)
     status = Column(Enum(ListingStatus), nullable=False, default=ListingStatus.pending)
     is_locked = Column(Boolean, nullable=False, default=False)
     sold_at = Column(DateTime(timezone=True))
+    # Url of the first image by position, maintained by ListingImageRepository.
+    cover_image_url = Column(String)
+    # Maintained by FavoriteService, reconciled by app.jobs.favorite_counts.
+    favorite_count = Column(Integer, nullable=False, default=0)
+    # Log-space relevance (app.utils.relevance), refreshed by app.jobs.listing_relevance.
+    relevance_score = Column(Float, nullable=False, default=_initial_relevance_score)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -51,3 +87,49 @@ class Listing(Base):
         order_by="ListingImage.position",
         cascade="all, delete-orphan",
     )
+
+    # Python mirror of PUBLIC_LISTING_PREDICATE for a loaded row.
+    @property
+    def is_public(self) -> bool:
+        return self.status == ListingStatus.approved and not self.is_locked and self.sold_at is None
+
+
+# Postgres maintains this as a generated column (migration 20241205_listing_search_vector).
+# It is deliberately left out of the mapper so listing rows never load the vector.
+listing_search_vector = literal_column("listings.search_vector", type_=TSVECTOR)
+
+
+# Public search filters on exactly this predicate, which lets Postgres use the partial
+# search indexes below; they only cover live listings.
+PUBLIC_LISTING_PREDICATE = and_(
+    Listing.status == ListingStatus.approved,
+    Listing.is_locked.is_(False),
+    Listing.sold_at.is_(None),
+)
+
+
+def _public_listing_index(name: str, *columns: Any) -> Index:
+    return Index(name, *columns, postgresql_where=PUBLIC_LISTING_PREDICATE)
+
+
+# One index per sort order ("oldest" walks the newest index backwards), optionally led by
+# the equality filters clients use most. Migration 20241209_listing_search_indexes.
+_public_listing_index("ix_listings_public_newest", Listing.created_at.desc(), Listing.id.desc())
+_public_listing_index("ix_listings_public_price", Listing.price, Listing.created_at.desc(), Listing.id.desc())
+_public_listing_index(
+    "ix_listings_public_category_newest", Listing.category_id, Listing.created_at.desc(), Listing.id.desc()
+)
+_public_listing_index(
+    "ix_listings_public_category_price",
+    Listing.category_id,
+    Listing.price,
+    Listing.created_at.desc(),
+    Listing.id.desc(),
+)
+_public_listing_index("ix_listings_public_city_newest", Listing.city, Listing.created_at.desc(), Listing.id.desc())
+_public_listing_index(
+    "ix_listings_public_city_price", Listing.city, Listing.price, Listing.created_at.desc(), Listing.id.desc()
+)
+_public_listing_index("ix_listings_public_relevance", Listing.relevance_score.desc(), Listing.id.desc())
+# Bounding-box prefilter for proximity search.
+_public_listing_index("ix_listings_public_location", Listing.latitude, Listing.longitude)
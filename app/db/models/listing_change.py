@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ListingChange(Base):
+    __tablename__ = "listing_changes"
+
+    # Append-only log behind GET /listings/changes; seq is the client's sync cursor.
+    # No foreign key on listing_id so tombstones outlive the deleted listing.
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    listing_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    deleted = Column(Boolean, nullable=False, default=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import enum
+import uuid
+
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class DuplicateFlagStatus(str, enum.Enum):
+    open = "open"
+    dismissed = "dismissed"
+
+
+class ListingDuplicateFlag(Base):
+    __tablename__ = "listing_duplicate_flags"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # The listing that was created or edited, and the seller's existing listing it resembles.
+    listing_id = Column(UUID(as_uuid=True), ForeignKey("listings.id", ondelete="CASCADE"), nullable=False)
+    duplicate_of_id = Column(UUID(as_uuid=True), ForeignKey("listings.id", ondelete="CASCADE"), nullable=False)
+    similarity = Column(Float, nullable=False)
+    status = Column(Enum(DuplicateFlagStatus), nullable=False, default=DuplicateFlagStatus.open)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    reviewed_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        UniqueConstraint("listing_id", "duplicate_of_id", name="uq_listing_duplicate_flags_pair"),
+        Index("ix_listing_duplicate_flags_status_created_at", "status", "created_at"),
+    )
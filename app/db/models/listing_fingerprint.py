@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, ForeignKey, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class ListingFingerprint(Base):
+    __tablename__ = "listing_fingerprints"
+
+    # MinHash signature of title + description (app.utils.minhash), packed as uint32s.
+    listing_id = Column(UUID(as_uuid=True), ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+
+class ListingFingerprintBucket(Base):
+    __tablename__ = "listing_fingerprint_buckets"
+
+    # One row per LSH band. Keys are namespaced by seller, so a lookup only ever sees
+    # that seller's listings whose signatures agree on a whole band.
+    bucket = Column(BigInteger, primary_key=True)
+    listing_id = Column(
+        UUID(as_uuid=True), ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
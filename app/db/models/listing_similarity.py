@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, Float, ForeignKey, SmallInteger
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+# Neighbours stored per listing, and so the most GET /listings/{id}/similar can return.
+SIMILAR_LISTINGS_TOP_K = 20
+
+class ListingSimilarity(Base):
+    __tablename__ = "listing_similarities"
+
+    # Precomputed "similar items" for a listing, best first; written by app.jobs.similar_listings.
+    listing_id = Column(UUID(as_uuid=True), ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(SmallInteger, primary_key=True)
+    similar_listing_id = Column(
+        UUID(as_uuid=True), ForeignKey("listings.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    score = Column(Float, nullable=False)
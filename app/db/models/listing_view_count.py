@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ListingViewCount(Base):
+    __tablename__ = "listing_view_counts"
+
+    # Kept out of listings so flushing view counts never touches (or locks) the listing rows.
+    listing_id = Column(UUID(as_uuid=True), ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True)
+    view_count = Column(BigInteger, nullable=False, default=0)
+    unique_viewer_count = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
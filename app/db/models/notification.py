@@ -19,6 +19,7 @@ class NotificationEvent(str, enum.Enum):
     withdrawal_created = "withdrawal_created"
     buyer_question = "buyer_question"
     dispute_opened = "dispute_opened"
+    saved_search_match = "saved_search_match"
 
 
 class Notification(Base):
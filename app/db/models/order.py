@@ -33,7 +33,7 @@ class Order(Base):
     buyer_fee = Column(Numeric(12, 2), nullable=False, default=0)
     status = Column(Enum(OrderStatus), nullable=False, default=OrderStatus.pending)
     idempotency_key = Column(String(128), unique=True, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
 
     listing = relationship("Listing")
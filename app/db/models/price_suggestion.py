@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class PriceSuggestion(Base):
+    __tablename__ = "price_suggestions"
+
+    # Price quartiles of recent sales; written by app.jobs.price_suggestions. Coarser bands leave
+    # brand and then condition empty (""), so every key column stays part of the primary key.
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    condition = Column(String(20), primary_key=True)
+    brand = Column(String(255), primary_key=True)
+    sample_size = Column(Integer, nullable=False)
+    low = Column(Numeric(12, 2), nullable=False)
+    median = Column(Numeric(12, 2), nullable=False)
+    high = Column(Numeric(12, 2), nullable=False)
+    computed_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Index, Numeric, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+from app.db.models.listing import ListingCondition
+
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+
+    # Mirrors ListingFilterParams; a null column matches any listing.
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(100))
+    q = Column(String(100))
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"))
+    city = Column(String(60))
+    condition = Column(Enum(ListingCondition))
+    min_price = Column(Numeric(12, 2))
+    max_price = Column(Numeric(12, 2))
+    # `near` as the user typed it, resolved to a point when the search is saved.
+    near = Column(String(60))
+    latitude = Column(Float)
+    longitude = Column(Float)
+    radius_km = Column(Float)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Matching runs the other way round from search: one listing against every saved search.
+    # Each indexed column is probed for the listing's value and for "any" (null).
+    __table_args__ = (
+        Index("ix_saved_searches_category_id", "category_id"),
+        Index("ix_saved_searches_city", "city"),
+        Index("ix_saved_searches_price", "min_price", "max_price"),
+    )
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class SavedSearchAlert(Base):
+    __tablename__ = "saved_search_alerts"
+
+    # Outbox of approved listings whose saved-search alerts are not all sent yet. The row is
+    # committed with the approval, and after_user_id with each batch of notifications, so a fan-out
+    # that fails part way is resumed from its last batch by app.jobs.saved_search_alerts.
+    listing_id = Column(UUID(as_uuid=True), ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True)
+    after_user_id = Column(UUID(as_uuid=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import bindparam, delete, func, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.models.favorite import Favorite
+from app.db.models.listing import Listing
+
+
+class FavoriteRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def add(self, user_id: UUID, listing_id: UUID) -> bool:
+        # ON CONFLICT DO NOTHING keeps repeated adds (and racing ones) from failing; the row
+        # count tells the caller whether this call created the favorite.
+        insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        statement = (
+            insert(Favorite)
+            .values(user_id=user_id, listing_id=listing_id)
+            .on_conflict_do_nothing(index_elements=[Favorite.user_id, Favorite.listing_id])
+        )
+        return self.db.execute(statement).rowcount > 0
+
+    def remove(self, user_id: UUID, listing_id: UUID) -> bool:
+        statement = delete(Favorite).where(Favorite.user_id == user_id, Favorite.listing_id == listing_id)
+        return self.db.execute(statement).rowcount > 0
+
+    def adjust_favorite_count(self, listing_id: UUID, delta: int) -> None:
+        # A counter bump is not a listing edit, so updated_at is kept and no change is recorded.
+        table = Listing.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == listing_id)
+            .values(favorite_count=table.c.favorite_count + delta, updated_at=table.c.updated_at)
+        )
+        self.db.connection().execute(statement)
+
+    def list_for_user(self, user_id: UUID, *, after: tuple[datetime, UUID] | None, limit: int) -> list[Any]:
+        statement = (
+            select(Favorite.listing_id, Favorite.created_at)
+            .where(Favorite.user_id == user_id)
+            .order_by(Favorite.created_at.desc(), Favorite.listing_id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(tuple_(Favorite.created_at, Favorite.listing_id) < tuple_(*after))
+        return list(self.db.execute(statement))
+
+    def favorite_counts(self, *, after: UUID | None, limit: int) -> list[Any]:
+        # (listing id, stored favorite_count, actual number of favorites) for a page of listings.
+        counts = (
+            select(func.count())
+            .where(Favorite.listing_id == Listing.id)
+            .correlate(Listing)
+            .scalar_subquery()
+        )
+        statement = select(Listing.id, Listing.favorite_count, counts).order_by(Listing.id).limit(limit)
+        if after is not None:
+            statement = statement.where(Listing.id > after)
+        return list(self.db.execute(statement))
+
+    def set_favorite_counts(self, counts: Sequence[dict[str, Any]]) -> None:
+        if not counts:
+            return
+        table = Listing.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("listing_id"))
+            .values(favorite_count=bindparam("favorite_count"), updated_at=table.c.updated_at)
+        )
+        self.db.connection().execute(statement, list(counts))
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.models.listing import PUBLIC_LISTING_PREDICATE, Listing
+from app.db.models.listing_change import ListingChange
+
+
+class HomeFeedRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def top_cities(self, limit: int) -> list[str]:
+        statement = (
+            select(Listing.city)
+            .where(PUBLIC_LISTING_PREDICATE, Listing.city.is_not(None))
+            .group_by(Listing.city)
+            .order_by(func.count().desc(), Listing.city)
+            .limit(limit)
+        )
+        return list(self.db.execute(statement).scalars())
+
+    def top_categories(self, limit: int) -> list[UUID]:
+        statement = (
+            select(Listing.category_id)
+            .where(PUBLIC_LISTING_PREDICATE, Listing.category_id.is_not(None))
+            .group_by(Listing.category_id)
+            .order_by(func.count().desc(), Listing.category_id)
+            .limit(limit)
+        )
+        return list(self.db.execute(statement).scalars())
+
+    def changed_listing_ids(self, since: int, until: int) -> set[UUID]:
+        statement = (
+            select(ListingChange.listing_id)
+            .where(ListingChange.seq > since, ListingChange.seq <= until)
+            .distinct()
+        )
+        return set(self.db.execute(statement).scalars())
+
+    def listing_placements(self, listing_ids: Sequence[UUID]) -> list[Any]:
+        # (id, city, category id) of the listings that still exist.
+        statement = select(Listing.id, Listing.city, Listing.category_id).where(Listing.id.in_(listing_ids))
+        return list(self.db.execute(statement))
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.db.models.job_checkpoint import JobCheckpoint
+
+
+class JobCheckpointRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def get_position(self, name: str) -> int | None:
+        checkpoint = self.db.get(JobCheckpoint, name)
+        return checkpoint.position if checkpoint else None
+
+    def set_position(self, name: str, position: int) -> None:
+        checkpoint = self.db.get(JobCheckpoint, name)
+        if checkpoint is None:
+            self.db.add(JobCheckpoint(name=name, position=position))
+        else:
+            checkpoint.position = position
+        self.db.flush()
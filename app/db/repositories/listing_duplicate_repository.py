@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import func
+
+from app.db.models.listing import Listing
+from app.db.models.listing_duplicate_flag import DuplicateFlagStatus, ListingDuplicateFlag
+from app.db.models.listing_fingerprint import ListingFingerprint, ListingFingerprintBucket
+
+
+class ListingDuplicateRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def candidate_signatures(
+        self, bucket_keys: Sequence[int], *, exclude: Sequence[UUID]
+    ) -> list[tuple[int, UUID, bytes]]:
+        # Joining listings skips fingerprints whose listing is already gone.
+        statement = (
+            select(ListingFingerprintBucket.bucket, ListingFingerprint.listing_id, ListingFingerprint.signature)
+            .join(ListingFingerprint, ListingFingerprint.listing_id == ListingFingerprintBucket.listing_id)
+            .join(Listing, Listing.id == ListingFingerprint.listing_id)
+            .where(ListingFingerprintBucket.bucket.in_(bucket_keys), ListingFingerprint.listing_id.not_in(exclude))
+        )
+        return [(bucket, listing_id, signature) for bucket, listing_id, signature in self.db.execute(statement)]
+
+    def save_fingerprints(self, fingerprints: Sequence[tuple[UUID, bytes, Sequence[int]]], *, replace: bool) -> None:
+        if replace:
+            listing_ids = [listing_id for listing_id, _, _ in fingerprints]
+            self.db.execute(
+                delete(ListingFingerprintBucket).where(ListingFingerprintBucket.listing_id.in_(listing_ids))
+            )
+            self.db.execute(delete(ListingFingerprint).where(ListingFingerprint.listing_id.in_(listing_ids)))
+        self.db.execute(
+            insert(ListingFingerprint),
+            [{"listing_id": listing_id, "signature": signature} for listing_id, signature, _ in fingerprints],
+        )
+        self.db.execute(
+            insert(ListingFingerprintBucket),
+            [
+                {"bucket": bucket, "listing_id": listing_id}
+                for listing_id, _, bucket_keys in fingerprints
+                for bucket in dict.fromkeys(bucket_keys)
+            ],
+        )
+
+    def flagged_pairs(self, listing_ids: Sequence[UUID]) -> set[frozenset[UUID]]:
+        statement = select(ListingDuplicateFlag.listing_id, ListingDuplicateFlag.duplicate_of_id).where(
+            or_(ListingDuplicateFlag.listing_id.in_(listing_ids), ListingDuplicateFlag.duplicate_of_id.in_(listing_ids))
+        )
+        return {frozenset(pair) for pair in self.db.execute(statement)}
+
+    def add_flags(self, flags: Sequence[dict[str, Any]]) -> None:
+        if flags:
+            self.db.execute(insert(ListingDuplicateFlag), flags)
+
+    def list_flags(self, *, status: DuplicateFlagStatus, limit: int, offset: int) -> list[Any]:
+        original = aliased(Listing)
+        statement = (
+            select(
+                ListingDuplicateFlag.id,
+                ListingDuplicateFlag.listing_id,
+                ListingDuplicateFlag.duplicate_of_id,
+                ListingDuplicateFlag.similarity,
+                ListingDuplicateFlag.status,
+                ListingDuplicateFlag.created_at,
+                ListingDuplicateFlag.reviewed_at,
+                Listing.user_id,
+                Listing.title.label("listing_title"),
+                original.title.label("duplicate_of_title"),
+            )
+            .join(Listing, Listing.id == ListingDuplicateFlag.listing_id)
+            .join(original, original.id == ListingDuplicateFlag.duplicate_of_id)
+            .where(ListingDuplicateFlag.status == status)
+            .order_by(ListingDuplicateFlag.created_at.desc(), ListingDuplicateFlag.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(self.db.execute(statement))
+
+    def get_flag(self, flag_id: UUID) -> ListingDuplicateFlag | None:
+        return self.db.get(ListingDuplicateFlag, flag_id)
+
+    def set_flag_status(self, flag: ListingDuplicateFlag, status: DuplicateFlagStatus) -> ListingDuplicateFlag:
+        flag.status = status
+        flag.reviewed_at = func.now()
+        self.db.add(flag)
+        self.db.commit()
+        self.db.refresh(flag)
+        return flag
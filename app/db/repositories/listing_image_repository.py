@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.db.models.listing import Listing
 from app.db.models.listing_image import ListingImage
+from app.db.repositories.listing_repository import record_listing_write
 
 
 class ListingImageRepository:
@@ -16,12 +17,16 @@ class ListingImageRepository:
     def add_image(self, listing_id: UUID, url: str, position: int) -> ListingImage:
         image = ListingImage(listing_id=listing_id, url=url, position=position)
         self.db.add(image)
+        self.db.flush()
+        self._refresh_cover_image(listing_id)
         self.db.commit()
         self.db.refresh(image)
         return image
 
     def remove_image(self, image: ListingImage) -> None:
         self.db.delete(image)
+        self.db.flush()
+        self._refresh_cover_image(image.listing_id)
         self.db.commit()
 
     def get_images_for_listing(self, listing_id: UUID) -> Sequence[ListingImage]:
@@ -47,8 +52,23 @@ class ListingImageRepository:
             .filter(ListingImage.listing_id == listing_id, ListingImage.position >= starting_from)
             .update({ListingImage.position: ListingImage.position + 1})
         )
+        self._refresh_cover_image(listing_id)
         self.db.commit()
 
+    def _refresh_cover_image(self, listing_id: UUID) -> None:
+        cover = (
+            self.db.query(ListingImage.url)
+            .filter(ListingImage.listing_id == listing_id)
+            .order_by(ListingImage.position.asc(), ListingImage.created_at.asc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        self.db.query(Listing).filter(Listing.id == listing_id).update(
+            {Listing.cover_image_url: cover}, synchronize_session=False
+        )
+        listing = self.db.get(Listing, listing_id)
+        record_listing_write(self.db, listing_id, public=listing is not None and listing.is_public)
+
     # Convenience aliases for compatibility with different naming expectations
     def create(self, listing_id: UUID, url: str, position: int) -> ListingImage:
         return self.add_image(listing_id, url, position)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import bindparam, case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models.listing import PUBLIC_LISTING_PREDICATE, Listing
+from app.db.models.order import Order, OrderStatus
+from app.db.models.user import KycStatus, User
+
+
+class ListingRelevanceRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def seller_signals(self, seller_ids: Sequence[UUID]) -> list[Any]:
+        # (seller id, KYC verified, completed sales, canceled sales) per seller.
+        orders = (
+            select(
+                Order.seller_id,
+                func.count().filter(Order.status == OrderStatus.completed).label("completed"),
+                func.count().filter(Order.status == OrderStatus.canceled).label("canceled"),
+            )
+            .where(Order.seller_id.in_(seller_ids))
+            .group_by(Order.seller_id)
+            .subquery()
+        )
+        statement = (
+            select(
+                User.id,
+                case((User.kyc_status == KycStatus.verified, True), else_=False),
+                func.coalesce(orders.c.completed, 0),
+                func.coalesce(orders.c.canceled, 0),
+            )
+            .outerjoin(orders, orders.c.seller_id == User.id)
+            .where(User.id.in_(seller_ids))
+        )
+        return list(self.db.execute(statement))
+
+    def public_listings(self, *, after: UUID | None, limit: int) -> list[Any]:
+        statement = (
+            select(Listing.id, Listing.user_id, Listing.created_at, Listing.cover_image_url, Listing.relevance_score)
+            .where(PUBLIC_LISTING_PREDICATE)
+            .order_by(Listing.id)
+            .limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(Listing.id > after)
+        return list(self.db.execute(statement))
+
+    def update_scores(self, scores: Sequence[dict[str, Any]]) -> None:
+        if not scores:
+            return
+        # Only the ranking moves, so updated_at is kept and no listing change is recorded.
+        table = Listing.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("listing_id"))
+            .values(relevance_score=bindparam("score"), updated_at=table.c.updated_at)
+        )
+        self.db.connection().execute(statement, list(scores))
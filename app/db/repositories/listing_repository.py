@@ -1,12 +1,212 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import math
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime
 from decimal import Decimal
 from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Double,
+    and_,
+    case,
+    cast,
+    event,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.orm import Query, Session, selectinload
 
-from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.core.cache import listing_detail_cache, listing_search_cache
+from app.db.explain import Explain
+from app.db.models.listing import (
+    LISTING_SEARCH_CONFIG,
+    PUBLIC_LISTING_PREDICATE,
+    Listing,
+    ListingCondition,
+    ListingStatus,
+    listing_search_vector,
+)
+from app.db.models.listing_change import ListingChange
+from app.db.models.listing_image import ListingImage
+from app.db.models.listing_similarity import ListingSimilarity
+from app.utils.gazetteer import KM_PER_DEGREE, bounding_box
+from app.utils.relevance import MIN_TEXT_RANK, TEXT_RANK_WEIGHT
+
+
+# Session.info key mapping the ids of listings written in the current transaction to
+# whether they were deleted.
+LISTING_WRITES_KEY = "listing_writes"
+
+# Session.info flag set when a write in the current transaction can change what public
+# search returns; only those writes bump the search cache generation.
+LISTING_SEARCH_WRITES_KEY = "listing_search_writes"
+
+# Advisory lock taken while appending to listing_changes so change seqs commit in order. It is
+# global: commits that write listings are serialized from their before_commit hook to the end of
+# the commit, so listing write throughput is bounded by one commit (WAL flush) at a time. Writes
+# that touch no listing never take it.
+LISTING_CHANGES_LOCK_KEY = 0x4C53_4348
+
+
+KEYSET_TYPES: dict[str, tuple[type, ...]] = {
+    "price": (Decimal, datetime, UUID),
+    "newest": (datetime, UUID),
+    "oldest": (datetime, UUID),
+    "rank": (float, datetime, UUID),
+    "distance": (float, datetime, UUID),
+    "relevance": (float, UUID),
+}
+
+
+# Columns behind a ListingResponse; the public search page reads these instead of mapped
+# Listing instances so no identity map or change tracking is built for read-only rows.
+LISTING_ROW_COLUMNS = (
+    Listing.id,
+    Listing.user_id,
+    Listing.title,
+    Listing.description,
+    Listing.category_id,
+    Listing.brand,
+    Listing.size,
+    Listing.condition,
+    Listing.price,
+    Listing.city,
+    Listing.status,
+    Listing.created_at,
+    Listing.updated_at,
+    Listing.cover_image_url,
+    Listing.latitude,
+    Listing.longitude,
+    Listing.favorite_count,
+)
+LISTING_IMAGE_ROW_COLUMNS = (
+    ListingImage.id,
+    ListingImage.listing_id,
+    ListingImage.url,
+    ListingImage.position,
+    ListingImage.created_at,
+)
+
+# Everything the in-memory search index filters and sorts on.
+SEARCH_INDEX_COLUMNS = (
+    Listing.id,
+    Listing.category_id,
+    Listing.city,
+    Listing.condition,
+    Listing.price,
+    Listing.created_at,
+)
+
+
+def _row_columns(fields: frozenset[str] | None) -> tuple[Any, ...]:
+    if fields is None:
+        return LISTING_ROW_COLUMNS
+    return tuple(column for column in LISTING_ROW_COLUMNS if column.key == "id" or column.key in fields)
+
+
+# Sparse reads (fields=...) leave the columns they did not select as None.
+@dataclass(slots=True)
+class ListingRow:
+    id: UUID
+    user_id: UUID | None = None
+    title: str | None = None
+    description: str | None = None
+    category_id: UUID | None = None
+    brand: str | None = None
+    size: str | None = None
+    condition: ListingCondition | None = None
+    price: Decimal | None = None
+    city: str | None = None
+    status: ListingStatus | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    cover_image_url: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    favorite_count: int | None = None
+    images: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class ListingSearchFilters:
+    category_id: UUID | None = None
+    city: str | None = None
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
+    condition: ListingCondition | None = None
+    q: str | None = None
+    near: tuple[float, float] | None = None
+    radius_km: float | None = None
+
+    def signature(self) -> str:
+        normalized = {
+            key: _normalize_filter_value(value) for key, value in sorted(asdict(self).items()) if value is not None
+        }
+        raw = json.dumps(normalized, separators=(",", ":"), sort_keys=True)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _normalize_filter_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value.normalize())
+    if isinstance(value, ListingCondition):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def record_listing_write(db: Session, listing_id: UUID, *, deleted: bool = False, public: bool = True) -> None:
+    # Cache invalidation waits for the commit so readers never repopulate
+    # a cache with rows from a transaction that is still open. Pass public=False for writes
+    # to listings that are not public before or after the write (e.g. pending creates).
+    writes = db.info.setdefault(LISTING_WRITES_KEY, {})
+    writes[listing_id] = deleted or writes.get(listing_id, False)
+    if public:
+        db.info[LISTING_SEARCH_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _append_listing_changes(session: Session) -> None:
+    writes = session.info.get(LISTING_WRITES_KEY)
+    if not writes:
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        # Held until commit: without it a transaction could take a lower seq but commit after
+        # a client has already synced past it, and that change would never be delivered.
+        session.execute(select(func.pg_advisory_xact_lock(LISTING_CHANGES_LOCK_KEY)))
+    session.execute(
+        insert(ListingChange),
+        [{"listing_id": listing_id, "deleted": deleted} for listing_id, deleted in writes.items()],
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_listing_caches(session: Session) -> None:
+    listing_ids = session.info.pop(LISTING_WRITES_KEY, None)
+    if session.info.pop(LISTING_SEARCH_WRITES_KEY, False):
+        listing_search_cache.invalidate()
+    if listing_ids:
+        listing_detail_cache.delete(*(str(listing_id) for listing_id in listing_ids))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_listing_writes(session: Session) -> None:
+    session.info.pop(LISTING_WRITES_KEY, None)
+    session.info.pop(LISTING_SEARCH_WRITES_KEY, None)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class ListingRepository:
@@ -16,28 +216,58 @@ class ListingRepository:
     def create_listing(self, user_id: UUID, data: dict[str, Any]) -> Listing:
         listing = Listing(user_id=user_id, status=ListingStatus.pending, **data)
         self.db.add(listing)
+        self.db.flush()
+        # New listings are pending, so they cannot show up in public search yet.
+        self._record_write(listing.id, public=False)
         self.db.commit()
         self.db.refresh(listing)
         return listing
 
+    def create_listings(self, user_id: UUID, items: Sequence[dict[str, Any]]) -> list[Listing]:
+        listings = [Listing(user_id=user_id, status=ListingStatus.pending, **data) for data in items]
+        self.db.add_all(listings)
+        self.db.flush()
+        # Read the ids before commit expires the instances, then reload the batch in one go.
+        listing_ids = [listing.id for listing in listings]
+        for listing_id in listing_ids:
+            self._record_write(listing_id, public=False)
+        self.db.commit()
+        return self.get_listings_by_ids(listing_ids)
+
     def get_listing_by_id(self, listing_id: UUID) -> Listing | None:
         return self.db.get(Listing, listing_id)
 
+    def get_listings_by_ids(self, listing_ids: Sequence[UUID]) -> list[Listing]:
+        if not listing_ids:
+            return []
+        listings = (
+            self.db.query(Listing)
+            .options(selectinload(Listing.images))
+            .filter(Listing.id.in_(listing_ids))
+            .all()
+        )
+        by_id = {listing.id: listing for listing in listings}
+        return [by_id[listing_id] for listing_id in listing_ids if listing_id in by_id]
+
     def update_listing(self, listing: Listing, data: dict[str, Any]) -> Listing:
+        was_public = listing.is_public
         for key, value in data.items():
             setattr(listing, key, value)
         self.db.add(listing)
+        self._record_write(listing.id, public=was_public or listing.is_public)
         self.db.commit()
         self.db.refresh(listing)
         return listing
 
     def delete_listing(self, listing: Listing) -> None:
+        record_listing_write(self.db, listing.id, deleted=True, public=listing.is_public)
         self.db.delete(listing)
         self.db.commit()
 
     def get_listings_by_user(self, user_id: UUID) -> Sequence[Listing]:
         return (
             self.db.query(Listing)
+            .options(selectinload(Listing.images))
             .filter(Listing.user_id == user_id)
             .order_by(Listing.created_at.desc())
             .all()
@@ -45,46 +275,316 @@ class ListingRepository:
 
     def search_listings(
         self,
+        filters: ListingSearchFilters,
         *,
-        category_id: UUID | None = None,
-        city: str | None = None,
-        min_price: Decimal | None = None,
-        max_price: Decimal | None = None,
-        condition: ListingCondition | None = None,
         sort_by: str,
         limit: int,
-        offset: int,
-    ) -> tuple[list[Listing], int]:
-        query = (
-            self.db.query(Listing)
-            .filter(
-                Listing.status == ListingStatus.approved,
-                Listing.is_locked.is_(False),
-                Listing.sold_at.is_(None),
+        offset: int = 0,
+        after: Sequence[Any] | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[ListingRow], tuple[Any, ...] | None]:
+        columns = _row_columns(fields)
+        # Fetch one extra row so we know whether a next page exists without a second query.
+        query = self.search_page_query(
+            filters,
+            sort_by=sort_by,
+            limit=limit + 1,
+            offset=offset,
+            after=after,
+            columns=columns,
+        )
+        rows = query.all()
+        next_key: tuple[Any, ...] | None = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_key = tuple(rows[-1][len(columns) :])
+        return self._listing_rows(rows, columns, fields), next_key
+
+    def get_listing_rows_by_ids(
+        self,
+        listing_ids: Sequence[UUID],
+        *,
+        fields: frozenset[str] | None = None,
+    ) -> list[ListingRow]:
+        if not listing_ids:
+            return []
+        columns = _row_columns(fields)
+        rows = self.db.query(*columns).filter(Listing.id.in_(listing_ids)).all()
+        by_id = {listing.id: listing for listing in self._listing_rows(rows, columns, fields)}
+        return [by_id[listing_id] for listing_id in listing_ids if listing_id in by_id]
+
+    def get_search_columns(self, listing_ids: Sequence[UUID] | None = None) -> list[Any]:
+        query = self.db.query(*SEARCH_INDEX_COLUMNS).filter(PUBLIC_LISTING_PREDICATE)
+        if listing_ids is not None:
+            query = query.filter(Listing.id.in_(listing_ids))
+        return query.all()
+
+    def latest_listing_change_seq(self) -> int:
+        return self.db.query(func.coalesce(func.max(ListingChange.seq), 0)).scalar()
+
+    def search_page_query(
+        self,
+        filters: ListingSearchFilters,
+        *,
+        sort_by: str,
+        limit: int,
+        offset: int = 0,
+        after: Sequence[Any] | None = None,
+        columns: Sequence[Any] = (Listing,),
+    ) -> Query:
+        sort_columns = self._sort_columns(sort_by, filters)
+        query = self._search_query(filters).with_entities(*columns, *(column for column, _ in sort_columns))
+
+        if after is not None:
+            query = query.filter(self._keyset_predicate(sort_columns, after))
+        query = query.order_by(
+            *(column.desc() if descending else column.asc() for column, descending in sort_columns)
+        )
+        if after is None:
+            query = query.offset(offset)
+        return query.limit(limit)
+
+    def facet_counts(
+        self,
+        filters: ListingSearchFilters,
+        *,
+        price_bounds: Sequence[Decimal],
+    ) -> tuple[int, dict[str, dict[Any, int]]]:
+        price_bucket = case(
+            *((Listing.price < bound, index) for index, bound in enumerate(price_bounds)),
+            else_=len(price_bounds),
+        ).label("price_bucket")
+        dimensions = {
+            "category_id": Listing.category_id,
+            "condition": Listing.condition,
+            "city": Listing.city,
+            "price_bucket": price_bucket,
+        }
+
+        # Each facet is counted under every filter but its own, so a sidebar already narrowed to one
+        # city still lists the other cities. The facet filters move from WHERE into per-facet
+        # FILTER clauses; the rest of the search (public predicate, q, near) stays in WHERE.
+        facet_filters = self._facet_filters(filters)
+        unfiltered = replace(filters, category_id=None, city=None, min_price=None, max_price=None, condition=None)
+
+        def matching(excluded: str | None) -> Any:
+            conditions = [condition for name, owned in facet_filters.items() if name != excluded for condition in owned]
+            return func.count().filter(and_(*conditions)) if conditions else func.count()
+
+        # One scan with GROUPING SETS instead of a query per facet; the empty set yields the total.
+        # grouping(col) is 0 for the rows grouped by that column.
+        rows = (
+            self._search_query(unfiltered)
+            .with_entities(
+                *dimensions.values(),
+                *(func.grouping(column) for column in dimensions.values()),
+                matching(None),
+                *(matching(name) for name in dimensions),
             )
+            .group_by(func.grouping_sets(*(tuple_(column) for column in dimensions.values()), tuple_()))
+            .all()
         )
 
-        if category_id:
-            query = query.filter(Listing.category_id == category_id)
-        if city:
-            query = query.filter(Listing.city == city)
-        if min_price is not None:
-            query = query.filter(Listing.price >= min_price)
-        if max_price is not None:
-            query = query.filter(Listing.price <= max_price)
-        if condition:
-            query = query.filter(Listing.condition == condition)
+        total = 0
+        counts: dict[str, dict[Any, int]] = {name: {} for name in dimensions}
+        size = len(dimensions)
+        for row in rows:
+            values, grouping = row[:size], row[size : 2 * size]
+            if all(grouping):
+                total = row[2 * size]
+                continue
+            index = grouping.index(0)
+            count = row[2 * size + 1 + index]
+            if count:
+                counts[list(dimensions)[index]][values[index]] = count
+        return total, counts
+
+    @staticmethod
+    def _facet_filters(filters: ListingSearchFilters) -> dict[str, list[Any]]:
+        # Keyed like the facet dimensions in facet_counts.
+        price = []
+        if filters.min_price is not None:
+            price.append(Listing.price >= filters.min_price)
+        if filters.max_price is not None:
+            price.append(Listing.price <= filters.max_price)
+        return {
+            "category_id": [Listing.category_id == filters.category_id] if filters.category_id else [],
+            "condition": [Listing.condition == filters.condition] if filters.condition else [],
+            "city": [Listing.city == filters.city] if filters.city else [],
+            "price_bucket": price,
+        }
 
+    def suggest_terms(self, prefix: str, *, limit: int) -> list[tuple[str, str, int]]:
+        pattern = _escape_like(prefix.lower()) + "%"
+        subqueries = []
+        for kind, column in (("brand", Listing.brand), ("title", Listing.title)):
+            normalized = func.lower(column)
+            subqueries.append(
+                self._search_query(ListingSearchFilters())
+                .with_entities(
+                    literal(kind).label("kind"),
+                    func.min(column).label("term"),
+                    func.count().label("hits"),
+                )
+                .filter(normalized.like(pattern, escape="\\"))
+                .group_by(normalized)
+                .order_by(func.count().desc(), normalized.asc())
+                .limit(limit)
+                .subquery()
+            )
+        rows = self.db.execute(union_all(*(select(subquery) for subquery in subqueries))).all()
+        return [(row.kind, row.term, row.hits) for row in rows]
+
+    def get_listing_changes(self, since: int, *, limit: int) -> list[ListingChange]:
+        return (
+            self.db.query(ListingChange)
+            .filter(ListingChange.seq > since)
+            .order_by(ListingChange.seq.asc())
+            .limit(limit)
+            .all()
+        )
+
+    def get_similar_listing_ids(self, listing_id: UUID, *, limit: int) -> list[UUID]:
+        # Neighbours that were sold or unpublished since the last job run are skipped here.
+        statement = (
+            select(ListingSimilarity.similar_listing_id)
+            .join(Listing, Listing.id == ListingSimilarity.similar_listing_id)
+            .where(ListingSimilarity.listing_id == listing_id, PUBLIC_LISTING_PREDICATE)
+            .order_by(ListingSimilarity.position)
+            .limit(limit)
+        )
+        return list(self.db.execute(statement).scalars())
+
+    def get_public_listing_ids(self, listing_ids: Sequence[UUID]) -> list[UUID]:
+        # Keeps the given order, dropping listings that are no longer public.
+        if not listing_ids:
+            return []
+        statement = select(Listing.id).where(Listing.id.in_(listing_ids), PUBLIC_LISTING_PREDICATE)
+        public = set(self.db.execute(statement).scalars())
+        return [listing_id for listing_id in listing_ids if listing_id in public]
+
+    def count_listings(self, filters: ListingSearchFilters) -> int:
+        return self._search_query(filters).count()
+
+    def estimate_listing_count(self, filters: ListingSearchFilters) -> int | None:
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+
+        statement = self._search_query(filters).with_entities(Listing.id).statement
+        plan = self.db.execute(Explain(statement)).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _search_query(self, filters: ListingSearchFilters) -> Query:
+        query = self.db.query(Listing).filter(PUBLIC_LISTING_PREDICATE)
+
+        if filters.category_id:
+            query = query.filter(Listing.category_id == filters.category_id)
+        if filters.city:
+            query = query.filter(Listing.city == filters.city)
+        if filters.min_price is not None:
+            query = query.filter(Listing.price >= filters.min_price)
+        if filters.max_price is not None:
+            query = query.filter(Listing.price <= filters.max_price)
+        if filters.condition:
+            query = query.filter(Listing.condition == filters.condition)
+        if filters.q:
+            query = query.filter(listing_search_vector.op("@@")(self._text_query(filters.q)))
+        if filters.near and filters.radius_km:
+            # The box lets the location index do the work; the distance check trims its corners.
+            min_lat, max_lat, min_lng, max_lng = bounding_box(*filters.near, filters.radius_km)
+            query = query.filter(
+                Listing.latitude.between(min_lat, max_lat),
+                Listing.longitude.between(min_lng, max_lng),
+                self._distance_squared(filters.near) <= filters.radius_km**2,
+            )
+        return query
+
+    @staticmethod
+    def _distance_squared(near: tuple[float, float]) -> Any:
+        # Equirectangular approximation in km²: plain arithmetic that any SQL backend evaluates,
+        # and well under 1% off at city-level radii.
+        latitude, longitude = near
+        lng_scale = KM_PER_DEGREE * math.cos(math.radians(latitude))
+        dy = (Listing.latitude - latitude) * KM_PER_DEGREE
+        dx = (Listing.longitude - longitude) * lng_scale
+        return cast(dy * dy + dx * dx, Double)
+
+    def _listing_rows(
+        self,
+        rows: Sequence[Any],
+        columns: Sequence[Any],
+        fields: frozenset[str] | None,
+    ) -> list[ListingRow]:
+        keys = [column.key for column in columns]
+        listings = [ListingRow(**dict(zip(keys, row))) for row in rows]
+        if fields is None or "images" in fields:
+            images = self._image_rows([listing.id for listing in listings])
+            for listing in listings:
+                listing.images = images.get(listing.id, [])
+        return listings
+
+    def _image_rows(self, listing_ids: Sequence[UUID]) -> dict[UUID, list[dict[str, Any]]]:
+        if not listing_ids:
+            return {}
+        statement = (
+            select(*LISTING_IMAGE_ROW_COLUMNS)
+            .where(ListingImage.listing_id.in_(listing_ids))
+            .order_by(ListingImage.position.asc(), ListingImage.created_at.asc())
+        )
+        keys = [column.key for column in LISTING_IMAGE_ROW_COLUMNS]
+        images: dict[UUID, list[dict[str, Any]]] = {}
+        for row in self.db.execute(statement).tuples():
+            image = dict(zip(keys, row))
+            images.setdefault(image["listing_id"], []).append(image)
+        return images
+
+    @staticmethod
+    def _text_query(q: str) -> Any:
+        return func.websearch_to_tsquery(LISTING_SEARCH_CONFIG, q)
+
+    @classmethod
+    def _sort_columns(cls, sort_by: str, filters: ListingSearchFilters) -> list[tuple[Any, bool]]:
+        if sort_by == "rank" and filters.q:
+            # Cast to double precision so the rank round-trips exactly through a cursor.
+            rank = cast(func.ts_rank_cd(listing_search_vector, cls._text_query(filters.q)), Double)
+            return [(rank, True), (Listing.created_at, True), (Listing.id, True)]
+        if sort_by == "relevance":
+            if not filters.q:
+                # Served straight from ix_listings_public_relevance.
+                return [(Listing.relevance_score, True), (Listing.id, True)]
+            # Text rank depends on the query, so it joins the precomputed score per row.
+            rank = cast(func.ts_rank_cd(listing_search_vector, cls._text_query(filters.q)), Double)
+            score = Listing.relevance_score + TEXT_RANK_WEIGHT * func.ln(func.greatest(rank, MIN_TEXT_RANK))
+            return [(score, True), (Listing.id, True)]
+        if sort_by == "distance" and filters.near:
+            return [(cls._distance_squared(filters.near), False), (Listing.created_at, True), (Listing.id, True)]
         if sort_by == "price":
-            query = query.order_by(Listing.price.asc(), Listing.created_at.desc())
-        elif sort_by == "oldest":
-            query = query.order_by(Listing.created_at.asc())
-        else:
-            query = query.order_by(Listing.created_at.desc())
+            return [(Listing.price, False), (Listing.created_at, True), (Listing.id, True)]
+        if sort_by == "oldest":
+            return [(Listing.created_at, False), (Listing.id, False)]
+        return [(Listing.created_at, True), (Listing.id, True)]
 
-        total = query.count()
-        listings = query.offset(offset).limit(limit).all()
-        return listings, total
+    @staticmethod
+    def _keyset_predicate(sort_columns: list[tuple[Any, bool]], after: Sequence[Any]) -> Any:
+        directions = {descending for _, descending in sort_columns}
+        if len(directions) == 1:
+            columns = tuple_(*(column for column, _ in sort_columns))
+            values = tuple_(*after)
+            return columns < values if directions.pop() else columns > values
+
+        # Mixed directions cannot use a row comparison, so expand it into
+        # (a > x) OR (a = x AND b < y) OR ... and keep a plain bound on the
+        # leading column so the index range scan still applies.
+        branches = []
+        for index, (column, descending) in enumerate(sort_columns):
+            prefix = [prev == value for (prev, _), value in zip(sort_columns[:index], after[:index])]
+            step = column < after[index] if descending else column > after[index]
+            branches.append(and_(*prefix, step))
+        leading, leading_descending = sort_columns[0]
+        bound = leading <= after[0] if leading_descending else leading >= after[0]
+        return and_(bound, or_(*branches))
 
     def check_availability(self, listing_id: UUID, *, for_update: bool = False) -> Listing | None:
         query = self.db.query(Listing).filter(Listing.id == listing_id)
@@ -101,18 +601,25 @@ class ListingRepository:
         if not target:
             return None
 
+        was_public = target.is_public
         target.is_locked = True
         target.status = ListingStatus.sold
         self.db.add(target)
+        self._record_write(target.id, public=was_public)
         self.db.flush()
         self.db.refresh(target)
         return target
 
     def release_listing(self, listing: Listing, *, new_status: ListingStatus | None = None) -> Listing:
+        was_public = listing.is_public
         listing.is_locked = False
         if new_status:
             listing.status = new_status
         self.db.add(listing)
+        self._record_write(listing.id, public=was_public or listing.is_public)
         self.db.flush()
         self.db.refresh(listing)
         return listing
+
+    def _record_write(self, listing_id: UUID, *, public: bool = True) -> None:
+        record_listing_write(self.db, listing_id, public=public)
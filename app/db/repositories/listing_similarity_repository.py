@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.models.listing import PUBLIC_LISTING_PREDICATE, Listing
+from app.db.models.listing_change import ListingChange
+from app.db.models.listing_similarity import ListingSimilarity
+
+
+CORPUS_COLUMNS = (Listing.id, Listing.category_id, Listing.title, Listing.brand, Listing.description)
+
+
+def _in_category(category_id: UUID | None) -> Any:
+    return Listing.category_id.is_(None) if category_id is None else Listing.category_id == category_id
+
+
+class ListingSimilarityRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def changed_listing_ids(self, since: int) -> set[UUID]:
+        statement = select(ListingChange.listing_id).where(ListingChange.seq > since).distinct()
+        return set(self.db.execute(statement).scalars())
+
+    def listings_referencing(self, listing_ids: Iterable[UUID]) -> set[UUID]:
+        listing_ids = list(listing_ids)
+        if not listing_ids:
+            return set()
+        statement = select(ListingSimilarity.listing_id).where(
+            ListingSimilarity.similar_listing_id.in_(listing_ids)
+        ).distinct()
+        return set(self.db.execute(statement).scalars())
+
+    def public_categories(self, listing_ids: Iterable[UUID] | None = None) -> set[UUID | None]:
+        statement = select(Listing.category_id).where(PUBLIC_LISTING_PREDICATE).distinct()
+        if listing_ids is not None:
+            statement = statement.where(Listing.id.in_(list(listing_ids)))
+        return set(self.db.execute(statement).scalars())
+
+    def corpus(self, category_id: UUID | None) -> list[Any]:
+        statement = (
+            select(*CORPUS_COLUMNS)
+            .where(PUBLIC_LISTING_PREDICATE, _in_category(category_id))
+            .order_by(Listing.id)
+        )
+        return list(self.db.execute(statement))
+
+    def weakest_scores(self, category_id: UUID | None) -> dict[UUID, tuple[int, float]]:
+        # Neighbour count and lowest kept score per listing: a new candidate only matters if it beats it.
+        statement = (
+            select(ListingSimilarity.listing_id, func.count(), func.min(ListingSimilarity.score))
+            .join(Listing, Listing.id == ListingSimilarity.listing_id)
+            .where(_in_category(category_id))
+            .group_by(ListingSimilarity.listing_id)
+        )
+        return {listing_id: (count, score) for listing_id, count, score in self.db.execute(statement)}
+
+    def clear(self, listing_ids: Iterable[UUID] | None = None) -> None:
+        statement = delete(ListingSimilarity)
+        if listing_ids is not None:
+            listing_ids = list(listing_ids)
+            if not listing_ids:
+                return
+            statement = statement.where(ListingSimilarity.listing_id.in_(listing_ids))
+        self.db.execute(statement)
+
+    def insert_neighbours(self, rows: Sequence[dict[str, Any]]) -> None:
+        if rows:
+            self.db.execute(insert(ListingSimilarity), rows)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.db.models.listing import Listing
+from app.db.models.listing_view_count import ListingViewCount
+
+
+class ListingViewRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def existing_listing_ids(self, listing_ids: Sequence[UUID]) -> set[UUID]:
+        statement = select(Listing.id).where(Listing.id.in_(listing_ids))
+        return set(self.db.execute(statement).scalars())
+
+    def add_views(self, rows: Sequence[dict[str, Any]]) -> None:
+        # One INSERT .. ON CONFLICT for the whole batch; view counts are deltas, unique viewer
+        # counts are the HyperLogLog estimate at flush time. A HyperLogLog that expired starts
+        # again from zero, so the stored estimate only ever grows.
+        if not rows:
+            return
+        postgres = self.db.get_bind().dialect.name == "postgresql"
+        insert = postgresql.insert if postgres else sqlite.insert
+        greatest = func.greatest if postgres else func.max
+        statement = insert(ListingViewCount)
+        statement = statement.on_conflict_do_update(
+            index_elements=[ListingViewCount.listing_id],
+            set_={
+                "view_count": ListingViewCount.view_count + statement.excluded.view_count,
+                "unique_viewer_count": greatest(
+                    ListingViewCount.unique_viewer_count, statement.excluded.unique_viewer_count
+                ),
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(statement, list(rows))
+
+    def get(self, listing_id: UUID) -> ListingViewCount | None:
+        return self.db.get(ListingViewCount, listing_id)
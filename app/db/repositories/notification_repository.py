@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Sequence
 from uuid import UUID
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 
@@ -26,6 +27,20 @@ class NotificationRepository:
         self.db.refresh(notification)
         return notification
 
+    def create_many(
+        self,
+        *,
+        user_ids: Sequence[UUID],
+        event: NotificationEvent,
+        payload: dict[str, object],
+    ) -> None:
+        if not user_ids:
+            return
+        self.db.execute(
+            insert(Notification),
+            [{"user_id": user_id, "event": event, "payload": payload} for user_id in user_ids],
+        )
+
     def list_for_user(self, user_id: UUID, limit: int = 50) -> Sequence[Notification]:
         return (
             self.db.query(Notification)
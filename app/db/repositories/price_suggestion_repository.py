@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.db.models.job_checkpoint import JobCheckpoint
+from app.db.models.listing import Listing
+from app.db.models.order import Order, OrderStatus
+from app.db.models.price_suggestion import PriceSuggestion
+
+
+PRICE_SUGGESTIONS_CHECKPOINT = "price_suggestions"
+# Orders past the seller's confirmation; pending and canceled ones never sold at their price.
+SOLD_ORDER_STATUSES = (OrderStatus.confirmed, OrderStatus.shipped, OrderStatus.delivered, OrderStatus.completed)
+
+
+def normalize_brand(value: str | None) -> str:
+    return " ".join((value or "").lower().split())
+
+
+class PriceSuggestionRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def changed_categories(
+        self, *, updated_since: datetime, expired_from: datetime, expired_to: datetime
+    ) -> set[UUID]:
+        # Categories with an order placed or updated since the last run, or one that left the window.
+        statement = (
+            select(Listing.category_id)
+            .join(Order, Order.listing_id == Listing.id)
+            .where(
+                Listing.category_id.is_not(None),
+                or_(
+                    Order.updated_at >= updated_since,
+                    Order.created_at.between(expired_from, expired_to),
+                ),
+            )
+            .distinct()
+        )
+        return set(self.db.execute(statement).scalars())
+
+    def recent_sales(self, since: datetime, categories: Iterable[UUID] | None = None) -> list[Any]:
+        statement = (
+            select(Listing.category_id, Listing.condition, Listing.brand, Order.price_amount)
+            .join(Order, Order.listing_id == Listing.id)
+            .where(
+                Listing.category_id.is_not(None),
+                Order.status.in_(SOLD_ORDER_STATUSES),
+                Order.created_at >= since,
+            )
+        )
+        if categories is not None:
+            statement = statement.where(Listing.category_id.in_(list(categories)))
+        return list(self.db.execute(statement))
+
+    def replace(self, categories: Iterable[UUID] | None, rows: Sequence[dict[str, Any]]) -> None:
+        statement = delete(PriceSuggestion)
+        if categories is not None:
+            statement = statement.where(PriceSuggestion.category_id.in_(list(categories)))
+        self.db.execute(statement)
+        if rows:
+            self.db.execute(insert(PriceSuggestion), rows)
+
+    def all_suggestions(self) -> list[Any]:
+        return list(self.db.execute(select(PriceSuggestion.__table__)))
+
+    def last_computed(self) -> int | None:
+        checkpoint = self.db.get(JobCheckpoint, PRICE_SUGGESTIONS_CHECKPOINT)
+        return checkpoint.position if checkpoint else None
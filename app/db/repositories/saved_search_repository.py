@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import exists, func, literal, or_, select, union
+from sqlalchemy.orm import Session
+
+from app.db.models.listing import LISTING_SEARCH_CONFIG, Listing, listing_search_vector
+from app.db.models.saved_search import SavedSearch
+from app.db.models.saved_search_alert import SavedSearchAlert
+from app.utils.gazetteer import KM_PER_DEGREE
+
+
+def _matches_any_or(column: Any, value: Any) -> Any:
+    if value is None:
+        return column.is_(None)
+    return or_(column.is_(None), column == value)
+
+
+class SavedSearchRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def create(self, user_id: UUID, data: dict[str, Any]) -> SavedSearch:
+        saved_search = SavedSearch(user_id=user_id, **data)
+        self.db.add(saved_search)
+        self.db.commit()
+        self.db.refresh(saved_search)
+        return saved_search
+
+    def get_by_id(self, saved_search_id: UUID) -> SavedSearch | None:
+        return self.db.get(SavedSearch, saved_search_id)
+
+    def list_for_user(self, user_id: UUID) -> Sequence[SavedSearch]:
+        return (
+            self.db.query(SavedSearch)
+            .filter(SavedSearch.user_id == user_id)
+            .order_by(SavedSearch.created_at.desc())
+            .all()
+        )
+
+    def count_for_user(self, user_id: UUID) -> int:
+        return self.db.query(SavedSearch).filter(SavedSearch.user_id == user_id).count()
+
+    def delete(self, saved_search: SavedSearch) -> None:
+        self.db.delete(saved_search)
+        self.db.commit()
+
+    def matching_user_ids(self, listing: Listing, *, after: UUID | None = None, limit: int) -> list[UUID]:
+        # Users with at least one saved search matching the listing, in id order so callers can
+        # page through a large fan-out with `after`. Sellers are never alerted about their own listing.
+        # `category_id IS NULL OR category_id = :id` cannot drive an index probe, so the category
+        # is split into an exact branch and an "any category" branch, each probing
+        # ix_saved_searches_category_id; the other dimensions are filtered within each branch.
+        common = [SavedSearch.user_id != listing.user_id, *self._match_predicates(listing)]
+        if after is not None:
+            common.append(SavedSearch.user_id > after)
+        branches = [select(SavedSearch.user_id).where(SavedSearch.category_id.is_(None), *common)]
+        if listing.category_id is not None:
+            branches.append(select(SavedSearch.user_id).where(SavedSearch.category_id == listing.category_id, *common))
+        # UNION also drops users with several matching saved searches.
+        matched = (union(*branches) if len(branches) > 1 else branches[0].distinct()).subquery()
+        statement = select(matched.c.user_id).order_by(matched.c.user_id).limit(limit)
+        return list(self.db.execute(statement).scalars())
+
+    def queue_alerts(self, listing_id: UUID) -> None:
+        # Not flushed: the row is committed together with the approval that queues it.
+        self.db.merge(SavedSearchAlert(listing_id=listing_id))
+
+    def lock_alert(self, listing_id: UUID) -> SavedSearchAlert | None:
+        # A fan-out that is running elsewhere holds the row; skip it rather than send twice.
+        return (
+            self.db.query(SavedSearchAlert)
+            .filter(SavedSearchAlert.listing_id == listing_id)
+            .with_for_update(skip_locked=True)
+            .one_or_none()
+        )
+
+    def queued_alert_listing_ids(self, *, limit: int) -> list[UUID]:
+        statement = (
+            select(SavedSearchAlert.listing_id).order_by(SavedSearchAlert.created_at, SavedSearchAlert.listing_id)
+        ).limit(limit)
+        return list(self.db.execute(statement).scalars())
+
+    def delete_alert(self, alert: SavedSearchAlert) -> None:
+        self.db.delete(alert)
+
+    def _match_predicates(self, listing: Listing) -> list[Any]:
+        # The category is matched by the branches in matching_user_ids.
+        predicates = [
+            _matches_any_or(SavedSearch.city, listing.city),
+            _matches_any_or(SavedSearch.condition, listing.condition),
+            or_(SavedSearch.min_price.is_(None), SavedSearch.min_price <= listing.price),
+            or_(SavedSearch.max_price.is_(None), SavedSearch.max_price >= listing.price),
+        ]
+
+        if listing.latitude is None or listing.longitude is None:
+            predicates.append(SavedSearch.latitude.is_(None))
+        else:
+            # Same equirectangular distance as proximity search, scaled at the listing's latitude.
+            lng_scale = KM_PER_DEGREE * math.cos(math.radians(listing.latitude))
+            dy = (SavedSearch.latitude - listing.latitude) * KM_PER_DEGREE
+            dx = (SavedSearch.longitude - listing.longitude) * lng_scale
+            predicates.append(
+                or_(SavedSearch.latitude.is_(None), dy * dy + dx * dx <= SavedSearch.radius_km * SavedSearch.radius_km)
+            )
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            keywords = exists(
+                select(literal(1))
+                .select_from(Listing)
+                .where(
+                    Listing.id == listing.id,
+                    listing_search_vector.op("@@")(func.websearch_to_tsquery(LISTING_SEARCH_CONFIG, SavedSearch.q)),
+                )
+            )
+            predicates.append(or_(SavedSearch.q.is_(None), keywords))
+        else:
+            # Keyword matching needs the Postgres search vector.
+            predicates.append(SavedSearch.q.is_(None))
+        return predicates
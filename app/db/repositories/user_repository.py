@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Sequence
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -87,3 +88,10 @@ class UserRepository:
             self.db.refresh(user)
         else:
             self.db.flush()
+
+    def mark_unread_notifications(self, user_ids: Sequence[UUID]) -> None:
+        if not user_ids:
+            return
+        self.db.query(User).filter(User.id.in_(user_ids)).update(
+            {User.has_unread_notifications: True}, synchronize_session=False
+        )
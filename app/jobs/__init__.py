@@ -0,0 +1 @@
+"""Offline batch jobs."""
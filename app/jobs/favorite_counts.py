@@ -0,0 +1,72 @@
+"""Reconcile ``listings.favorite_count`` with the favorites table.
+
+Run with ``python -m app.jobs.favorite_counts``, e.g. nightly. FavoriteService moves the counter
+in the same transaction as the favorite row, so drift only comes from writes outside it (cascaded
+deletes of users, manual fixes); this job recounts every listing in batches and only writes the
+counts that are off.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import RedisCache, listing_detail_cache
+from app.db.repositories.favorite_repository import FavoriteRepository
+from app.db.session import SessionLocal
+
+
+BATCH_SIZE = 5_000
+
+
+class FavoriteCountsJob:
+    def __init__(
+        self,
+        db: Session,
+        *,
+        batch_size: int = BATCH_SIZE,
+        detail_cache: RedisCache | None = listing_detail_cache,
+    ) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.detail_cache = detail_cache
+        self.favorites = FavoriteRepository(db)
+
+    def run(self) -> int:
+        fixed = 0
+        after = None
+        while True:
+            rows = self.favorites.favorite_counts(after=after, limit=self.batch_size)
+            if not rows:
+                break
+            drifted = [
+                {"listing_id": listing_id, "favorite_count": actual}
+                for listing_id, stored, actual in rows
+                if stored != actual
+            ]
+            self.favorites.set_favorite_counts(drifted)
+            self.db.commit()
+            if drifted and self.detail_cache:
+                self.detail_cache.delete(*(str(row["listing_id"]) for row in drifted))
+            fixed += len(drifted)
+            after = rows[-1].id
+            if len(rows) < self.batch_size:
+                break
+        return fixed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        fixed = FavoriteCountsJob(db).run()
+    finally:
+        db.close()
+    print(f"favorite counts corrected for {fixed} listings")
+
+
+if __name__ == "__main__":
+    main()
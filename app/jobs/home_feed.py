@@ -0,0 +1,155 @@
+"""Keep the materialized home feed pages in Redis up to date.
+
+Run with ``python -m app.jobs.home_feed`` as a long-lived worker; every
+``HOME_FEED_REFRESH_SECONDS`` seconds it reads the listing changes since its last pass and
+rebuilds only the feeds they touch: the feeds of a changed listing's city and category, and any
+feed that held it. If no pass completes for ``HOME_FEED_MAX_LAG_SECONDS``, the API stops serving
+the stored pages and searches instead until the worker catches up. Add ``--full`` (e.g. hourly
+from cron, together with ``--once``) to pick the busiest ``HOME_FEED_CITIES`` cities and
+``HOME_FEED_CATEGORIES`` categories again and rebuild every feed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Iterable
+
+from sqlalchemy.orm import Session
+
+from app.api.v1.schemas.listings import ListingFilterParams, ListingSortOption
+from app.core.cache import listing_count_cache, listing_detail_cache, listing_facets_cache, listing_search_cache
+from app.core.config import get_settings
+from app.core.home_feed import HomeFeedStore, category_feed, city_feed, home_feed
+from app.db.repositories.category_repository import CategoryRepository
+from app.db.repositories.home_feed_repository import HomeFeedRepository
+from app.db.repositories.job_checkpoint_repository import JobCheckpointRepository
+from app.db.repositories.listing_image_repository import ListingImageRepository
+from app.db.repositories.listing_repository import ListingRepository
+from app.db.session import SessionLocal
+from app.services.listing_service import ListingService
+from app.services.listing_totals import ListingTotalsStrategy
+
+
+CHECKPOINT_NAME = "home_feed"
+
+
+class HomeFeedJob:
+    def __init__(
+        self,
+        db: Session,
+        store: HomeFeedStore = home_feed,
+        *,
+        cities: int | None = None,
+        categories: int | None = None,
+    ) -> None:
+        self.db = db
+        self.store = store
+        self.cities = cities or get_settings().home_feed_cities
+        self.categories = categories or get_settings().home_feed_categories
+        self.feeds = HomeFeedRepository(db)
+        self.checkpoints = JobCheckpointRepository(db)
+        self.listings = ListingRepository(db)
+        # Pages are rendered by the same code as GET /listings, so a stored page is
+        # byte-for-byte what the search would have returned.
+        self.listing_service = ListingService(
+            listing_repository=self.listings,
+            listing_image_repository=ListingImageRepository(db),
+            category_repository=CategoryRepository(db),
+            totals_strategy=ListingTotalsStrategy(
+                self.listings,
+                cache=listing_count_cache,
+                estimate_threshold=get_settings().listing_count_estimate_threshold,
+            ),
+            search_cache=listing_search_cache,
+            facets_cache=listing_facets_cache,
+            detail_cache=listing_detail_cache,
+        )
+
+    def run(self, *, full: bool = False) -> int:
+        # Read the seq first: listings changed while the job runs are picked up again next time.
+        last_seq = self.listings.latest_listing_change_seq()
+        since = None if full else self.checkpoints.get_position(CHECKPOINT_NAME)
+        if since is None:
+            rebuilt = self._rebuild_all()
+        elif last_seq > since:
+            rebuilt = self._rebuild_changed(since, last_seq)
+        else:
+            rebuilt = 0
+        self.checkpoints.set_position(CHECKPOINT_NAME, last_seq)
+        self.db.commit()
+        self.store.record_pass(last_seq)
+        return rebuilt
+
+    def _rebuild_all(self) -> int:
+        feeds = [city_feed(city) for city in self.feeds.top_cities(self.cities)]
+        feeds.extend(category_feed(category_id) for category_id in self.feeds.top_categories(self.categories))
+        self.store.remove(set(self.store.members()) - set(feeds))
+        return self._rebuild(feeds)
+
+    def _rebuild_changed(self, since: int, until: int) -> int:
+        changed = self.feeds.changed_listing_ids(since, until)
+        if not changed:
+            return 0
+        members = self.store.members()
+        touched = {feed for feed, listing_ids in members.items() if listing_ids & changed}
+        for _, city, category_id in self.feeds.listing_placements(list(changed)):
+            if city is not None:
+                touched.add(city_feed(city))
+            if category_id is not None:
+                touched.add(category_feed(category_id))
+        # Only the feeds picked by the last full run are kept up to date.
+        return self._rebuild(feed for feed in touched if feed in members)
+
+    def _rebuild(self, feeds: Iterable[str]) -> int:
+        rebuilt = 0
+        for feed in feeds:
+            filters = self._feed_filters(feed)
+            payloads = []
+            listing_ids = []
+            for page in range(1, self.store.pages + 1):
+                response = self.listing_service.search_public_listings(
+                    filters,
+                    page=page,
+                    page_size=self.store.page_size,
+                )
+                payloads.append(response.model_dump_json())
+                listing_ids.extend(item.id for item in response.items)
+                if len(response.items) < self.store.page_size:
+                    break
+            self.store.replace(feed, payloads, listing_ids)
+            rebuilt += 1
+        return rebuilt
+
+    @staticmethod
+    def _feed_filters(feed: str) -> ListingFilterParams:
+        kind, _, value = feed.partition(":")
+        if kind == "city":
+            return ListingFilterParams(city=value, sort_by=ListingSortOption.newest)
+        return ListingFilterParams(category_id=value, sort_by=ListingSortOption.newest)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Pick the feeds again and rebuild all of them.")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit.")
+    args = parser.parse_args()
+
+    interval = get_settings().home_feed_refresh_seconds
+    full = args.full
+    while True:
+        started = time.monotonic()
+        db = SessionLocal()
+        try:
+            rebuilt = HomeFeedJob(db).run(full=full)
+        finally:
+            db.close()
+        if args.once:
+            print(f"home feed rebuilt {rebuilt} feeds")
+            return
+        full = False
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Backfill duplicate-detection fingerprints for listings created before they existed.
+
+Run with ``python -m app.jobs.listing_fingerprints`` once after migrating, then e.g. hourly. New
+and edited listings are fingerprinted by ListingService as they are written; this catches up
+older rows and listings whose fingerprinting failed on the write path, and flags the duplicates
+among them for moderation.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models.listing import Listing
+from app.db.models.listing_fingerprint import ListingFingerprint
+from app.db.repositories.listing_duplicate_repository import ListingDuplicateRepository
+from app.db.session import SessionLocal
+from app.services.listing_duplicate_service import ListingDuplicateService
+
+
+BATCH_SIZE = 500
+
+
+def backfill(db: Session, *, batch_size: int = BATCH_SIZE) -> int:
+    service = ListingDuplicateService(db=db, duplicate_repository=ListingDuplicateRepository(db))
+    indexed = 0
+    while True:
+        # Oldest first, so a re-post is flagged against the listing it copies.
+        statement = (
+            select(Listing)
+            .outerjoin(ListingFingerprint, ListingFingerprint.listing_id == Listing.id)
+            .where(ListingFingerprint.listing_id.is_(None))
+            .order_by(Listing.created_at, Listing.id)
+            .limit(batch_size)
+        )
+        listings = list(db.execute(statement).scalars())
+        if not listings:
+            return indexed
+        service.index_listings(listings)
+        indexed += len(listings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        indexed = backfill(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"fingerprinted {indexed} listings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Refresh the precomputed relevance score behind ``sort_by=relevance``.
+
+Run with ``python -m app.jobs.listing_relevance``, e.g. every 15 minutes. Recency is built into
+the score when a listing is created; this job folds in the quality signals of the listing and
+its seller and only writes the scores that moved.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.db.repositories.listing_relevance_repository import ListingRelevanceRepository
+from app.db.session import SessionLocal
+from app.utils.relevance import recency_score
+
+
+BATCH_SIZE = 5_000
+# Log-space quality boosts; ln(2) is worth as much as being one half-life newer.
+COMPLETED_SALES_WEIGHT = 0.5
+VERIFIED_SELLER_BOOST = math.log(1.5)
+COVER_IMAGE_BOOST = math.log(1.25)
+# A seller who cancels every order keeps half their score; ln(1 - 0.5 * rate).
+CANCELED_SALES_PENALTY = 0.5
+SCORE_TOLERANCE = 1e-9
+
+
+def relevance_scores(listings: Sequence[Any], sellers: dict[Any, Any]) -> np.ndarray:
+    count = len(listings)
+    recency = np.fromiter((recency_score(row.created_at) for row in listings), dtype=np.float64, count=count)
+    has_cover = np.fromiter((row.cover_image_url is not None for row in listings), dtype=bool, count=count)
+    signals = [sellers.get(row.user_id) for row in listings]
+    verified = np.fromiter((bool(signal and signal[1]) for signal in signals), dtype=bool, count=count)
+    completed = np.fromiter((signal[2] if signal else 0 for signal in signals), dtype=np.float64, count=count)
+    canceled = np.fromiter((signal[3] if signal else 0 for signal in signals), dtype=np.float64, count=count)
+
+    finished = completed + canceled
+    cancel_rate = np.divide(canceled, finished, out=np.zeros(count), where=finished > 0)
+    return (
+        recency
+        + COMPLETED_SALES_WEIGHT * np.log1p(completed)
+        + VERIFIED_SELLER_BOOST * verified
+        + COVER_IMAGE_BOOST * has_cover
+        + np.log1p(-CANCELED_SALES_PENALTY * cancel_rate)
+    )
+
+
+class ListingRelevanceJob:
+    def __init__(self, db: Session, *, batch_size: int = BATCH_SIZE) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.relevance = ListingRelevanceRepository(db)
+
+    def run(self) -> int:
+        updated = 0
+        after = None
+        while True:
+            listings = self.relevance.public_listings(after=after, limit=self.batch_size)
+            if not listings:
+                break
+            sellers = {row[0]: row for row in self.relevance.seller_signals(list({row.user_id for row in listings}))}
+            scores = relevance_scores(listings, sellers)
+            current = np.fromiter((row.relevance_score for row in listings), dtype=np.float64, count=len(listings))
+            moved = np.flatnonzero(np.abs(scores - current) > SCORE_TOLERANCE)
+            self.relevance.update_scores(
+                [{"listing_id": listings[index].id, "score": float(scores[index])} for index in moved]
+            )
+            self.db.commit()
+            updated += len(moved)
+            after = listings[-1].id
+            if len(listings) < self.batch_size:
+                break
+        return updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        updated = ListingRelevanceJob(db).run()
+    finally:
+        db.close()
+    print(f"relevance scores updated for {updated} listings")
+
+
+if __name__ == "__main__":
+    main()
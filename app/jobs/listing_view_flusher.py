@@ -0,0 +1,99 @@
+"""Flush buffered listing view counts from Redis into Postgres.
+
+Run with ``python -m app.jobs.listing_view_flusher`` as a long-lived worker; it flushes every
+``LISTING_VIEW_FLUSH_SECONDS`` seconds and logs a failed flush before retrying on the next pass.
+Add ``--once`` to flush a single time, e.g. from cron. Each flush writes the accumulated deltas in
+batched upserts into listing_view_counts and feeds the same deltas into the trending ranking.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.trending import TrendingEvent, TrendingRanking, trending_listings
+from app.core.view_counter import ListingViewCounter, listing_view_counter
+from app.db.repositories.listing_view_repository import ListingViewRepository
+from app.db.session import SessionLocal
+
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 1_000
+
+
+class ListingViewFlusher:
+    def __init__(
+        self,
+        db: Session,
+        counter: ListingViewCounter = listing_view_counter,
+        trending: TrendingRanking | None = trending_listings,
+        *,
+        batch_size: int = FLUSH_BATCH_SIZE,
+    ) -> None:
+        self.db = db
+        self.counter = counter
+        self.trending = trending
+        self.batch_size = batch_size
+        self.views = ListingViewRepository(db)
+
+    def flush(self) -> int:
+        # A crash between the commit and finish_flush() replays this batch on the next run, so
+        # counts are at-least-once; that window is a single Redis DEL.
+        pending = self.counter.take_pending()
+        listing_ids = list(pending)
+        flushed: dict[UUID, int] = {}
+        for start in range(0, len(listing_ids), self.batch_size):
+            batch = listing_ids[start : start + self.batch_size]
+            existing = self.views.existing_listing_ids(batch)
+            self.counter.forget([listing_id for listing_id in batch if listing_id not in existing])
+            live = [listing_id for listing_id in batch if listing_id in existing]
+            if not live:
+                continue
+            unique = self.counter.unique_viewers(live)
+            self.views.add_views(
+                [
+                    {"listing_id": listing_id, "view_count": pending[listing_id], "unique_viewer_count": viewers}
+                    for listing_id, viewers in zip(live, unique)
+                ]
+            )
+            flushed.update((listing_id, pending[listing_id]) for listing_id in live)
+        self.db.commit()
+        self.counter.finish_flush()
+
+        if self.trending:
+            self.trending.record_many(flushed, TrendingEvent.view)
+        return len(flushed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="Flush once and exit.")
+    args = parser.parse_args()
+
+    interval = get_settings().listing_view_flush_seconds
+    while True:
+        started = time.monotonic()
+        db = SessionLocal()
+        try:
+            flushed = ListingViewFlusher(db).flush()
+        except Exception:
+            if args.once:
+                raise
+            # Views keep buffering in Redis; a batch already taken is flushed first on the next pass.
+            logger.exception("Flushing listing view counts failed")
+        finally:
+            db.close()
+        if args.once:
+            print(f"view counts flushed for {flushed} listings")
+            return
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Precompute the price bands behind GET /listings/price-suggestion.
+
+Run with ``python -m app.jobs.price_suggestions`` (incremental) or add ``--full`` to rebuild every
+category. Each band holds the quartiles of sold order prices over the trailing window, per
+(category, condition, brand), per (category, condition) and per category.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.repositories.job_checkpoint_repository import JobCheckpointRepository
+from app.db.repositories.price_suggestion_repository import (
+    PRICE_SUGGESTIONS_CHECKPOINT,
+    PriceSuggestionRepository,
+    normalize_brand,
+)
+from app.db.session import SessionLocal
+
+
+# Fewer sales than this make a band too noisy to show; lookups fall back to a coarser band.
+MIN_SAMPLE_SIZE = 5
+QUANTILES = np.array([0.25, 0.5, 0.75])
+# Orders updated just before a run can commit after it has read them; re-reading this much
+# history on the next run picks them up.
+CHECKPOINT_OVERLAP = timedelta(minutes=10)
+
+
+def group_quartiles(codes: np.ndarray, cents: np.ndarray, groups: int) -> tuple[np.ndarray, np.ndarray]:
+    # Returns (sample size, [low, median, high]) per group code, interpolating linearly between
+    # ranks like numpy.quantile; every code in range must occur at least once.
+    order = np.lexsort((cents, codes))
+    values = cents[order].astype(np.float64)
+    counts = np.bincount(codes, minlength=groups)
+    starts = np.cumsum(counts) - counts
+    positions = starts[:, None] + QUANTILES[None, :] * (counts[:, None] - 1)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    bands = values[lower] + (values[upper] - values[lower]) * (positions - lower)
+    return counts, bands
+
+
+def build_bands(sales: Sequence[Any], computed_at: datetime) -> list[dict[str, Any]]:
+    keys: dict[tuple[Any, str, str], int] = {}
+    codes: list[int] = []
+    cents: list[int] = []
+    for category_id, condition, brand, price in sales:
+        condition = condition.value if hasattr(condition, "value") else condition
+        brand = normalize_brand(brand)
+        amount = int(Decimal(price) * 100)
+        levels = [(category_id, condition, ""), (category_id, "", "")]
+        if brand:
+            levels.append((category_id, condition, brand))
+        for key in levels:
+            codes.append(keys.setdefault(key, len(keys)))
+            cents.append(amount)
+    if not keys:
+        return []
+
+    counts, bands = group_quartiles(np.array(codes, dtype=np.int64), np.array(cents, dtype=np.int64), len(keys))
+    rounded = np.rint(bands).astype(np.int64)
+    return [
+        {
+            "category_id": category_id,
+            "condition": condition,
+            "brand": brand,
+            "sample_size": int(counts[code]),
+            "low": Decimal(int(rounded[code, 0])) / 100,
+            "median": Decimal(int(rounded[code, 1])) / 100,
+            "high": Decimal(int(rounded[code, 2])) / 100,
+            "computed_at": computed_at,
+        }
+        for (category_id, condition, brand), code in keys.items()
+        if counts[code] >= MIN_SAMPLE_SIZE
+    ]
+
+
+class PriceSuggestionsJob:
+    def __init__(self, db: Session, *, window: timedelta | None = None) -> None:
+        self.db = db
+        self.window = window or timedelta(days=get_settings().price_suggestion_window_days)
+        self.suggestions = PriceSuggestionRepository(db)
+        self.checkpoints = JobCheckpointRepository(db)
+
+    def run(self, *, full: bool = False, now: datetime | None = None) -> int:
+        # The checkpoint is the run's start time in whole seconds since the epoch.
+        now = now or datetime.now(timezone.utc)
+        window_start = now - self.window
+        last_run = None if full else self.checkpoints.get_position(PRICE_SUGGESTIONS_CHECKPOINT)
+
+        categories = None
+        if last_run is not None:
+            # Quartiles do not merge, so a category with any new, updated or expired sale is
+            # recomputed from its whole window; untouched categories keep their bands.
+            previous = datetime.fromtimestamp(last_run, timezone.utc) - CHECKPOINT_OVERLAP
+            categories = self.suggestions.changed_categories(
+                updated_since=previous,
+                expired_from=previous - self.window,
+                expired_to=window_start,
+            )
+
+        updated = 0
+        if categories is None or categories:
+            rows = build_bands(self.suggestions.recent_sales(window_start, categories), now)
+            self.suggestions.replace(categories, rows)
+            updated = len(rows)
+        self.checkpoints.set_position(PRICE_SUGGESTIONS_CHECKPOINT, int(now.timestamp()))
+        self.db.commit()
+        return updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Rebuild every category instead of only changed ones.")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        updated = PriceSuggestionsJob(db).run(full=args.full)
+    finally:
+        db.close()
+    print(f"price suggestions stored for {updated} bands")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Finish saved-search alert fan-outs that did not complete on the request path.
+
+Run with ``python -m app.jobs.saved_search_alerts`` every minute or so from cron. Approving a
+listing queues it in ``saved_search_alerts`` in the same transaction and then alerts the matching
+users in batches right away; a fan-out that failed part way (or whose process died) is left
+queued with the last user it reached, and this job sends the rest. Fan-outs that are still
+running elsewhere are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy.orm import Session
+
+from app.db.repositories.listing_repository import ListingRepository
+from app.db.repositories.notification_repository import NotificationRepository
+from app.db.repositories.saved_search_repository import SavedSearchRepository
+from app.db.repositories.user_repository import UserRepository
+from app.db.session import SessionLocal
+from app.services.notification_service import NotificationService
+from app.services.saved_search_service import SavedSearchAlertService
+
+
+MAX_LISTINGS = 1_000
+
+
+class SavedSearchAlertsJob:
+    def __init__(self, db: Session, *, max_listings: int = MAX_LISTINGS) -> None:
+        self.db = db
+        self.max_listings = max_listings
+        self.saved_searches = SavedSearchRepository(db)
+        self.alerts = SavedSearchAlertService(
+            db=db,
+            saved_search_repository=self.saved_searches,
+            listing_repository=ListingRepository(db),
+            notification_service=NotificationService(
+                db=db,
+                notification_repository=NotificationRepository(db),
+                user_repository=UserRepository(db),
+            ),
+        )
+
+    def run(self) -> int:
+        # A listing that fails again stays queued for the next run; the others still go out.
+        notified = 0
+        for listing_id in self.saved_searches.queued_alert_listing_ids(limit=self.max_listings):
+            notified += self.alerts.notify_matches(listing_id)
+        return notified
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        notified = SavedSearchAlertsJob(db).run()
+    finally:
+        db.close()
+    print(f"saved search alerts sent to {notified} users")
+
+
+if __name__ == "__main__":
+    main()
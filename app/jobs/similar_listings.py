@@ -0,0 +1,188 @@
+"""Precompute the "similar listings" rail shown on listing detail pages.
+
+Run with ``python -m app.jobs.similar_listings`` (incremental) or add ``--full`` to rebuild
+every category. Listings are compared by TF-IDF cosine similarity of their title, brand and
+description, only against other public listings of the same category.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import unicodedata
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy.orm import Session
+
+from app.db.models.listing_similarity import SIMILAR_LISTINGS_TOP_K
+from app.db.repositories.job_checkpoint_repository import JobCheckpointRepository
+from app.db.repositories.listing_repository import ListingRepository
+from app.db.repositories.listing_similarity_repository import ListingSimilarityRepository
+from app.db.session import SessionLocal
+
+
+CHECKPOINT_NAME = "similar_listings"
+# Bound on score cells computed at once (rows x category size).
+SCORE_CHUNK_CELLS = 4_000_000
+_TOKEN = re.compile(r"[^\W_]{2,}")
+
+
+def tokenize(listing: Any) -> list[str]:
+    # Title and brand carry most of the signal, so their terms are counted twice.
+    text = f"{listing.title} {listing.title} {listing.brand or ''} {listing.brand or ''} {listing.description or ''}"
+    folded = unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode()
+    return _TOKEN.findall(folded)
+
+
+def tfidf_matrix(documents: Sequence[Sequence[str]]) -> sparse.csr_matrix:
+    vocabulary: dict[str, int] = {}
+    rows: list[int] = []
+    columns: list[int] = []
+    for row, tokens in enumerate(documents):
+        for token in tokens:
+            rows.append(row)
+            columns.append(vocabulary.setdefault(token, len(vocabulary)))
+
+    shape = (len(documents), len(vocabulary))
+    counts = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, columns)), shape=shape)
+    counts.sum_duplicates()
+    counts.data = 1 + np.log(counts.data)
+
+    document_frequency = np.bincount(counts.indices, minlength=shape[1])
+    idf = (np.log((1 + shape[0]) / (1 + document_frequency)) + 1).astype(np.float32)
+    weighted = (counts @ sparse.diags(idf)).tocsr()
+
+    norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return (sparse.diags(1 / norms) @ weighted).tocsr()
+
+
+def nearest_neighbours(
+    matrix: sparse.csr_matrix, targets: np.ndarray, k: int
+) -> Iterator[tuple[int, np.ndarray, np.ndarray]]:
+    # Yields (row, neighbour rows, scores) best first, skipping the row itself and zero scores.
+    # Score rows stay sparse: most pairs share no term, and selecting over the dense rows'
+    # long runs of tied zeros is several times slower than over the stored scores alone.
+    size = matrix.shape[0]
+    transposed = matrix.T.tocsr()
+    step = max(1, SCORE_CHUNK_CELLS // size)
+    for start in range(0, len(targets), step):
+        chunk = targets[start : start + step]
+        scores = (matrix[chunk] @ transposed).tocsr()
+        for offset, row in enumerate(chunk):
+            begin, end = scores.indptr[offset], scores.indptr[offset + 1]
+            neighbours, values = scores.indices[begin:end], scores.data[begin:end]
+            keep = (neighbours != row) & (values > 0)
+            neighbours, values = neighbours[keep], values[keep]
+            if len(values) > k:
+                top = np.argpartition(values, len(values) - k)[len(values) - k :]
+                neighbours, values = neighbours[top], values[top]
+            order = np.argsort(-values, kind="stable")
+            yield int(row), neighbours[order], values[order]
+
+
+class SimilarListingsJob:
+    def __init__(self, db: Session, *, top_k: int = SIMILAR_LISTINGS_TOP_K) -> None:
+        self.db = db
+        self.top_k = top_k
+        self.similarities = ListingSimilarityRepository(db)
+        self.checkpoints = JobCheckpointRepository(db)
+        self.listings = ListingRepository(db)
+
+    def run(self, *, full: bool = False) -> int:
+        # Read the seq first: listings changed while the job runs are simply picked up again next time.
+        last_seq = self.listings.latest_listing_change_seq()
+        since = None if full else self.checkpoints.get_position(CHECKPOINT_NAME)
+        if since is None:
+            updated = self._rebuild_all()
+        else:
+            updated = self._recompute_changed(since)
+        self.checkpoints.set_position(CHECKPOINT_NAME, last_seq)
+        self.db.commit()
+        return updated
+
+    def _rebuild_all(self) -> int:
+        self.similarities.clear()
+        updated = 0
+        for category_id in self.similarities.public_categories():
+            corpus = self.similarities.corpus(category_id)
+            updated += self._store_neighbours(corpus, np.arange(len(corpus)))
+        return updated
+
+    def _recompute_changed(self, since: int) -> int:
+        changed = self.similarities.changed_listing_ids(since)
+        if not changed:
+            return 0
+        # Listings that point at a changed listing hold a stale score (or a deleted neighbour).
+        affected = changed | self.similarities.listings_referencing(changed)
+        self.similarities.clear(affected)
+
+        updated = 0
+        for category_id in self.similarities.public_categories(affected):
+            weakest = self.similarities.weakest_scores(category_id)
+            corpus = self.similarities.corpus(category_id)
+            matrix = tfidf_matrix([tokenize(listing) for listing in corpus])
+            rows = {listing.id: row for row, listing in enumerate(corpus)}
+            targets = {rows[listing_id] for listing_id in affected if listing_id in rows}
+
+            # A changed listing may now belong in the top K of an untouched one: recompute those
+            # whose weakest kept neighbour it beats. Cosine similarity is symmetric, so the changed
+            # rows' scores against the whole category are all that is needed.
+            changed_rows = [rows[listing_id] for listing_id in changed if listing_id in rows]
+            if changed_rows:
+                best = (matrix[changed_rows] @ matrix.T).max(axis=0).toarray().ravel()
+                bars = np.zeros(len(corpus))
+                for listing_id, (count, score) in weakest.items():
+                    if listing_id in rows and count >= min(self.top_k, len(corpus) - 1):
+                        bars[rows[listing_id]] = score
+                targets.update(np.flatnonzero(best > bars).tolist())
+
+            target_rows = np.array(sorted(targets), dtype=np.int64)
+            self.similarities.clear(corpus[row].id for row in target_rows if corpus[row].id not in affected)
+            updated += self._store_neighbours(corpus, target_rows, matrix=matrix)
+        return updated
+
+    def _store_neighbours(
+        self,
+        corpus: Sequence[Any],
+        targets: np.ndarray,
+        *,
+        matrix: sparse.csr_matrix | None = None,
+    ) -> int:
+        if not len(targets):
+            return 0
+        if matrix is None:
+            matrix = tfidf_matrix([tokenize(listing) for listing in corpus])
+        rows: list[dict[str, Any]] = []
+        for row, neighbours, scores in nearest_neighbours(matrix, targets, self.top_k):
+            rows.extend(
+                {
+                    "listing_id": corpus[row].id,
+                    "position": position,
+                    "similar_listing_id": corpus[neighbour].id,
+                    "score": float(score),
+                }
+                for position, (neighbour, score) in enumerate(zip(neighbours, scores))
+            )
+        self.similarities.insert_neighbours(rows)
+        return len(targets)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Rebuild every category instead of only changed listings.")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        updated = SimilarListingsJob(db).run(full=args.full)
+    finally:
+        db.close()
+    print(f"similar listings recomputed for {updated} listings")
+
+
+if __name__ == "__main__":
+    main()
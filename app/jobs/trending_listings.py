@@ -0,0 +1,57 @@
+"""Maintain the decayed "trending listings" ranking kept in Redis.
+
+Run with ``python -m app.jobs.trending_listings``, e.g. hourly. Each run moves the forward-decay
+landmark to now, rescales the sorted set accordingly, drops scores that have decayed away and
+listings that are no longer public (an order locks its listing, so bought items leave the rail).
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from sqlalchemy.orm import Session
+
+from app.core.trending import TrendingRanking, trending_listings
+from app.db.repositories.listing_repository import ListingRepository
+from app.db.session import SessionLocal
+
+
+# Scores below this are worth less than a single view from about a week ago (at the default
+# one-day half-life) and are dropped.
+MIN_SCORE = 2.0**-7
+PUBLIC_CHECK_BATCH_SIZE = 1_000
+
+
+class TrendingListingsJob:
+    def __init__(self, db: Session, ranking: TrendingRanking = trending_listings) -> None:
+        self.db = db
+        self.ranking = ranking
+        self.listings = ListingRepository(db)
+
+    def run(self, *, now: float | None = None) -> int:
+        self.ranking.rescale(min_score=MIN_SCORE, now=time.time() if now is None else now)
+
+        listing_ids = self.ranking.listing_ids()
+        gone = []
+        for start in range(0, len(listing_ids), PUBLIC_CHECK_BATCH_SIZE):
+            batch = listing_ids[start : start + PUBLIC_CHECK_BATCH_SIZE]
+            gone.extend(set(batch) - set(self.listings.get_public_listing_ids(batch)))
+        self.ranking.remove(gone)
+        return len(listing_ids) - len(gone)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        ranked = TrendingListingsJob(db).run()
+    finally:
+        db.close()
+    print(f"trending ranking holds {ranked} listings")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,44 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.api.v1.api import api_router as api_v1_router
-from app.api.v1.routers import admin, disputes, listings, media, notifications, orders, shipments, wallet
+from app.api.v1.routers import (
+    admin,
+    disputes,
+    favorites,
+    listings,
+    media,
+    notifications,
+    orders,
+    saved_searches,
+    shipments,
+    wallet,
+)
+from app.core.config import get_settings
 from app.core.errors import setup_error_handlers
+from app.db.session import SessionLocal
 from app.middleware.public_rate_limit import PublicRateLimitMiddleware
+from app.services.listing_suggestion_service import HotPrefixRefresher, listing_suggestion_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    refresher = HotPrefixRefresher(
+        listing_suggestion_cache,
+        SessionLocal,
+        interval_seconds=get_settings().listing_suggestions_refresh_seconds,
+        hot_prefixes=get_settings().listing_suggestions_hot_prefixes,
+    )
+    refresher.start()
+    try:
+        yield
+    finally:
+        refresher.stop()
 
 
-app = FastAPI(title="LBAL Backend", version="0.1.0")
+app = FastAPI(title="LBAL Backend", version="0.1.0", lifespan=lifespan)
 setup_error_handlers(app)
 app.add_middleware(PublicRateLimitMiddleware)
 
@@ -15,6 +47,8 @@ app.include_router(listings.router)
 app.include_router(media.router)
 app.include_router(orders.router)
 app.include_router(notifications.router)
+app.include_router(saved_searches.router)
+app.include_router(favorites.router)
 app.include_router(wallet.router)
 app.include_router(shipments.router)
 app.include_router(disputes.router)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.api.v1.schemas.favorites import FavoriteListResponse, FavoriteResponse
+from app.api.v1.schemas.listings import ListingResponse
+from app.core.cache import RedisCache
+from app.core.errors import ApplicationError, ErrorCode
+from app.core.trending import TrendingEvent, TrendingRanking
+from app.db.repositories.favorite_repository import FavoriteRepository
+from app.db.repositories.listing_repository import ListingRepository
+from app.utils.cursor import InvalidCursorError, decode_cursor, encode_cursor
+
+
+FAVORITES_CURSOR = "favorites"
+
+
+class FavoriteService:
+    def __init__(
+        self,
+        db: Session,
+        favorite_repository: FavoriteRepository,
+        listing_repository: ListingRepository,
+        detail_cache: RedisCache | None = None,
+        trending: TrendingRanking | None = None,
+    ) -> None:
+        self.db = db
+        self.favorite_repository = favorite_repository
+        self.listing_repository = listing_repository
+        self.detail_cache = detail_cache
+        self.trending = trending
+
+    def add_favorite(self, user_id: UUID, listing_id: UUID) -> None:
+        if not self.listing_repository.get_public_listing_ids([listing_id]):
+            raise ApplicationError(
+                code="NOT_FOUND",
+                message="Listing not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        # The counter only moves when the row was actually inserted, in the same transaction.
+        if not self.favorite_repository.add(user_id, listing_id):
+            return
+        self.favorite_repository.adjust_favorite_count(listing_id, 1)
+        self.db.commit()
+        self._invalidate(listing_id)
+        if self.trending:
+            self.trending.record(listing_id, TrendingEvent.favorite)
+
+    def remove_favorite(self, user_id: UUID, listing_id: UUID) -> None:
+        if not self.favorite_repository.remove(user_id, listing_id):
+            return
+        self.favorite_repository.adjust_favorite_count(listing_id, -1)
+        self.db.commit()
+        self._invalidate(listing_id)
+
+    def list_favorites(self, user_id: UUID, *, page_size: int, cursor: str | None = None) -> FavoriteListResponse:
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, sort_by=FAVORITES_CURSOR, types=(datetime, UUID))
+            except InvalidCursorError as exc:
+                raise ApplicationError(
+                    code=ErrorCode.VALIDATION_ERROR,
+                    message="Invalid pagination cursor.",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                ) from exc
+
+        rows = self.favorite_repository.list_for_user(user_id, after=after, limit=page_size + 1)
+        page = rows[:page_size]
+        listings = {
+            listing.id: listing
+            for listing in self.listing_repository.get_listings_by_ids([row.listing_id for row in page])
+        }
+        items = [
+            FavoriteResponse(listing=ListingResponse.from_orm(listings[row.listing_id]), favorited_at=row.created_at)
+            for row in page
+            if row.listing_id in listings
+        ]
+        next_cursor = None
+        if len(rows) > page_size:
+            last = page[-1]
+            next_cursor = encode_cursor(FAVORITES_CURSOR, (last.created_at, last.listing_id))
+        return FavoriteListResponse(items=items, page_size=page_size, next_cursor=next_cursor)
+
+    def _invalidate(self, listing_id: UUID) -> None:
+        # Cached listing details embed favorite_count; search pages pick it up when they expire.
+        if self.detail_cache:
+            self.detail_cache.delete(str(listing_id))
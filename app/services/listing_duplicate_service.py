@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import Any, Sequence
+from uuid import UUID
+
+import numpy as np
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.core.errors import ApplicationError
+from app.db.models.listing import Listing
+from app.db.models.listing_duplicate_flag import DuplicateFlagStatus, ListingDuplicateFlag
+from app.db.repositories.listing_duplicate_repository import ListingDuplicateRepository
+from app.utils import minhash
+
+
+# Estimated Jaccard similarity of title + description shingles above which two listings
+# from the same seller are flagged. LSH candidates below it are discarded.
+DUPLICATE_SIMILARITY_THRESHOLD = 0.8
+
+logger = logging.getLogger(__name__)
+
+
+class ListingDuplicateService:
+    def __init__(self, *, db: Session, duplicate_repository: ListingDuplicateRepository) -> None:
+        self.db = db
+        self.duplicate_repository = duplicate_repository
+
+    def index_written_listings(self, listings: Sequence[Listing], *, created: bool = False) -> None:
+        # The listing write has committed by now, so a failure here must not fail the request. New
+        # listings left without a fingerprint are picked up by app.jobs.listing_fingerprints; an
+        # edit keeps its previous fingerprint until the next title or description change.
+        listing_ids = [listing.id for listing in listings]
+        try:
+            self.index_listings(listings, created=created)
+        except Exception:
+            self.db.rollback()
+            logger.exception("Fingerprinting listings %s failed", listing_ids)
+
+    def index_listings(self, listings: Sequence[Listing], *, created: bool = False) -> None:
+        # Each listing is only compared with the seller's listings sharing one of its LSH buckets,
+        # and a whole batch is checked with a fixed number of queries.
+        if not listings:
+            return
+        fingerprints = []
+        for listing in listings:
+            signature = minhash.signature(f"{listing.title} {listing.description or ''}")
+            fingerprints.append((listing.id, signature, minhash.band_keys(signature, namespace=listing.user_id.bytes)))
+
+        listing_ids = [listing_id for listing_id, _, _ in fingerprints]
+        buckets: dict[int, set[UUID]] = defaultdict(set)
+        signatures: dict[UUID, np.ndarray] = {}
+        all_keys = [key for _, _, bucket_keys in fingerprints for key in bucket_keys]
+        for bucket, candidate_id, candidate_signature in self.duplicate_repository.candidate_signatures(
+            all_keys, exclude=listing_ids
+        ):
+            buckets[bucket].add(candidate_id)
+            signatures[candidate_id] = np.frombuffer(candidate_signature, dtype=np.uint32)
+
+        # Freshly created listings have no flags or fingerprints to reconcile yet.
+        flagged = set() if created else self.duplicate_repository.flagged_pairs(listing_ids)
+        flags = []
+        for listing_id, signature, bucket_keys in fingerprints:
+            candidates = set().union(*(buckets[key] for key in bucket_keys))
+            for candidate_id in candidates:
+                score = minhash.similarity(signature, signatures[candidate_id])
+                pair = frozenset((listing_id, candidate_id))
+                if score >= DUPLICATE_SIMILARITY_THRESHOLD and pair not in flagged:
+                    flagged.add(pair)
+                    flags.append({"listing_id": listing_id, "duplicate_of_id": candidate_id, "similarity": score})
+            # Later listings of the same batch are checked against this one too.
+            for key in bucket_keys:
+                buckets[key].add(listing_id)
+            signatures[listing_id] = signature
+
+        self.duplicate_repository.add_flags(flags)
+        self.duplicate_repository.save_fingerprints(
+            [(listing_id, signature.tobytes(), bucket_keys) for listing_id, signature, bucket_keys in fingerprints],
+            replace=not created,
+        )
+        self.db.commit()
+
+    def list_flags(self, *, status: DuplicateFlagStatus, limit: int, offset: int) -> list[Any]:
+        return self.duplicate_repository.list_flags(status=status, limit=limit, offset=offset)
+
+    def dismiss_flag(self, flag_id: UUID) -> ListingDuplicateFlag:
+        flag = self.duplicate_repository.get_flag(flag_id)
+        if not flag:
+            raise ApplicationError(
+                code="NOT_FOUND",
+                message="Duplicate flag not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        return self.duplicate_repository.set_flag_status(flag, DuplicateFlagStatus.dismissed)
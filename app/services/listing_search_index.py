@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from typing import Any, Sequence
+from uuid import UUID
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.db.models.listing import ListingCondition
+from app.db.repositories.listing_repository import ListingRepository, ListingSearchFilters
+
+
+# Sort orders the index can answer; keyword, proximity and rank queries stay on Postgres.
+INDEXED_SORTS = frozenset({"newest", "oldest", "price"})
+
+# Replaying more changes than this is slower than reloading the whole set.
+MAX_REPLAYED_CHANGES = 5_000
+CHANGES_BATCH_SIZE = 1_000
+
+_SIGN_BIT = 1 << 63
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_COLUMNS = ("_alive", "_price", "_created", "_id_high", "_id_low", "_city", "_category", "_condition")
+_CONDITION_CODES = {condition: code for code, condition in enumerate(ListingCondition)}
+
+
+def _uuid_halves(value: UUID) -> tuple[int, int]:
+    # Shift each unsigned half into int64 range so signed order matches the byte order Postgres sorts UUIDs by.
+    return (value.int >> 64) - _SIGN_BIT, (value.int & (2**64 - 1)) - _SIGN_BIT
+
+
+def _timestamp(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _cents(value: Decimal, rounding: str = ROUND_FLOOR) -> int:
+    return int((value * 100).to_integral_value(rounding=rounding))
+
+
+# Columnar copy of the public listing set that answers filter/sort/page queries in memory.
+# Strings are dictionary-encoded, prices kept in cents and timestamps in microseconds so every
+# filter is an exact vectorized comparison. It is loaded on first use, kept current by replaying
+# listing_changes, and only returns page ids; the database hydrates those rows.
+class ListingSearchIndex:
+    def __init__(self, *, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._checked_at = 0.0
+        self._last_seq = 0
+        self._reset(capacity=0)
+
+    def search(
+        self,
+        repository: ListingRepository,
+        filters: ListingSearchFilters,
+        *,
+        sort_by: str,
+        limit: int,
+        offset: int = 0,
+        after: Sequence[Any] | None = None,
+    ) -> tuple[list[UUID], tuple[Any, ...] | None, int] | None:
+        if filters.q or filters.near or sort_by not in INDEXED_SORTS:
+            return None
+
+        with self._lock:
+            self._refresh(repository)
+            mask = self._mask(filters)
+            total = int(np.count_nonzero(mask))
+            keys = self._sort_keys(sort_by)
+            if after is not None:
+                mask &= self._after_mask(keys, self._key_for(sort_by, after))
+
+            start = 0 if after is not None else offset
+            candidates = np.flatnonzero(mask)
+            has_more = len(candidates) > start + limit
+            ordered = self._first_sorted(candidates, keys, start + limit)
+            page = ordered[start : start + limit]
+            listing_ids = [self._ids[slot] for slot in page]
+            next_key = self._next_key(sort_by, page[-1]) if has_more and len(page) else None
+        return listing_ids, next_key, total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._loaded = False
+            self._reset(capacity=0)
+
+    def _refresh(self, repository: ListingRepository) -> None:
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < self.refresh_seconds:
+            return
+        self._checked_at = now
+
+        if not self._loaded:
+            self._load(repository)
+            return
+
+        changed: set[UUID] = set()
+        while True:
+            changes = repository.get_listing_changes(self._last_seq, limit=CHANGES_BATCH_SIZE)
+            if not changes:
+                break
+            changed.update(change.listing_id for change in changes)
+            self._last_seq = changes[-1].seq
+            if len(changed) > MAX_REPLAYED_CHANGES:
+                self._load(repository)
+                return
+            if len(changes) < CHANGES_BATCH_SIZE:
+                break
+        if not changed:
+            return
+
+        rows = repository.get_search_columns(list(changed))
+        for listing_id in changed - {row.id for row in rows}:
+            slot = self._slots.pop(listing_id, None)
+            if slot is not None:
+                self._alive[slot] = False
+        for row in rows:
+            self._upsert(row)
+        if self._size - len(self._slots) > max(1024, self._size // 4):
+            self._compact()
+
+    def _load(self, repository: ListingRepository) -> None:
+        # Read the seq first: changes committed while loading are replayed again, which is harmless.
+        last_seq = repository.latest_listing_change_seq()
+        rows = repository.get_search_columns()
+        self._reset(capacity=max(1024, len(rows) * 5 // 4))
+        for row in rows:
+            self._upsert(row)
+        self._last_seq = last_seq
+        self._loaded = True
+
+    def _reset(self, *, capacity: int) -> None:
+        self._size = 0
+        self._ids: list[UUID] = []
+        self._slots: dict[UUID, int] = {}
+        self._cities: dict[str, int] = {}
+        self._categories: dict[UUID | None, int] = {}
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._price = np.zeros(capacity, dtype=np.int64)
+        self._created = np.zeros(capacity, dtype=np.int64)
+        self._id_high = np.zeros(capacity, dtype=np.int64)
+        self._id_low = np.zeros(capacity, dtype=np.int64)
+        self._city = np.zeros(capacity, dtype=np.int32)
+        self._category = np.zeros(capacity, dtype=np.int32)
+        self._condition = np.zeros(capacity, dtype=np.int8)
+
+    def _upsert(self, row: Any) -> None:
+        slot = self._slots.get(row.id)
+        if slot is None:
+            if self._size == len(self._alive):
+                self._grow()
+            slot = self._size
+            self._size += 1
+            self._ids.append(row.id)
+            self._slots[row.id] = slot
+            self._id_high[slot], self._id_low[slot] = _uuid_halves(row.id)
+
+        self._alive[slot] = True
+        self._price[slot] = _cents(row.price)
+        self._created[slot] = _timestamp(row.created_at)
+        self._city[slot] = self._cities.setdefault(row.city, len(self._cities))
+        self._category[slot] = self._categories.setdefault(row.category_id, len(self._categories))
+        self._condition[slot] = _CONDITION_CODES[row.condition]
+
+    def _grow(self) -> None:
+        capacity = max(1024, len(self._alive) * 2)
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def _compact(self) -> None:
+        live = np.flatnonzero(self._alive[: self._size])
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            compacted = np.zeros(len(column), dtype=column.dtype)
+            compacted[: len(live)] = column[live]
+            setattr(self, name, compacted)
+        self._ids = [self._ids[slot] for slot in live]
+        self._slots = {listing_id: slot for slot, listing_id in enumerate(self._ids)}
+        self._size = len(live)
+
+    def _mask(self, filters: ListingSearchFilters) -> np.ndarray:
+        size = self._size
+        mask = self._alive[:size].copy()
+        if filters.category_id:
+            code = self._categories.get(filters.category_id)
+            mask &= self._category[:size] == (-1 if code is None else code)
+        if filters.city:
+            code = self._cities.get(filters.city)
+            mask &= self._city[:size] == (-1 if code is None else code)
+        if filters.min_price is not None:
+            mask &= self._price[:size] >= _cents(filters.min_price, ROUND_CEILING)
+        if filters.max_price is not None:
+            mask &= self._price[:size] <= _cents(filters.max_price)
+        if filters.condition:
+            mask &= self._condition[:size] == _CONDITION_CODES[ListingCondition(filters.condition)]
+        return mask
+
+    def _sort_keys(self, sort_by: str) -> list[np.ndarray]:
+        # Every key ascends, so descending columns are bit-inverted; the list is most significant first.
+        size = self._size
+        created, high, low = self._created[:size], self._id_high[:size], self._id_low[:size]
+        if sort_by == "oldest":
+            return [created, high, low]
+        newest = [~created, ~high, ~low]
+        if sort_by == "price":
+            return [self._price[:size], *newest]
+        return newest
+
+    @staticmethod
+    def _first_sorted(candidates: np.ndarray, keys: list[np.ndarray], count: int) -> np.ndarray:
+        # Only the first `count` rows are needed: cut the candidates down to those whose leading
+        # key is within the count-th smallest before the full lexicographic sort.
+        if len(candidates) > count * 4:
+            leading = keys[0][candidates]
+            threshold = np.partition(leading, count - 1)[count - 1]
+            candidates = candidates[leading <= threshold]
+        return candidates[np.lexsort(tuple(key[candidates] for key in reversed(keys)))]
+
+    @staticmethod
+    def _key_for(sort_by: str, after: Sequence[Any]) -> list[int]:
+        *leading, created_at, listing_id = after
+        high, low = _uuid_halves(listing_id)
+        created = _timestamp(created_at)
+        if sort_by == "oldest":
+            return [created, high, low]
+        newest = [~created, ~high, ~low]
+        if sort_by == "price":
+            return [_cents(leading[0]), *newest]
+        return newest
+
+    @staticmethod
+    def _after_mask(keys: list[np.ndarray], bound: list[int]) -> np.ndarray:
+        greater = np.zeros(len(keys[0]), dtype=bool)
+        equal = np.ones(len(keys[0]), dtype=bool)
+        for key, value in zip(keys, bound):
+            greater |= equal & (key > value)
+            equal &= key == value
+        return greater
+
+    def _next_key(self, sort_by: str, slot: int) -> tuple[Any, ...]:
+        created_at = _EPOCH + int(self._created[slot]) * _MICROSECOND
+        listing_id = self._ids[slot]
+        if sort_by == "price":
+            return Decimal(int(self._price[slot])) / 100, created_at, listing_id
+        return created_at, listing_id
+
+
+listing_search_index = ListingSearchIndex(refresh_seconds=get_settings().listing_search_index_refresh_seconds)
@@ -1,26 +1,50 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import math
+from decimal import Decimal
+from typing import Any
 from uuid import UUID
 
 from fastapi import status
 
 from app.api.v1.schemas.listings import (
+    LISTING_RESPONSE_FIELDS,
     ListingCreate,
+    ListingFacetsResponse,
+    ListingFacetValue,
     ListingFilterParams,
     ListingImageCreate,
+    ListingListResponse,
+    ListingPriceBucket,
+    ListingResponse,
     ListingSortOption,
+    ListingSparseResponse,
+    ListingTotalKind,
     ListingUpdate,
 )
+from app.core.cache import RedisCache
 from app.core.errors import ApplicationError, ErrorCode
-from app.db.models.listing import Listing
+from app.core.home_feed import HomeFeedStore, category_feed, city_feed
+from app.core.trending import TrendingRanking
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
 from app.db.models.listing_image import ListingImage
 from app.db.repositories.category_repository import CategoryRepository
-from app.db.repositories.listing_repository import ListingRepository
+from app.db.repositories.listing_repository import KEYSET_TYPES, ListingRepository, ListingSearchFilters
 from app.db.repositories.listing_image_repository import ListingImageRepository
+from app.services.listing_duplicate_service import ListingDuplicateService
+from app.services.listing_search_index import ListingSearchIndex
+from app.services.listing_totals import ListingTotalsStrategy
+from app.utils.cursor import InvalidCursorError, decode_cursor, encode_cursor
+from app.utils.gazetteer import resolve_city
 
 
 MAX_LISTING_IMAGES = 10
 MAX_PAGE_SIZE = 50
+MAX_BATCH_LISTINGS = 50
+DEFAULT_NEAR_RADIUS_KM = 25.0
+FACET_PRICE_BOUNDS = tuple(Decimal(bound) for bound in ("100", "250", "500", "1000", "2500", "5000"))
 
 
 class ListingService:
@@ -29,21 +53,45 @@ class ListingService:
         listing_repository: ListingRepository,
         listing_image_repository: ListingImageRepository,
         category_repository: CategoryRepository,
+        totals_strategy: ListingTotalsStrategy,
+        search_cache: RedisCache,
+        facets_cache: RedisCache,
+        detail_cache: RedisCache,
+        search_index: ListingSearchIndex | None = None,
+        duplicate_service: ListingDuplicateService | None = None,
+        trending: TrendingRanking | None = None,
+        home_feed: HomeFeedStore | None = None,
     ) -> None:
         self.listing_repository = listing_repository
         self.listing_image_repository = listing_image_repository
         self.category_repository = category_repository
+        self.totals_strategy = totals_strategy
+        self.search_cache = search_cache
+        self.facets_cache = facets_cache
+        self.detail_cache = detail_cache
+        self.search_index = search_index
+        self.duplicate_service = duplicate_service
+        self.trending = trending
+        self.home_feed = home_feed
 
     def create_listing(self, user_id: UUID, payload: ListingCreate) -> Listing:
         self._validate_category(payload.category_id)
-        data = payload.dict()
-        return self.listing_repository.create_listing(user_id, data)
+        data = self._with_coordinates(payload.dict())
+        listing = self.listing_repository.create_listing(user_id, data)
+        self._flag_duplicates([listing], created=True)
+        return listing
 
     def bulk_create_listings(self, user_id: UUID, payloads: list[ListingCreate]) -> list[Listing]:
-        listings: list[Listing] = []
-        for payload in payloads:
-            listings.append(self.create_listing(user_id, payload))
-        return listings
+        for category_id in {payload.category_id for payload in payloads}:
+            self._validate_category(category_id)
+        items = [self._with_coordinates(payload.dict()) for payload in payloads]
+        listings = self.listing_repository.create_listings(user_id, items)
+        if not self.duplicate_service:
+            return listings
+        # Flagging commits and expires the batch; reload it in one go like create_listings does.
+        listing_ids = [listing.id for listing in listings]
+        self._flag_duplicates(listings, created=True)
+        return self.listing_repository.get_listings_by_ids(listing_ids)
 
     def update_listing(self, user_id: UUID, listing_id: UUID, payload: ListingUpdate) -> Listing:
         listing = self._get_listing_or_404(listing_id)
@@ -56,44 +104,247 @@ class ListingService:
         if not data:
             return listing
 
-        return self.listing_repository.update_listing(listing, data)
+        if "city" in data:
+            data = self._with_coordinates(data)
+        listing = self.listing_repository.update_listing(listing, data)
+        if "title" in data or "description" in data:
+            self._flag_duplicates([listing])
+        return listing
 
     def delete_listing(self, user_id: UUID, listing_id: UUID) -> None:
         listing = self._get_listing_or_404(listing_id)
         self._ensure_listing_owner(listing, user_id)
         self.listing_repository.delete_listing(listing)
 
+    def approve_listing(self, listing_id: UUID) -> Listing:
+        listing = self._get_listing_or_404(listing_id)
+        if listing.status != ListingStatus.pending:
+            raise ApplicationError(
+                code=ErrorCode.CONFLICT,
+                message="Only pending listings can be approved.",
+                status_code=status.HTTP_409_CONFLICT,
+            )
+        return self.listing_repository.update_listing(listing, {"status": ListingStatus.approved})
+
     def get_user_listings(self, user_id: UUID) -> list[Listing]:
         return list(self.listing_repository.get_listings_by_user(user_id))
 
     def get_listing(self, listing_id: UUID) -> Listing:
         return self._get_listing_or_404(listing_id)
 
-    def search_public_listings(
+    def get_listing_payload(self, listing_id: UUID, *, fields: str | None = None) -> str:
+        requested = self._parse_fields(fields)
+        # Entries are versioned per listing; writes replace the version (see record_listing_write).
+        payload = self.detail_cache.fetch(
+            str(listing_id),
+            lambda: ListingResponse.from_orm(self._get_listing_or_404(listing_id)).model_dump_json(),
+        )
+        return self._narrow_payload(payload, requested) if requested else payload
+
+    def get_listings_batch_payload(self, listing_ids: list[UUID], *, fields: str | None = None) -> str:
+        requested = self._parse_fields(fields)
+        listing_ids = list(dict.fromkeys(listing_ids))
+        if len(listing_ids) > MAX_BATCH_LISTINGS:
+            raise ApplicationError(
+                code=ErrorCode.VALIDATION_ERROR,
+                message=f"At most {MAX_BATCH_LISTINGS} listings can be fetched at once.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        payloads = self._listing_payloads(listing_ids)
+        # Splice the cached detail payloads together instead of re-validating every item.
+        items = ",".join(
+            self._narrow_payload(payload, requested) if requested else payload
+            for payload in payloads.values()
+            if payload is not None
+        )
+        missing = [str(listing_id) for listing_id, payload in payloads.items() if payload is None]
+        return f'{{"items":[{items}],"missing":{json.dumps(missing)}}}'
+
+    def get_similar_listings_payload(self, listing_id: UUID, *, limit: int, fields: str | None = None) -> str:
+        requested = self._parse_fields(fields)
+        similar_ids = self.listing_repository.get_similar_listing_ids(listing_id, limit=limit)
+        if not similar_ids:
+            self._get_listing_or_404(listing_id)
+        payloads = self._listing_payloads(similar_ids)
+        items = ",".join(
+            self._narrow_payload(payload, requested) if requested else payload
+            for payload in payloads.values()
+            if payload is not None
+        )
+        return f'{{"items":[{items}]}}'
+
+    def get_trending_listings_payload(self, *, page: int, page_size: int, fields: str | None = None) -> str:
+        requested = self._parse_fields(fields)
+        ranked = self.trending.page(offset=(page - 1) * page_size, limit=page_size + 1) if self.trending else []
+        has_more = len(ranked) > page_size
+        # Listings sold or unpublished since the last trending job run are skipped.
+        payloads = self._listing_payloads(self.listing_repository.get_public_listing_ids(ranked[:page_size]))
+        items = ",".join(
+            self._narrow_payload(payload, requested) if requested else payload
+            for payload in payloads.values()
+            if payload is not None
+        )
+        return f'{{"items":[{items}],"page":{page},"page_size":{page_size},"has_more":{json.dumps(has_more)}}}'
+
+    def get_listing_changes_payload(self, since: int, *, limit: int) -> str:
+        changes = self.listing_repository.get_listing_changes(since, limit=limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        # A listing written several times in the window is only sent once, at its latest seq.
+        latest = {change.listing_id: change for change in changes}
+        # The feed is public, so a listing that is not (pending, archived, locked, sold) is sent as a
+        # tombstone like a deleted one; it comes back with its state once it is public again.
+        public_ids = set(
+            self.listing_repository.get_public_listing_ids(
+                [listing_id for listing_id, change in latest.items() if not change.deleted]
+            )
+        )
+        payloads = self._listing_payloads([listing_id for listing_id in latest if listing_id in public_ids])
+
+        entries = []
+        for change in sorted(latest.values(), key=lambda change: change.seq):
+            # A row that is gone was deleted after this window; send the tombstone now.
+            payload = payloads.get(change.listing_id)
+            entries.append(
+                f'{{"seq":{change.seq},"listing_id":"{change.listing_id}",'
+                f'"deleted":{"false" if payload else "true"},"listing":{payload or "null"}}}'
+            )
+        next_since = changes[-1].seq if changes else since
+        return f'{{"changes":[{",".join(entries)}],"next_since":{next_since},"has_more":{json.dumps(has_more)}}}'
+
+    def search_public_listings_payload(
         self,
         filters: ListingFilterParams,
         *,
         page: int,
         page_size: int,
-    ) -> tuple[list[Listing], int, int, int]:
-        category_id = self._resolve_category_filter(filters.category_id)
-        self._validate_category(category_id)
+        cursor: str | None = None,
+        include_total: bool = True,
+        fields: str | None = None,
+    ) -> str:
+        requested = self._parse_fields(fields)
+        feed = None if cursor or requested or not include_total else self._home_feed_name(filters, page, page_size)
+        if feed is not None:
+            payload = self.home_feed.get(feed, page)
+            if payload is not None:
+                return payload
+
+        cache_key = self._filters_cache_key(
+            filters,
+            page=None if cursor else page,
+            page_size=min(page_size, MAX_PAGE_SIZE),
+            cursor=cursor,
+            include_total=include_total,
+            fields=sorted(requested) if requested else None,
+        )
+        return self.search_cache.fetch(
+            cache_key,
+            lambda: self.search_public_listings(
+                filters,
+                page=page,
+                page_size=page_size,
+                cursor=cursor,
+                include_total=include_total,
+                fields=fields,
+            ).model_dump_json(),
+        )
 
+    def search_public_listings(
+        self,
+        filters: ListingFilterParams,
+        *,
+        page: int,
+        page_size: int,
+        cursor: str | None = None,
+        include_total: bool = True,
+        fields: str | None = None,
+    ) -> ListingListResponse:
+        requested = self._parse_fields(fields)
+        search_filters = self.build_search_filters(filters)
         page_size = min(page_size, MAX_PAGE_SIZE)
+        sort_by = self._resolve_sort(filters.sort_by, search_filters.q)
+        if sort_by == ListingSortOption.distance.value and not search_filters.near:
+            raise ApplicationError(
+                code=ErrorCode.VALIDATION_ERROR,
+                message="Sorting by distance requires `near`.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        after = self._decode_search_cursor(cursor, sort_by, search_filters.q) if cursor else None
         offset = (page - 1) * page_size
 
-        listings, total = self.listing_repository.search_listings(
-            category_id=category_id,
-            city=filters.city,
-            min_price=filters.min_price,
-            max_price=filters.max_price,
-            condition=filters.condition,
-            sort_by=filters.sort_by.value if isinstance(filters.sort_by, ListingSortOption) else filters.sort_by,
-            limit=page_size,
-            offset=offset,
+        indexed = None
+        if self.search_index is not None:
+            indexed = self.search_index.search(
+                self.listing_repository,
+                search_filters,
+                sort_by=sort_by,
+                limit=page_size,
+                offset=offset,
+                after=after,
+            )
+
+        if indexed is not None:
+            listing_ids, next_key, matched = indexed
+            listings = self.listing_repository.get_listing_rows_by_ids(listing_ids, fields=requested)
+            # The index counts every match while filtering, so an exact total is free.
+            total, total_kind = (matched, ListingTotalKind.exact) if include_total else (None, None)
+        else:
+            listings, next_key = self.listing_repository.search_listings(
+                search_filters,
+                sort_by=sort_by,
+                limit=page_size,
+                offset=offset,
+                after=after,
+                fields=requested,
+            )
+            total, total_kind = self.totals_strategy.resolve(search_filters, include_total=include_total)
+
+        return ListingListResponse(
+            items=[
+                ListingResponse.model_validate(listing)
+                if requested is None
+                else ListingSparseResponse.model_validate({name: getattr(listing, name) for name in requested})
+                for listing in listings
+            ],
+            total=total,
+            total_kind=total_kind,
+            page=None if cursor else page,
+            page_size=page_size,
+            next_cursor=encode_cursor(sort_by, next_key, scope=search_filters.q) if next_key else None,
         )
 
-        return listings, total, page, page_size
+    def get_search_facets_payload(self, filters: ListingFilterParams) -> str:
+        cache_key = self._filters_cache_key(filters, exclude={"sort_by"})
+        return self.facets_cache.fetch(cache_key, lambda: self.get_search_facets(filters).model_dump_json())
+
+    def get_search_facets(self, filters: ListingFilterParams) -> ListingFacetsResponse:
+        search_filters = self.build_search_filters(filters)
+        total, counts = self.listing_repository.facet_counts(search_filters, price_bounds=FACET_PRICE_BOUNDS)
+
+        def facet_values(values: dict[Any, int]) -> list[ListingFacetValue]:
+            ordered = sorted(values.items(), key=lambda item: item[1], reverse=True)
+            return [
+                ListingFacetValue(
+                    value=value.value if isinstance(value, ListingCondition) else (str(value) if value else None),
+                    count=count,
+                )
+                for value, count in ordered
+            ]
+
+        bounds: list[Decimal | None] = [None, *FACET_PRICE_BOUNDS, None]
+        price_buckets = [
+            ListingPriceBucket(min_price=bounds[index], max_price=bounds[index + 1], count=count)
+            for index, count in sorted(counts["price_bucket"].items())
+        ]
+        return ListingFacetsResponse(
+            total=total,
+            categories=facet_values(counts["category_id"]),
+            conditions=facet_values(counts["condition"]),
+            cities=facet_values(counts["city"]),
+            price_buckets=price_buckets,
+        )
 
     def add_listing_image(self, user_id: UUID, listing_id: UUID, payload: ListingImageCreate) -> ListingImage:
         listing = self._get_listing_or_404(listing_id)
@@ -132,6 +383,10 @@ class ListingService:
         self._ensure_listing_owner(listing, user_id)
         self.listing_image_repository.remove_image(image)
 
+    def _flag_duplicates(self, listings: list[Listing], *, created: bool = False) -> None:
+        if self.duplicate_service:
+            self.duplicate_service.index_written_listings(listings, created=created)
+
     def _get_listing_or_404(self, listing_id: UUID) -> Listing:
         listing = self.listing_repository.get_listing_by_id(listing_id)
         if not listing:
@@ -159,6 +414,125 @@ class ListingService:
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
 
+    @staticmethod
+    def _resolve_sort(sort_by: ListingSortOption | str | None, q: str | None) -> str:
+        if sort_by is None:
+            # Keyword searches are ordered by text rank unless the client picks a sort.
+            return "rank" if q else ListingSortOption.newest.value
+        return sort_by.value if isinstance(sort_by, ListingSortOption) else sort_by
+
+    def build_search_filters(self, filters: ListingFilterParams) -> ListingSearchFilters:
+        category_id = self._resolve_category_filter(filters.category_id)
+        self._validate_category(category_id)
+        near = self._resolve_near(filters.near)
+        return ListingSearchFilters(
+            category_id=category_id,
+            city=filters.city,
+            min_price=filters.min_price,
+            max_price=filters.max_price,
+            condition=filters.condition,
+            q=(filters.q or "").strip() or None,
+            near=near,
+            radius_km=(filters.radius_km or DEFAULT_NEAR_RADIUS_KM) if near else None,
+        )
+
+    @staticmethod
+    def _resolve_near(near: str | None) -> tuple[float, float] | None:
+        if not near:
+            return None
+        coordinates = resolve_city(near)
+        if coordinates is None:
+            try:
+                latitude, longitude = (float(part) for part in near.split(","))
+            except ValueError:
+                latitude = longitude = math.nan
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise ApplicationError(
+                    code=ErrorCode.VALIDATION_ERROR,
+                    message="`near` must be `latitude,longitude` or a known city.",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            coordinates = (latitude, longitude)
+        return coordinates
+
+    @staticmethod
+    def _with_coordinates(data: dict[str, Any]) -> dict[str, Any]:
+        latitude, longitude = resolve_city(data.get("city")) or (None, None)
+        return {**data, "latitude": latitude, "longitude": longitude}
+
+    @staticmethod
+    def _filters_cache_key(
+        filters: ListingFilterParams,
+        *,
+        exclude: set[str] | None = None,
+        **extra: Any,
+    ) -> str:
+        params = filters.model_dump(mode="json", exclude_none=True, exclude=exclude)
+        if "category_id" in params:
+            params["category_id"] = params["category_id"].strip().lower()
+        if "q" in params:
+            params["q"] = " ".join(params["q"].lower().split())
+        params.update(extra)
+        raw = json.dumps(params, separators=(",", ":"), sort_keys=True)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _home_feed_name(self, filters: ListingFilterParams, page: int, page_size: int) -> str | None:
+        # Materialized pages only answer the plain newest-first browse of one city or category.
+        if self.home_feed is None or page > self.home_feed.pages or page_size != self.home_feed.page_size:
+            return None
+        if self._resolve_sort(filters.sort_by, filters.q) != ListingSortOption.newest.value:
+            return None
+        params = filters.model_dump(exclude_none=True, exclude={"sort_by"})
+        if params.keys() == {"city"}:
+            return city_feed(filters.city)
+        if params.keys() == {"category_id"}:
+            # Category names would need a lookup to resolve; those requests take the search path.
+            try:
+                return category_feed(UUID(filters.category_id.strip()))
+            except ValueError:
+                return None
+        return None
+
+    def _listing_payloads(self, listing_ids: list[UUID]) -> dict[UUID, str | None]:
+        def load(missed: list[str]) -> dict[str, str]:
+            listings = self.listing_repository.get_listings_by_ids([UUID(listing_id) for listing_id in missed])
+            return {str(listing.id): ListingResponse.from_orm(listing).model_dump_json() for listing in listings}
+
+        payloads = self.detail_cache.fetch_many([str(listing_id) for listing_id in listing_ids], load)
+        return dict(zip(listing_ids, payloads))
+
+    @staticmethod
+    def _parse_fields(fields: str | None) -> frozenset[str] | None:
+        if not fields:
+            return None
+        requested = frozenset(name.strip() for name in fields.split(",") if name.strip())
+        unknown = requested - LISTING_RESPONSE_FIELDS
+        if unknown:
+            raise ApplicationError(
+                code=ErrorCode.VALIDATION_ERROR,
+                message=f"Unknown listing fields: {', '.join(sorted(unknown))}.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        return requested | {"id"}
+
+    @staticmethod
+    def _narrow_payload(payload: str, fields: frozenset[str]) -> str:
+        # Cached payloads are already JSON-encoded, so narrowing never re-validates the listing.
+        data = json.loads(payload)
+        narrowed = {key: value for key, value in data.items() if key in fields}
+        return json.dumps(narrowed, separators=(",", ":"), ensure_ascii=False)
+
+    @staticmethod
+    def _decode_search_cursor(cursor: str, sort_by: str, q: str | None) -> tuple:
+        try:
+            return decode_cursor(cursor, sort_by=sort_by, types=KEYSET_TYPES[sort_by], scope=q)
+        except InvalidCursorError as exc:
+            raise ApplicationError(
+                code=ErrorCode.VALIDATION_ERROR,
+                message="Invalid pagination cursor.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            ) from exc
+
     def _resolve_category_filter(self, category_identifier: UUID | str | None) -> UUID | None:
         if not category_identifier:
             return None
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+
+from sqlalchemy.orm import Session
+
+from app.api.v1.schemas.listings import ListingSuggestion, ListingSuggestionKind
+from app.core.config import get_settings
+from app.db.repositories.listing_repository import ListingRepository
+from app.utils.ttl_cache import TTLCache
+
+
+MAX_PREFIX_LENGTH = 50
+MAX_SUGGESTIONS = 10
+
+logger = logging.getLogger(__name__)
+
+# Per-process cache: typeahead traffic is dominated by a small set of short prefixes, which
+# HotPrefixRefresher reloads before they expire, so requests for them never wait on Postgres.
+listing_suggestion_cache: TTLCache[list[ListingSuggestion]] = TTLCache(
+    maxsize=get_settings().listing_suggestions_cache_size,
+    ttl_seconds=get_settings().listing_suggestions_cache_ttl_seconds,
+)
+
+
+class ListingSuggestionService:
+    def __init__(
+        self,
+        listing_repository: ListingRepository,
+        cache: TTLCache[list[ListingSuggestion]],
+    ) -> None:
+        self.listing_repository = listing_repository
+        self.cache = cache
+
+    def suggest(self, q: str, *, limit: int) -> list[ListingSuggestion]:
+        prefix = " ".join(q.lower().split())[:MAX_PREFIX_LENGTH]
+        if not prefix:
+            return []
+        suggestions = self.cache.get_or_load(prefix, lambda: self._load_suggestions(prefix))
+        return suggestions[:limit]
+
+    def refresh_hot_prefixes(self, limit: int) -> int:
+        prefixes = self.cache.hottest(limit)
+        for prefix in prefixes:
+            self.cache.set(prefix, self._load_suggestions(prefix))
+        return len(prefixes)
+
+    def _load_suggestions(self, prefix: str) -> list[ListingSuggestion]:
+        rows = self.listing_repository.suggest_terms(prefix, limit=MAX_SUGGESTIONS)
+        ranked = sorted(rows, key=lambda row: (-row[2], row[0] != ListingSuggestionKind.brand.value, row[1]))
+        return [
+            ListingSuggestion(text=term, kind=ListingSuggestionKind(kind), count=hits)
+            for kind, term, hits in ranked[:MAX_SUGGESTIONS]
+        ]
+
+
+# Started with the API process (see app.main). Every interval it reloads the prefixes read most
+# since its previous pass; the interval is shorter than the cache TTL, so those never expire,
+# while prefixes nobody asked for are left to age out.
+class HotPrefixRefresher:
+    def __init__(
+        self,
+        cache: TTLCache[list[ListingSuggestion]],
+        session_factory: Callable[[], Session],
+        *,
+        interval_seconds: float,
+        hot_prefixes: int,
+    ) -> None:
+        self.cache = cache
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.hot_prefixes = hot_prefixes
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="suggestion-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def run_once(self) -> int:
+        db = self.session_factory()
+        try:
+            return ListingSuggestionService(ListingRepository(db), self.cache).refresh_hot_prefixes(self.hot_prefixes)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception:
+                # A failed pass leaves the entries to expire; requests then load them as before.
+                logger.exception("Refreshing hot suggestion prefixes failed")
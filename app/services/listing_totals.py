@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from app.api.v1.schemas.listings import ListingTotalKind
+from app.core.cache import GenerationalCache
+from app.db.repositories.listing_repository import ListingRepository, ListingSearchFilters
+
+
+class ListingTotalsStrategy:
+    def __init__(
+        self,
+        listing_repository: ListingRepository,
+        *,
+        cache: GenerationalCache,
+        estimate_threshold: int,
+    ) -> None:
+        self.listing_repository = listing_repository
+        self.cache = cache
+        self.estimate_threshold = estimate_threshold
+
+    def resolve(
+        self,
+        filters: ListingSearchFilters,
+        *,
+        include_total: bool,
+    ) -> tuple[int | None, ListingTotalKind | None]:
+        if not include_total:
+            return None, None
+
+        # The cached entry holds the total together with its kind, so a broad filter's estimate
+        # is reused for the TTL just like an exact count and a miss runs EXPLAIN or COUNT, not both.
+        cached = self.cache.fetch(filters.signature(), lambda: self._load(filters))
+        total, _, kind = cached.partition(" ")
+        return int(total), ListingTotalKind(kind)
+
+    def _load(self, filters: ListingSearchFilters) -> str:
+        # Broad filters match so many rows that an exact count costs more than the page
+        # itself; the planner's estimate is good enough for "about N results".
+        estimate = self.listing_repository.estimate_listing_count(filters)
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return f"{estimate} {ListingTotalKind.estimated.value}"
+        return f"{self.listing_repository.count_listings(filters)} {ListingTotalKind.exact.value}"
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import status
+
+from app.api.v1.schemas.listings import ListingViewsResponse
+from app.core.errors import ApplicationError, ErrorCode
+from app.core.view_counter import ListingViewCounter
+from app.db.models.user import User, UserRole
+from app.db.repositories.listing_repository import ListingRepository
+from app.db.repositories.listing_view_repository import ListingViewRepository
+
+
+class ListingViewService:
+    def __init__(
+        self,
+        listing_repository: ListingRepository,
+        view_repository: ListingViewRepository,
+        counter: ListingViewCounter,
+    ) -> None:
+        self.listing_repository = listing_repository
+        self.view_repository = view_repository
+        self.counter = counter
+
+    def record_view(self, listing_id: UUID, viewer: str) -> None:
+        self.counter.record(listing_id, viewer)
+
+    def get_views(self, listing_id: UUID, current_user: User) -> ListingViewsResponse:
+        listing = self.listing_repository.get_listing_by_id(listing_id)
+        if not listing:
+            raise ApplicationError(
+                code="NOT_FOUND",
+                message="Listing not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        if listing.user_id != current_user.id and current_user.role != UserRole.admin:
+            raise ApplicationError(
+                code=ErrorCode.ACCESS_DENIED,
+                message="Only the seller can see listing views.",
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+
+        counts = self.view_repository.get(listing_id)
+        if counts is None:
+            return ListingViewsResponse(listing_id=listing_id)
+        return ListingViewsResponse(
+            listing_id=listing_id,
+            view_count=counts.view_count,
+            unique_viewer_count=counts.unique_viewer_count,
+            updated_at=counts.updated_at,
+        )
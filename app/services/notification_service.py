@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Sequence
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 
+from app.db.models.listing import Listing
 from app.db.models.notification import Notification, NotificationEvent
 from app.db.models.order import Order, OrderStatus
 from app.db.models.withdrawal_request import WithdrawalRequest
@@ -71,6 +72,20 @@ class NotificationService:
         }
         self.create_notification(user_id=withdrawal.user_id, event=NotificationEvent.withdrawal_created, payload=payload)
 
+    def notify_saved_search_matches(self, listing: Listing, user_ids: Sequence[UUID]) -> None:
+        payload = {
+            "listing_id": str(listing.id),
+            "title": listing.title,
+            "price": str(listing.price),
+            "city": listing.city,
+        }
+        self.notification_repository.create_many(
+            user_ids=user_ids,
+            event=NotificationEvent.saved_search_match,
+            payload=payload,
+        )
+        self.user_repository.mark_unread_notifications(user_ids)
+
     def _event_for_status(self, status: OrderStatus) -> NotificationEvent | None:
         mapping: dict[OrderStatus, NotificationEvent] = {
             OrderStatus.confirmed: NotificationEvent.order_confirmed,
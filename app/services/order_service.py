@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 
 from app.api.v1.schemas.orders import OrderCreateRequest
 from app.core.errors import ApplicationError, ErrorCode
+from app.core.trending import TrendingEvent, TrendingRanking
 from app.db.models.address import Address
 from app.db.models.listing import Listing, ListingStatus
 from app.db.models.order import Order, OrderStatus
@@ -32,6 +33,7 @@ class OrderService:
         address_repository: AddressRepository,
         wallet_service: WalletService,
         notification_service: NotificationService,
+        trending: TrendingRanking | None = None,
     ) -> None:
         self.db = db
         self.order_repository = order_repository
@@ -39,6 +41,7 @@ class OrderService:
         self.address_repository = address_repository
         self.wallet_service = wallet_service
         self.notification_service = notification_service
+        self.trending = trending
 
     def create_order(self, buyer_id: UUID, payload: OrderCreateRequest) -> Order:
         existing = self.order_repository.get_by_idempotency_key(payload.idempotency_key)
@@ -90,6 +93,8 @@ class OrderService:
             self.db.rollback()
             raise
 
+        if self.trending:
+            self.trending.record(payload.listing_id, TrendingEvent.order)
         return order
 
     def get_buyer_orders(self, buyer_id: UUID) -> list[Order]:
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+from uuid import UUID
+
+from app.api.v1.schemas.listings import PriceSuggestionBasis, PriceSuggestionResponse
+from app.core.config import get_settings
+from app.db.models.listing import ListingCondition
+from app.db.repositories.price_suggestion_repository import PriceSuggestionRepository, normalize_brand
+
+
+# Per-process copy of the price_suggestions table. Every lookup is a dict hit; the only query on
+# the request path is a checkpoint read every refresh_seconds, and the table is reloaded only
+# after the batch job has written a new version.
+class PriceSuggestionBook:
+    def __init__(self, *, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._bands: dict[tuple[UUID, str, str], Any] = {}
+        self._version: int | None = None
+        self._checked_at: float | None = None
+
+    def lookup(
+        self,
+        repository: PriceSuggestionRepository,
+        category_id: UUID,
+        condition: str,
+        brand: str,
+    ) -> tuple[Any, PriceSuggestionBasis] | None:
+        with self._lock:
+            self._refresh(repository)
+            bands = self._bands
+
+        candidates = []
+        if condition and brand:
+            candidates.append(((category_id, condition, brand), PriceSuggestionBasis.brand))
+        if condition:
+            candidates.append(((category_id, condition, ""), PriceSuggestionBasis.condition))
+        candidates.append(((category_id, "", ""), PriceSuggestionBasis.category))
+        for key, basis in candidates:
+            band = bands.get(key)
+            if band is not None:
+                return band, basis
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bands = {}
+            self._version = None
+            self._checked_at = None
+
+    def _refresh(self, repository: PriceSuggestionRepository) -> None:
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_seconds:
+            return
+        self._checked_at = now
+
+        version = repository.last_computed()
+        if version is None or version == self._version:
+            return
+        self._bands = {(row.category_id, row.condition, row.brand): row for row in repository.all_suggestions()}
+        self._version = version
+
+
+price_suggestion_book = PriceSuggestionBook(refresh_seconds=get_settings().price_suggestion_refresh_seconds)
+
+
+class PriceSuggestionService:
+    def __init__(self, repository: PriceSuggestionRepository, book: PriceSuggestionBook) -> None:
+        self.repository = repository
+        self.book = book
+
+    def suggest(
+        self,
+        category_id: UUID,
+        *,
+        condition: ListingCondition | None = None,
+        brand: str | None = None,
+    ) -> PriceSuggestionResponse:
+        response = PriceSuggestionResponse(category_id=category_id, condition=condition, brand=brand or None)
+        found = self.book.lookup(
+            self.repository,
+            category_id,
+            condition.value if condition else "",
+            normalize_brand(brand),
+        )
+        if found is None:
+            return response
+
+        band, basis = found
+        response.basis = basis
+        response.sample_size = band.sample_size
+        response.low = band.low
+        response.median = band.median
+        response.high = band.high
+        response.computed_at = band.computed_at
+        return response
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+from uuid import UUID
+
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.api.v1.schemas.saved_searches import SavedSearchCreate
+from app.core.errors import ApplicationError, ErrorCode
+from app.db.models.saved_search import SavedSearch
+from app.db.repositories.listing_repository import ListingRepository
+from app.db.repositories.saved_search_repository import SavedSearchRepository
+from app.services.listing_service import ListingService
+from app.services.notification_service import NotificationService
+
+
+MAX_SAVED_SEARCHES = 20
+MATCH_NOTIFICATION_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+class SavedSearchService:
+    def __init__(
+        self,
+        *,
+        db: Session,
+        saved_search_repository: SavedSearchRepository,
+        listing_service: ListingService,
+    ) -> None:
+        self.db = db
+        self.saved_search_repository = saved_search_repository
+        self.listing_service = listing_service
+
+    def create_saved_search(self, user_id: UUID, payload: SavedSearchCreate) -> SavedSearch:
+        if self.saved_search_repository.count_for_user(user_id) >= MAX_SAVED_SEARCHES:
+            raise ApplicationError(
+                code=ErrorCode.VALIDATION_ERROR,
+                message=f"You can keep at most {MAX_SAVED_SEARCHES} saved searches.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Resolve category names and `near` once, exactly as GET /listings would.
+        filters = self.listing_service.build_search_filters(payload)
+        latitude, longitude = filters.near or (None, None)
+        data = {
+            "name": payload.name,
+            "q": filters.q,
+            "category_id": filters.category_id,
+            "city": filters.city,
+            "condition": filters.condition,
+            "min_price": filters.min_price,
+            "max_price": filters.max_price,
+            "near": payload.near if filters.near else None,
+            "latitude": latitude,
+            "longitude": longitude,
+            "radius_km": filters.radius_km,
+        }
+        return self.saved_search_repository.create(user_id, data)
+
+    def list_saved_searches(self, user_id: UUID) -> list[SavedSearch]:
+        return list(self.saved_search_repository.list_for_user(user_id))
+
+    def delete_saved_search(self, user_id: UUID, saved_search_id: UUID) -> None:
+        saved_search = self.saved_search_repository.get_by_id(saved_search_id)
+        if not saved_search or saved_search.user_id != user_id:
+            raise ApplicationError(
+                code="NOT_FOUND",
+                message="Saved search not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        self.saved_search_repository.delete(saved_search)
+
+
+class SavedSearchAlertService:
+    def __init__(
+        self,
+        *,
+        db: Session,
+        saved_search_repository: SavedSearchRepository,
+        listing_repository: ListingRepository,
+        notification_service: NotificationService,
+    ) -> None:
+        self.db = db
+        self.saved_search_repository = saved_search_repository
+        self.listing_repository = listing_repository
+        self.notification_service = notification_service
+
+    def queue(self, listing_id: UUID) -> None:
+        # Call before the approval commits, so the outbox row is committed with it.
+        self.saved_search_repository.queue_alerts(listing_id)
+
+    def notify_matches(self, listing_id: UUID) -> int:
+        # Runs after the approval has committed, so a failure must not fail the request; the
+        # outbox row keeps the progress and app.jobs.saved_search_alerts finishes the fan-out.
+        try:
+            return self.send(listing_id)
+        except Exception:
+            self.db.rollback()
+            logger.exception("Saved search alerts for listing %s failed; left queued for retry", listing_id)
+            return 0
+
+    def send(self, listing_id: UUID) -> int:
+        # Percolate the listing once against all saved searches and alert each matching user once.
+        # Every batch commits its notifications together with the outbox cursor, under a row lock,
+        # so a resumed or concurrent fan-out never alerts a user twice.
+        notified = 0
+        while True:
+            alert = self.saved_search_repository.lock_alert(listing_id)
+            if alert is None:
+                self.db.rollback()
+                return notified
+            listing = self.listing_repository.get_listing_by_id(listing_id)
+            if listing is None or not listing.is_public:
+                # Sold or unpublished before its alerts went out.
+                self.saved_search_repository.delete_alert(alert)
+                self.db.commit()
+                return notified
+
+            user_ids = self.saved_search_repository.matching_user_ids(
+                listing, after=alert.after_user_id, limit=MATCH_NOTIFICATION_BATCH_SIZE
+            )
+            if user_ids:
+                self.notification_service.notify_saved_search_matches(listing, user_ids)
+            done = len(user_ids) < MATCH_NOTIFICATION_BATCH_SIZE
+            if done:
+                self.saved_search_repository.delete_alert(alert)
+            else:
+                alert.after_user_id = user_ids[-1]
+            self.db.commit()
+            notified += len(user_ids)
+            if done:
+                return notified
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Sequence
+from uuid import UUID
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(sort_by: str, key: Sequence[Any], *, scope: str | None = None) -> str:
+    # ``scope`` binds the cursor to the input its key was computed from (e.g. the text rank
+    # depends on the keyword query), so it cannot be replayed against a different one.
+    payload: dict[str, Any] = {"s": sort_by, "k": [_dump_value(value) for value in key]}
+    if scope is not None:
+        payload["h"] = _scope_digest(scope)
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    token: str, *, sort_by: str, types: Sequence[type], scope: str | None = None
+) -> tuple[Any, ...]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor.") from exc
+
+    if not isinstance(payload, dict) or payload.get("s") != sort_by:
+        raise InvalidCursorError("Cursor does not match the requested sort order.")
+
+    if payload.get("h") != (_scope_digest(scope) if scope is not None else None):
+        raise InvalidCursorError("Cursor does not match the search query.")
+
+    values = payload.get("k")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursorError("Malformed cursor.")
+
+    try:
+        return tuple(_load_value(value, expected) for value, expected in zip(values, types))
+    except (AttributeError, TypeError, ValueError, InvalidOperation) as exc:
+        raise InvalidCursorError("Malformed cursor.") from exc
+
+
+def _scope_digest(scope: str) -> str:
+    return hashlib.sha256(scope.encode()).hexdigest()[:16]
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _load_value(value: Any, expected: type) -> Any:
+    if expected is datetime:
+        return datetime.fromisoformat(value)
+    if expected is float:
+        return float(value)
+    return expected(value)
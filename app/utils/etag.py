@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import hashlib
+
+
+def strong_etag(payload: str) -> str:
+    return '"' + hashlib.sha256(payload.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so a W/ prefix still matches.
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return etag in (candidate.removeprefix("W/") for candidate in candidates)
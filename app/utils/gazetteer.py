@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+
+
+# City centroids (latitude, longitude) for resolving a listing's free-text city.
+MOROCCAN_CITIES: dict[str, tuple[float, float]] = {
+    "agadir": (30.4278, -9.5981),
+    "al hoceima": (35.2517, -3.9372),
+    "azrou": (33.4344, -5.2213),
+    "beni mellal": (32.3373, -6.3498),
+    "berkane": (34.9200, -2.3200),
+    "berrechid": (33.2655, -7.5876),
+    "casablanca": (33.5731, -7.5898),
+    "chefchaouen": (35.1688, -5.2636),
+    "dakhla": (23.6848, -15.9580),
+    "el jadida": (33.2316, -8.5007),
+    "errachidia": (31.9314, -4.4244),
+    "essaouira": (31.5085, -9.7595),
+    "fes": (34.0181, -5.0078),
+    "guelmim": (28.9870, -10.0574),
+    "ifrane": (33.5228, -5.1110),
+    "inezgane": (30.3558, -9.5369),
+    "kenitra": (34.2610, -6.5802),
+    "khemisset": (33.8240, -6.0660),
+    "khouribga": (32.8811, -6.9063),
+    "ksar el kebir": (35.0017, -5.9053),
+    "laayoune": (27.1253, -13.1625),
+    "larache": (35.1932, -6.1557),
+    "marrakech": (31.6295, -7.9811),
+    "meknes": (33.8935, -5.5473),
+    "midelt": (32.6852, -4.7451),
+    "mohammedia": (33.6866, -7.3830),
+    "nador": (35.1681, -2.9335),
+    "ouarzazate": (30.9189, -6.8934),
+    "oujda": (34.6814, -1.9086),
+    "rabat": (34.0209, -6.8416),
+    "safi": (32.2994, -9.2372),
+    "sale": (34.0331, -6.7985),
+    "settat": (33.0010, -7.6166),
+    "sidi kacem": (34.2260, -5.7070),
+    "tanger": (35.7595, -5.8340),
+    "taroudant": (30.4703, -8.8770),
+    "taza": (34.2100, -4.0100),
+    "temara": (33.9287, -6.9063),
+    "tetouan": (35.5889, -5.3626),
+    "tiznit": (29.6974, -9.7316),
+}
+
+CITY_ALIASES = {
+    "casa": "casablanca",
+    "dar el beida": "casablanca",
+    "el aaiun": "laayoune",
+    "fez": "fes",
+    "marrakesh": "marrakech",
+    "tangier": "tanger",
+    "tangiers": "tanger",
+}
+
+KM_PER_DEGREE = 111.195
+
+
+def normalize_city(name: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return re.sub(r"[\s\-']+", " ", stripped).strip().casefold()
+
+
+def resolve_city(name: str | None) -> tuple[float, float] | None:
+    if not name:
+        return None
+    key = normalize_city(name)
+    return MOROCCAN_CITIES.get(CITY_ALIASES.get(key, key))
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> tuple[float, float, float, float]:
+    lat_delta = radius_km / KM_PER_DEGREE
+    lng_delta = radius_km / (KM_PER_DEGREE * math.cos(math.radians(latitude)))
+    return latitude - lat_delta, latitude + lat_delta, longitude - lng_delta, longitude + lng_delta
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+
+
+NUM_HASHES = 64
+# 16 bands of 4 rows: listings with Jaccard similarity 0.8 share a band with probability
+# ~0.9998, while pairs at 0.3 only collide ~12% of the time.
+LSH_BANDS = 16
+LSH_ROWS = NUM_HASHES // LSH_BANDS
+SHINGLE_SIZE = 5
+
+_PRIME = (1 << 61) - 1
+_rng = np.random.default_rng(0x4C42414C)
+# Fixed seed: signatures are stored, so the permutations must never change between releases.
+_A = _rng.integers(1, 1 << 31, size=NUM_HASHES, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 31, size=NUM_HASHES, dtype=np.uint64)
+_SPACES = re.compile(r"\s+")
+_EMPTY = np.full(NUM_HASHES, 0xFFFFFFFF, dtype=np.uint32)
+
+
+def normalize_text(value: str) -> str:
+    folded = unicodedata.normalize("NFKD", value.lower()).encode("ascii", "ignore").decode()
+    return _SPACES.sub(" ", re.sub(r"[^a-z0-9]+", " ", folded)).strip()
+
+
+def shingles(value: str) -> set[str]:
+    text = normalize_text(value)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[index : index + SHINGLE_SIZE] for index in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(value: str) -> np.ndarray:
+    values = shingles(value)
+    if not values:
+        return _EMPTY.copy()
+    # a*x + b stays below 2**63 for 32-bit x and 31-bit a and b, so uint64 never overflows.
+    hashes = np.fromiter((zlib.crc32(item.encode()) for item in values), dtype=np.uint64, count=len(values))
+    permuted = (np.outer(hashes, _A) + _B) % _PRIME
+    return (permuted.min(axis=0) & 0xFFFFFFFF).astype(np.uint32)
+
+
+def similarity(left: np.ndarray, right: np.ndarray) -> float:
+    return float(np.count_nonzero(left == right)) / NUM_HASHES
+
+
+def band_keys(value: np.ndarray, *, namespace: bytes = b"") -> list[int]:
+    # One signed 64-bit key per band so it fits a BIGINT column.
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = value[band * LSH_ROWS : (band + 1) * LSH_ROWS].tobytes()
+        digest = hashlib.blake2b(namespace + bytes([band]) + rows, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
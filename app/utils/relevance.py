@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta, timezone
+
+
+# Relevance is ranked in log space: ln(quality) + ln(2) * created_at / half-life. Anchoring the
+# recency term to the epoch instead of "now" keeps a listing's score fixed as it ages (every
+# score decays at the same rate), so the ordering only changes when quality signals do.
+RELEVANCE_HALF_LIFE = timedelta(days=7)
+# Log points per second of listing age: being one half-life newer is worth ln(2).
+RECENCY_RATE = math.log(2) / RELEVANCE_HALF_LIFE.total_seconds()
+# Weight of ln(text rank) for keyword searches; doubling the rank is worth one half-life.
+TEXT_RANK_WEIGHT = 1.0
+# Floor for the text rank so ln() stays finite for rows that match only on negated terms.
+MIN_TEXT_RANK = 1e-6
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def recency_score(created_at: datetime) -> float:
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return (created_at - _EPOCH).total_seconds() * RECENCY_RATE
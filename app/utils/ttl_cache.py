@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, Hashable, TypeVar
+
+
+V = TypeVar("V")
+
+
+@dataclass(slots=True)
+class _Entry(Generic[V]):
+    expires_at: float
+    value: V
+    # Reads since the last hottest() call.
+    hits: int = 0
+
+
+class TTLCache(Generic[V]):
+    def __init__(self, *, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, _Entry[V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            entry.hits += 1
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def set(self, key: Hashable, value: V) -> None:
+        self._store(key, value, hits=0)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], V]) -> V:
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            self._store(key, value, hits=1)
+        return value
+
+    def hottest(self, limit: int) -> list[Hashable]:
+        # The most-read keys since the previous call, most read first; counters start over.
+        with self._lock:
+            read = [(entry.hits, key) for key, entry in self._entries.items() if entry.hits]
+            for entry in self._entries.values():
+                entry.hits = 0
+        return [key for _, key in heapq.nlargest(limit, read, key=lambda item: item[0])]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key: Hashable, value: V, *, hits: int) -> None:
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                hits += previous.hits
+            self._entries[key] = _Entry(time.monotonic() + self.ttl_seconds, value, hits)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
@@ -0,0 +1,119 @@
+"""Compare the ORM and column-projection read paths for one public search page.
+
+Run with ``python -m tests.benchmarks.bench_listing_search``. Uses in-memory SQLite,
+so absolute numbers are only meaningful relative to each other.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from decimal import Decimal
+
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "bench-google-client-id")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session, selectinload, sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.api.v1.schemas.listings import ListingResponse  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.models.listing import Listing, ListingCondition, ListingStatus  # noqa: E402
+from app.db.models.listing_image import ListingImage  # noqa: E402
+from app.db.models.user import User  # noqa: E402
+from app.db.repositories.listing_repository import ListingRepository, ListingSearchFilters  # noqa: E402
+from tests.conftest import LISTING_TABLES  # noqa: E402
+
+
+def seed(session: Session, *, listings: int, images: int) -> None:
+    user_id = uuid.uuid4()
+    session.execute(insert(User), [{"id": user_id, "name": "Seller", "email": "seller@example.com"}])
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "title": f"Listing {index}",
+            "description": "Lorem ipsum dolor sit amet. " * 40,
+            "condition": ListingCondition.good,
+            "price": Decimal("100.00") + index,
+            "city": "Casablanca",
+            "status": ListingStatus.approved,
+            "is_locked": False,
+        }
+        for index in range(listings)
+    ]
+    session.execute(insert(Listing), rows)
+    session.execute(
+        insert(ListingImage),
+        [
+            {
+                "id": uuid.uuid4(),
+                "listing_id": row["id"],
+                "url": f"https://cdn.example.com/{index}/{position}.jpg",
+                "position": position,
+            }
+            for index, row in enumerate(rows)
+            for position in range(images)
+        ],
+    )
+    session.commit()
+
+
+def orm_page(session: Session, page_size: int) -> str:
+    repository = ListingRepository(session)
+    query = repository.search_page_query(ListingSearchFilters(), sort_by="newest", limit=page_size)
+    listings = [row[0] for row in query.options(selectinload(Listing.images)).all()]
+    payload = "[" + ",".join(ListingResponse.from_orm(listing).model_dump_json() for listing in listings) + "]"
+    session.expunge_all()
+    return payload
+
+
+def projection_page(session: Session, page_size: int) -> str:
+    repository = ListingRepository(session)
+    listings, _ = repository.search_listings(ListingSearchFilters(), sort_by="newest", limit=page_size)
+    return "[" + ",".join(ListingResponse.model_validate(listing).model_dump_json() for listing in listings) + "]"
+
+
+def measure(name: str, page: Callable[[Session, int], str], session: Session, *, page_size: int, rounds: int) -> None:
+    page(session, page_size)
+
+    started = time.process_time()
+    for _ in range(rounds):
+        page(session, page_size)
+    cpu_ms = (time.process_time() - started) * 1000 / rounds
+
+    tracemalloc.start()
+    page(session, page_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<12} {cpu_ms:8.2f} ms CPU/page {peak / 1024:10.1f} KiB peak/page")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--listings", type=int, default=2_000)
+    parser.add_argument("--images", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=LISTING_TABLES)
+    session = sessionmaker(bind=engine)()
+    seed(session, listings=args.listings, images=args.images)
+
+    print(f"{args.page_size} listings/page, {args.images} images/listing, {args.rounds} rounds")
+    measure("orm", orm_page, session, page_size=args.page_size, rounds=args.rounds)
+    measure("projection", projection_page, session, page_size=args.page_size, rounds=args.rounds)
+
+
+if __name__ == "__main__":
+    main()
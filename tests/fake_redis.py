@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from redis.exceptions import ResponseError
+
+
+class InMemoryRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, int]] = defaultdict(dict)
+        self.sorted_sets: dict[str, dict[str, float]] = defaultdict(dict)
+        self.hyperloglogs: dict[str, set[str]] = defaultdict(set)
+        self.ttls: dict[str, int] = {}
+
+    def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    def mget(self, keys: list[str]) -> list[str | None]:
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key: str, value: str, ex: int | None = None, nx: bool = False) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    def pipeline(self, transaction: bool = True) -> InMemoryPipeline:
+        return InMemoryPipeline(self)
+
+    def delete(self, *keys: str) -> int:
+        deleted = 0
+        for key in keys:
+            found = False
+            for store in (self.values, self.hashes, self.sorted_sets, self.hyperloglogs):
+                found = store.pop(key, None) is not None or found
+            self.ttls.pop(key, None)
+            deleted += found
+        return deleted
+
+    def exists(self, *keys: str) -> int:
+        stores = (self.values, self.hashes, self.sorted_sets, self.hyperloglogs)
+        return sum(any(store.get(key) for store in stores) for key in keys)
+
+    def rename(self, source: str, destination: str) -> bool:
+        if not self.hashes.get(source):
+            raise ResponseError("no such key")
+        self.hashes[destination] = self.hashes.pop(source)
+        return True
+
+    def expire(self, key: str, seconds: int) -> bool:
+        if not self.exists(key):
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    def pfadd(self, key: str, *values: str) -> int:
+        before = len(self.hyperloglogs[key])
+        self.hyperloglogs[key].update(values)
+        return int(len(self.hyperloglogs[key]) > before)
+
+    def pfcount(self, key: str) -> int:
+        return len(self.hyperloglogs.get(key, ()))
+
+    def incr(self, key: str) -> int:
+        self.values[key] = str(int(self.values.get(key, "0")) + 1)
+        return int(self.values[key])
+
+    def hincrby(self, key: str, field: str, amount: int) -> int:
+        self.hashes[key][field] = self.hashes[key].get(field, 0) + amount
+        return self.hashes[key][field]
+
+    def hset(self, key: str, field: str, value: str) -> int:
+        created = field not in self.hashes[key]
+        self.hashes[key][field] = value
+        return int(created)
+
+    def hdel(self, key: str, *fields: str) -> int:
+        return sum(self.hashes[key].pop(field, None) is not None for field in fields)
+
+    def hgetall(self, key: str) -> dict[str, int]:
+        return dict(self.hashes.get(key, {}))
+
+    def zincrby(self, key: str, amount: float, member: str) -> float:
+        self.sorted_sets[key][member] = self.sorted_sets[key].get(member, 0.0) + amount
+        return self.sorted_sets[key][member]
+
+    def zrange(self, key: str, start: int, end: int) -> list[str]:
+        return self._ranked(key, reverse=False, start=start, end=end)
+
+    def zrevrange(self, key: str, start: int, end: int) -> list[str]:
+        return self._ranked(key, reverse=True, start=start, end=end)
+
+    def zscore(self, key: str, member: str) -> float | None:
+        return self.sorted_sets[key].get(member)
+
+    def zrem(self, key: str, *members: str) -> int:
+        return sum(self.sorted_sets[key].pop(member, None) is not None for member in members)
+
+    def zunionstore(self, dest: str, keys: dict[str, float]) -> int:
+        union: dict[str, float] = {}
+        for key, weight in keys.items():
+            for member, score in self.sorted_sets[key].items():
+                union[member] = union.get(member, 0.0) + score * weight
+        self.sorted_sets[dest] = union
+        return len(union)
+
+    def zremrangebyscore(self, key: str, low: str, high: str) -> int:
+        exclusive = high.startswith("(")
+        bound = float(high.lstrip("("))
+        doomed = [
+            member
+            for member, score in self.sorted_sets[key].items()
+            if (score < bound if exclusive else score <= bound)
+        ]
+        return self.zrem(key, *doomed)
+
+    def zremrangebyrank(self, key: str, start: int, end: int) -> int:
+        return self.zrem(key, *self._ranked(key, reverse=False, start=start, end=end))
+
+    def _ranked(self, key: str, *, reverse: bool, start: int, end: int) -> list[str]:
+        ranked = sorted(self.sorted_sets[key].items(), key=lambda item: (item[1], item[0]), reverse=reverse)
+        members = [member for member, _ in ranked]
+        end = len(members) + end if end < 0 else end
+        start = max(len(members) + start, 0) if start < 0 else start
+        return members[start : end + 1]
+
+
+class InMemoryPipeline:
+    def __init__(self, redis: InMemoryRedis) -> None:
+        self.redis = redis
+        self.commands: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):  # noqa: ANN204
+        def queue(*args, **kwargs) -> InMemoryPipeline:  # noqa: ANN002, ANN003
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list:
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.api.v1 import deps
+from app.core.cache import listing_detail_cache
+from app.core.trending import trending_listings
+from app.db.models.favorite import Favorite
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.user import User, UserRole
+from app.jobs.favorite_counts import FavoriteCountsJob
+from app.main import app
+from tests.fake_redis import InMemoryRedis
+
+
+AUTH = {"Authorization": "Bearer test"}
+
+
+@pytest.fixture(autouse=True)
+def _redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(trending_listings, "client", InMemoryRedis())
+    monkeypatch.setattr(listing_detail_cache, "client", InMemoryRedis())
+
+
+def _user(db: Session) -> User:
+    user = User(name="Buyer", email=f"{uuid.uuid4().hex}@example.com")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _listing(db: Session, title: str = "Jacket", status: ListingStatus = ListingStatus.approved) -> Listing:
+    seller = _user(db)
+    listing = Listing(
+        user_id=seller.id,
+        title=title,
+        condition=ListingCondition.good,
+        price=Decimal("100.00"),
+        city="Rabat",
+        status=status,
+    )
+    db.add(listing)
+    db.commit()
+    return listing
+
+
+def _login(user_id: uuid.UUID) -> None:
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=user_id, role=UserRole.user, is_active=True)
+
+
+def test_add_and_remove_are_idempotent_and_keep_the_count(client: TestClient, db_session: Session) -> None:
+    listing_id = _listing(db_session).id
+    buyers = [_user(db_session).id for _ in range(2)]
+    assert client.get(f"/listings/{listing_id}").json()["favorite_count"] == 0
+
+    for buyer_id in buyers:
+        _login(buyer_id)
+        assert client.put(f"/favorites/{listing_id}", headers=AUTH).status_code == 204
+        assert client.put(f"/favorites/{listing_id}", headers=AUTH).status_code == 204
+    # The cached detail payload is dropped when the count moves.
+    assert client.get(f"/listings/{listing_id}").json()["favorite_count"] == 2
+    assert trending_listings.page(offset=0, limit=10) == [listing_id]
+
+    assert client.delete(f"/favorites/{listing_id}", headers=AUTH).status_code == 204
+    assert client.delete(f"/favorites/{listing_id}", headers=AUTH).status_code == 204
+    assert client.get(f"/listings/{listing_id}").json()["favorite_count"] == 1
+
+
+def test_only_public_listings_can_be_favorited(client: TestClient, db_session: Session) -> None:
+    draft_id = _listing(db_session, status=ListingStatus.pending).id
+    _login(_user(db_session).id)
+
+    assert client.put(f"/favorites/{draft_id}", headers=AUTH).status_code == 404
+    assert client.put(f"/favorites/{uuid.uuid4()}", headers=AUTH).status_code == 404
+
+
+def test_my_favorites_are_paged_newest_first(client: TestClient, db_session: Session) -> None:
+    listing_ids = [_listing(db_session, f"Item {index}").id for index in range(3)]
+    buyer_id = _user(db_session).id
+    # Two favorites share a timestamp, so the page boundary falls on the listing id tie-break.
+    favorited_at = [datetime(2025, 12, 1, tzinfo=timezone.utc), datetime(2025, 12, 2, tzinfo=timezone.utc)]
+    db_session.add_all(
+        Favorite(user_id=buyer_id, listing_id=listing_id, created_at=favorited_at[min(index, 1)])
+        for index, listing_id in enumerate(listing_ids)
+    )
+    db_session.commit()
+    _login(buyer_id)
+
+    first = client.get("/favorites/me", params={"page_size": 2}, headers=AUTH).json()
+    second = client.get(
+        "/favorites/me", params={"page_size": 2, "cursor": first["next_cursor"]}, headers=AUTH
+    ).json()
+
+    newest = sorted(listing_ids[1:], reverse=True) + listing_ids[:1]
+    seen = [item["listing"]["id"] for item in first["items"] + second["items"]]
+    assert seen == [str(listing_id) for listing_id in newest]
+    assert second["next_cursor"] is None
+    assert client.get("/favorites/me", params={"cursor": "nope"}, headers=AUTH).status_code == 400
+
+
+def test_reconcile_job_fixes_drifted_counts(db_session: Session) -> None:
+    jacket = _listing(db_session)
+    boots = _listing(db_session, "Boots")
+    buyer = _user(db_session)
+    db_session.add_all(Favorite(user_id=buyer.id, listing_id=listing.id) for listing in (jacket, boots))
+    boots.favorite_count = 1
+    db_session.commit()
+    db_session.execute(delete(Favorite).where(Favorite.listing_id == boots.id))
+    db_session.commit()
+
+    assert FavoriteCountsJob(db_session, batch_size=1).run() == 2
+    db_session.expire_all()
+    assert (jacket.favorite_count, boots.favorite_count) == (1, 0)
+    assert FavoriteCountsJob(db_session).run() == 0
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.cache import listing_count_cache, listing_detail_cache, listing_search_cache
+from app.core.home_feed import city_feed, home_feed
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.user import User
+from app.db.repositories.listing_repository import ListingRepository
+from app.jobs.home_feed import HomeFeedJob
+from tests.fake_redis import InMemoryRedis
+from tests.query_counter import assert_max_queries
+
+
+BASE = datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    for cache in (home_feed, listing_search_cache, listing_count_cache, listing_detail_cache):
+        monkeypatch.setattr(cache, "client", InMemoryRedis())
+    monkeypatch.setattr(home_feed, "pages", 2)
+    monkeypatch.setattr(home_feed, "page_size", 2)
+
+
+def _listings(db: Session, city: str, count: int, *, start: int = 0) -> list[Listing]:
+    seller = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com")
+    db.add(seller)
+    db.flush()
+    listings = [
+        Listing(
+            user_id=seller.id,
+            title=f"{city} {index}",
+            condition=ListingCondition.good,
+            price=Decimal("100.00"),
+            city=city,
+            status=ListingStatus.approved,
+            created_at=BASE + timedelta(hours=index),
+        )
+        for index in range(start, start + count)
+    ]
+    db.add_all(listings)
+    db.commit()
+    return listings
+
+
+def _titles(client: TestClient, city: str, page: int = 1) -> list[str]:
+    response = client.get("/listings", params={"city": city, "sort_by": "newest", "page": page, "page_size": 2})
+    assert response.status_code == 200
+    return [item["title"] for item in response.json()["items"]]
+
+
+def test_feed_pages_match_the_search_and_skip_the_database(
+    client: TestClient, db_session: Session, db_engine: Engine
+) -> None:
+    _listings(db_session, "Rabat", 5)
+    searched = client.get("/listings", params={"city": "Rabat", "page": 2, "page_size": 2}).json()
+
+    assert HomeFeedJob(db_session).run() == 1
+    with assert_max_queries(db_engine, 0):
+        served = client.get("/listings", params={"city": "Rabat", "page": 2, "page_size": 2}).json()
+        assert _titles(client, "Rabat") == ["Rabat 4", "Rabat 3"]
+    assert served == searched
+    # Only the configured number of pages is stored; deeper pages are searched.
+    assert home_feed.get(city_feed("Rabat"), 3) is None
+    assert _titles(client, "Rabat", page=3) == ["Rabat 0"]
+
+
+def test_feeds_are_rebuilt_when_listings_are_approved_or_sold(client: TestClient, db_session: Session) -> None:
+    _listings(db_session, "Rabat", 3)
+    (pending,) = _listings(db_session, "Rabat", 1, start=10)
+    ListingRepository(db_session).update_listing(pending, {"status": ListingStatus.pending})
+    _listings(db_session, "Fes", 1)
+    HomeFeedJob(db_session).run()
+    assert _titles(client, "Rabat") == ["Rabat 2", "Rabat 1"]
+
+    listings = ListingRepository(db_session)
+    listings.update_listing(pending, {"status": ListingStatus.approved})
+    # The stored page is served until the worker's next pass picks the change up.
+    assert _titles(client, "Rabat") == ["Rabat 2", "Rabat 1"]
+    assert HomeFeedJob(db_session).run() == 1
+    assert _titles(client, "Rabat") == ["Rabat 10", "Rabat 2"]
+
+    listings.update_listing(pending, {"sold_at": BASE, "is_locked": True})
+    assert HomeFeedJob(db_session).run() == 1
+    assert _titles(client, "Rabat") == ["Rabat 2", "Rabat 1"]
+    assert HomeFeedJob(db_session).run() == 0
+
+
+def test_full_run_keeps_only_the_busiest_cities(client: TestClient, db_session: Session) -> None:
+    _listings(db_session, "Rabat", 3)
+    _listings(db_session, "Fes", 1)
+    HomeFeedJob(db_session).run()
+    assert set(home_feed.members()) == {city_feed("Rabat"), city_feed("Fes")}
+
+    HomeFeedJob(db_session, cities=1).run(full=True)
+    assert set(home_feed.members()) == {city_feed("Rabat")}
+    assert home_feed.get(city_feed("Fes"), 1) is None
+    assert _titles(client, "Fes") == ["Fes 0"]
+
+
+def test_pages_are_not_served_once_the_worker_stalls(client: TestClient, db_session: Session) -> None:
+    newest = _listings(db_session, "Rabat", 3)[-1]
+    HomeFeedJob(db_session).run()
+    ListingRepository(db_session).update_listing(newest, {"sold_at": BASE, "is_locked": True})
+    assert _titles(client, "Rabat") == ["Rabat 2", "Rabat 1"]
+
+    # No pass within HOME_FEED_MAX_LAG_SECONDS: the heartbeat expires and requests search again.
+    home_feed.client.delete("home_feed:heartbeat")
+    assert home_feed.get(city_feed("Rabat"), 1) is None
+    assert _titles(client, "Rabat") == ["Rabat 1", "Rabat 0"]
+
+    HomeFeedJob(db_session).run()
+    assert home_feed.get(city_feed("Rabat"), 1) is not None
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.v1 import deps
+from app.db.models.listing import Listing
+from app.db.models.listing_duplicate_flag import ListingDuplicateFlag
+from app.db.models.listing_fingerprint import ListingFingerprint
+from app.db.models.user import User, UserRole
+from app.db.repositories.listing_duplicate_repository import ListingDuplicateRepository
+from app.jobs.listing_fingerprints import backfill
+from app.main import app
+
+
+DESCRIPTION = "Veste en cuir véritable, portée deux fois, aucune rayure. Remise en main propre à Rabat."
+
+
+def _user(db: Session) -> uuid.UUID:
+    user = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com")
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def _as(user_id: uuid.UUID, role: UserRole = UserRole.user) -> None:
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=user_id, role=role, is_active=True)
+
+
+def _post(client: TestClient, user_id: uuid.UUID, title: str, description: str = DESCRIPTION) -> str:
+    _as(user_id)
+    payload = {"title": title, "description": description, "condition": "good", "price": "450.00", "city": "Rabat"}
+    response = client.post("/listings", json=payload)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _open_flags(client: TestClient) -> list[dict]:
+    _as(uuid.uuid4(), UserRole.admin)
+    response = client.get("/admin/listings/duplicates")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_reposts_by_the_same_seller_are_flagged(client: TestClient, db_session: Session) -> None:
+    seller_id, other_seller_id = _user(db_session), _user(db_session)
+    original = _post(client, seller_id, "Veste cuir noir Zara taille M")
+    _post(client, seller_id, "Sac à dos Eastpak", "Sac à dos gris, très bon état, quelques traces d'usure.")
+    _post(client, other_seller_id, "Veste cuir noir Zara taille M")
+    repost = _post(client, seller_id, "Veste cuir noire Zara taille M !")
+
+    flags = _open_flags(client)
+
+    assert [(flag["listing_id"], flag["duplicate_of_id"]) for flag in flags] == [(repost, original)]
+    assert flags[0]["user_id"] == str(seller_id)
+    assert flags[0]["duplicate_of_title"] == "Veste cuir noir Zara taille M"
+    assert flags[0]["similarity"] >= 0.8
+
+    assert client.post(f"/admin/listings/duplicates/{flags[0]['id']}/dismiss").status_code == 204
+    assert _open_flags(client) == []
+    assert client.get("/admin/listings/duplicates", params={"status": "dismissed"}).json()[0]["id"] == flags[0]["id"]
+
+
+def test_edits_and_bulk_batches_are_checked(client: TestClient, db_session: Session) -> None:
+    seller_id = _user(db_session)
+    original = _post(client, seller_id, "Veste cuir noir Zara taille M")
+    edited = _post(client, seller_id, "Robe longue fleurie", "Robe d'été légère, taille S.")
+
+    _as(seller_id)
+    client.put(f"/listings/{edited}", json={"title": "Veste cuir noir Zara taille M", "description": DESCRIPTION})
+    client.put(f"/listings/{original}", json={"description": DESCRIPTION + " "})
+    assert [(flag["listing_id"], flag["duplicate_of_id"]) for flag in _open_flags(client)] == [(edited, original)]
+
+    _as(seller_id, UserRole.admin)
+    item = {
+        "title": "Casque Sony WH-1000XM4",
+        "description": "Casque sans fil, complet.",
+        "condition": "good",
+        "price": "900.00",
+        "city": "Rabat",
+    }
+    created = client.post("/listings/bulk", json={"listings": [item, item]}).json()
+
+    assert db_session.query(ListingDuplicateFlag).filter(
+        ListingDuplicateFlag.listing_id == uuid.UUID(created[1]["id"]),
+        ListingDuplicateFlag.duplicate_of_id == uuid.UUID(created[0]["id"]),
+    ).count() == 1
+    _as(seller_id)
+    assert client.get("/admin/listings/duplicates").status_code == 403
+
+
+def test_fingerprinting_failure_does_not_fail_the_write(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    seller_id = _user(db_session)
+    original = _post(client, seller_id, "Veste cuir noir Zara taille M")
+
+    def unavailable(*args: object, **kwargs: object) -> None:
+        raise RuntimeError("fingerprint store unavailable")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(ListingDuplicateRepository, "save_fingerprints", unavailable)
+        repost = _post(client, seller_id, "Veste cuir noire Zara taille M !")
+
+    assert db_session.get(Listing, uuid.UUID(repost)) is not None
+    assert db_session.get(ListingFingerprint, uuid.UUID(repost)) is None
+    assert _open_flags(client) == []
+
+    assert backfill(db_session) == 1
+    assert [(flag["listing_id"], flag["duplicate_of_id"]) for flag in _open_flags(client)] == [(repost, original)]
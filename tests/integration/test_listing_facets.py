@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterator
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.v1 import deps
+from app.core.cache import listing_count_cache, listing_facets_cache, listing_search_cache
+from app.db.models.category import Category
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.user import User
+from app.db.repositories.listing_repository import ListingRepository
+from app.main import app
+from tests.conftest import POSTGRES_URL, postgres_schema
+from tests.fake_redis import InMemoryRedis
+
+
+# GROUPING SETS has no SQLite equivalent, so the facet query only runs against Postgres.
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+
+@pytest.fixture
+def pg_engine() -> Iterator[Engine]:
+    with postgres_schema("facets") as engine:
+        yield engine
+
+
+@pytest.fixture
+def pg_session(pg_engine: Engine) -> Iterator[Session]:
+    session = sessionmaker(bind=pg_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def pg_client(pg_engine: Engine, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    redis = InMemoryRedis()
+    for cache in (listing_search_cache, listing_count_cache, listing_facets_cache):
+        monkeypatch.setattr(cache, "client", redis)
+    session_factory = sessionmaker(bind=pg_engine, autocommit=False, autoflush=False)
+
+    def override_get_db() -> Iterator[Session]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[deps.get_db] = override_get_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _seed(db: Session) -> tuple[list[Listing], list[uuid.UUID]]:
+    seller = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com")
+    categories = [Category(name="Coats"), Category(name="Shoes")]
+    db.add_all([seller, *categories])
+    db.flush()
+    rows = [
+        ("Rabat", 0, ListingCondition.good, "40.00", ListingStatus.approved),
+        ("Rabat", 0, ListingCondition.new, "120.00", ListingStatus.approved),
+        ("Rabat", 1, ListingCondition.good, "300.00", ListingStatus.approved),
+        ("Fes", 0, ListingCondition.good, "80.00", ListingStatus.approved),
+        ("Fes", 1, ListingCondition.fair, "15.00", ListingStatus.approved),
+        ("Fes", 1, ListingCondition.good, "60.00", ListingStatus.pending),
+    ]
+    listings = [
+        Listing(
+            user_id=seller.id,
+            title=f"{city} {index}",
+            category_id=categories[category].id,
+            condition=condition,
+            price=Decimal(price),
+            city=city,
+            status=status,
+        )
+        for index, (city, category, condition, price, status) in enumerate(rows)
+    ]
+    db.add_all(listings)
+    db.commit()
+    return listings, [category.id for category in categories]
+
+
+def _total(client: TestClient, **params: Any) -> int:
+    response = client.get("/listings", params=params)
+    assert response.status_code == 200
+    return response.json()["total"]
+
+
+def _facets(client: TestClient, **params: Any) -> dict[str, Any]:
+    response = client.get("/listings/facets", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_facet_counts_match_the_filtered_search(pg_client: TestClient, pg_session: Session) -> None:
+    _, category_ids = _seed(pg_session)
+    filters = {"city": "Rabat", "condition": "good"}
+
+    facets = _facets(pg_client, **filters)
+
+    assert facets["total"] == _total(pg_client, **filters) == 2
+    for facet, param in (("cities", "city"), ("conditions", "condition"), ("categories", "category_id")):
+        for entry in facets[facet]:
+            # A facet ignores its own filter: the count is what picking that value would return.
+            assert entry["count"] == _total(pg_client, **{**filters, param: entry["value"]}), (facet, entry)
+    assert {entry["value"]: entry["count"] for entry in facets["cities"]} == {"Rabat": 2, "Fes": 1}
+    assert {entry["value"]: entry["count"] for entry in facets["conditions"]} == {"good": 2, "new": 1}
+    assert {entry["value"]: entry["count"] for entry in facets["categories"]} == {
+        str(category_ids[0]): 1,
+        str(category_ids[1]): 1,
+    }
+    # The price filter is ignored by the price buckets and only by them.
+    priced = _facets(pg_client, min_price="50", max_price="200")
+    assert sum(bucket["count"] for bucket in priced["price_buckets"]) == _total(pg_client) == 5
+    assert priced["total"] == _total(pg_client, min_price="50", max_price="200") == 2
+
+
+def test_facets_cache_is_invalidated_by_a_listing_write(pg_client: TestClient, pg_session: Session) -> None:
+    listings, _ = _seed(pg_session)
+    assert {entry["value"]: entry["count"] for entry in _facets(pg_client)["cities"]} == {"Rabat": 3, "Fes": 2}
+
+    ListingRepository(pg_session).update_listing(listings[-1], {"status": ListingStatus.approved})
+
+    facets = _facets(pg_client)
+    assert facets["total"] == 6
+    assert {entry["value"]: entry["count"] for entry in facets["cities"]} == {"Rabat": 3, "Fes": 3}
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.v1 import deps
+from app.core.cache import listing_count_cache, listing_search_cache
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.user import User
+from app.main import app
+from tests.conftest import POSTGRES_URL, postgres_schema
+from tests.fake_redis import InMemoryRedis
+
+
+# Full-text search needs the generated search_vector column, so this only runs against Postgres.
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+BASE = datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def pg_engine() -> Iterator[Engine]:
+    with postgres_schema("keyword_search") as engine:
+        session = sessionmaker(bind=engine)()
+        try:
+            _seed(session)
+        finally:
+            session.close()
+        yield engine
+
+
+@pytest.fixture
+def pg_client(pg_engine: Engine, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    for cache in (listing_search_cache, listing_count_cache):
+        monkeypatch.setattr(cache, "client", InMemoryRedis())
+    session_factory = sessionmaker(bind=pg_engine, autocommit=False, autoflush=False)
+
+    def override_get_db() -> Iterator[Session]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[deps.get_db] = override_get_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _seed(db: Session) -> None:
+    seller = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com")
+    db.add(seller)
+    db.flush()
+    # Weighted title (A) > brand (B) > description (C), so the rank order is fixed by where "wool" appears.
+    rows = [
+        ("Wool coat", "Wool & Co", None, ListingStatus.approved),
+        ("Wool scarf", None, None, ListingStatus.approved),
+        ("Winter coat", None, "Lined with wool", ListingStatus.approved),
+        ("Leather boots", None, None, ListingStatus.approved),
+        ("Wool gloves", None, None, ListingStatus.pending),
+    ]
+    db.add_all(
+        Listing(
+            user_id=seller.id,
+            title=title,
+            brand=brand,
+            description=description,
+            condition=ListingCondition.good,
+            price=Decimal("80.00"),
+            city="Rabat",
+            status=status,
+            created_at=BASE + timedelta(hours=index),
+        )
+        for index, (title, brand, description, status) in enumerate(rows)
+    )
+    db.commit()
+
+
+def test_keyword_search_matches_public_listings_in_rank_order(pg_client: TestClient) -> None:
+    response = pg_client.get("/listings", params={"q": "wool"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["title"] for item in body["items"]] == ["Wool coat", "Wool scarf", "Winter coat"]
+    assert body["total"] == 3
+    assert pg_client.get("/listings", params={"q": "sandals"}).json()["items"] == []
+
+
+def test_rank_cursor_pages_through_the_same_query_only(pg_client: TestClient) -> None:
+    first = pg_client.get("/listings", params={"q": "wool", "page_size": 2}).json()
+    assert [item["title"] for item in first["items"]] == ["Wool coat", "Wool scarf"]
+
+    second = pg_client.get("/listings", params={"q": "wool", "page_size": 2, "cursor": first["next_cursor"]})
+    assert second.status_code == 200
+    assert [item["title"] for item in second.json()["items"]] == ["Winter coat"]
+    assert second.json()["next_cursor"] is None
+
+    # The rank in the cursor was computed for "wool"; it means nothing for another query.
+    other = pg_client.get("/listings", params={"q": "coat", "page_size": 2, "cursor": first["next_cursor"]})
+    assert other.status_code == 400
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.api.v1 import deps
+from app.core.cache import (
+    LISTINGS_GENERATION_KEY,
+    listing_count_cache,
+    listing_detail_cache,
+    listing_facets_cache,
+    listing_search_cache,
+)
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.listing_image import ListingImage
+from app.db.models.user import User, UserRole
+from app.main import app
+from tests.fake_redis import InMemoryRedis
+from tests.query_counter import assert_max_queries
+
+
+PAGE_ITEMS = 10
+
+
+def _seed_listings(db: Session, *, count: int = PAGE_ITEMS, images_per_listing: int = 3) -> uuid.UUID:
+    user = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com", role=UserRole.admin)
+    db.add(user)
+    db.flush()
+    for index in range(count):
+        listing = Listing(
+            user_id=user.id,
+            title=f"Listing {index}",
+            condition=ListingCondition.good,
+            price=Decimal("100.00") + index,
+            city="Casablanca",
+            status=ListingStatus.approved,
+            is_locked=False,
+        )
+        db.add(listing)
+        db.flush()
+        for position in range(images_per_listing):
+            db.add(ListingImage(listing_id=listing.id, url=f"https://cdn.example.com/{index}/{position}.jpg", position=position))
+    db.commit()
+    return user.id
+
+
+def _authenticate_as(user_id: uuid.UUID) -> None:
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=user_id, role=UserRole.admin, is_active=True)
+
+
+def test_search_listings_loads_images_in_one_query(client: TestClient, db_session: Session, db_engine: Engine) -> None:
+    _seed_listings(db_session)
+
+    with assert_max_queries(db_engine, 3):
+        response = client.get("/listings", params={"page_size": PAGE_ITEMS})
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == PAGE_ITEMS
+    assert all(len(item["images"]) == 3 for item in items)
+
+
+def test_search_totals_can_be_skipped(client: TestClient, db_session: Session) -> None:
+    _seed_listings(db_session, count=3)
+
+    counted = client.get("/listings").json()
+    skipped = client.get("/listings", params={"include_total": False}).json()
+
+    assert (counted["total"], counted["total_kind"]) == (3, "exact")
+    assert (skipped["total"], skipped["total_kind"]) == (None, None)
+    assert skipped["items"] == counted["items"]
+
+
+def test_approval_invalidates_cached_searches_but_pending_creates_do_not(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    redis = InMemoryRedis()
+    for cache in (listing_search_cache, listing_count_cache, listing_facets_cache):
+        monkeypatch.setattr(cache, "client", redis)
+    admin_id = _seed_listings(db_session, count=2, images_per_listing=0)
+    _authenticate_as(admin_id)
+    assert client.get("/listings").json()["total"] == 2
+
+    created = client.post(
+        "/listings",
+        json={"title": "Fresh", "condition": "good", "price": "50.00", "city": "Casablanca"},
+        headers={"Authorization": "Bearer test"},
+    )
+    assert created.status_code == 201
+    assert redis.get(LISTINGS_GENERATION_KEY) is None
+
+    approved = client.post(f"/listings/{created.json()['id']}/approve", headers={"Authorization": "Bearer test"})
+    assert approved.status_code == 200
+    searched = client.get("/listings").json()
+    assert searched["total"] == 3
+    assert created.json()["id"] in {item["id"] for item in searched["items"]}
+
+
+def test_list_my_listings_loads_images_in_one_query(client: TestClient, db_session: Session, db_engine: Engine) -> None:
+    user_id = _seed_listings(db_session)
+    _authenticate_as(user_id)
+
+    with assert_max_queries(db_engine, 2):
+        response = client.get("/listings/me", headers={"Authorization": "Bearer test"})
+
+    assert response.status_code == 200
+    assert len(response.json()) == PAGE_ITEMS
+
+
+def test_bulk_create_listings_does_not_query_per_listing(
+    client: TestClient, db_session: Session, db_engine: Engine
+) -> None:
+    user_id = _seed_listings(db_session, count=0)
+    _authenticate_as(user_id)
+    payload = {
+        "listings": [
+            {"title": f"Bulk {index}", "condition": "good", "price": "50.00", "city": "Rabat"}
+            for index in range(PAGE_ITEMS)
+        ]
+    }
+
+    # Insert, change log and reload, then duplicate detection (bucket probe and two inserts)
+    # and a reload of the committed batch: constant however many listings are posted.
+    with assert_max_queries(db_engine, 9):
+        response = client.post("/listings/bulk", json=payload, headers={"Authorization": "Bearer test"})
+
+    assert response.status_code == 201
+    assert len(response.json()) == PAGE_ITEMS
+
+
+def test_listing_detail_revalidates_from_cache_until_written(
+    client: TestClient, db_session: Session, db_engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(listing_detail_cache, "client", InMemoryRedis())
+    user_id = _seed_listings(db_session, count=1)
+    _authenticate_as(user_id)
+    listing_id = db_session.query(Listing.id).scalar()
+
+    first = client.get(f"/listings/{listing_id}")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+
+    with assert_max_queries(db_engine, 0):
+        cached = client.get(f"/listings/{listing_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    client.put(f"/listings/{listing_id}", json={"title": "Renamed"}, headers={"Authorization": "Bearer test"})
+
+    updated = client.get(f"/listings/{listing_id}", headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()["title"] == "Renamed"
+    assert updated.headers["ETag"] != etag
+
+
+def test_batch_fetch_preserves_order_and_reports_missing(
+    client: TestClient, db_session: Session, db_engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(listing_detail_cache, "client", InMemoryRedis())
+    _seed_listings(db_session)
+    listing_ids = [str(listing_id) for (listing_id,) in db_session.query(Listing.id).all()]
+    unknown = str(uuid.uuid4())
+    requested = [listing_ids[3], unknown, listing_ids[0], listing_ids[7]]
+
+    with assert_max_queries(db_engine, 2):
+        response = client.get("/listings/batch", params={"ids": requested})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == [listing_ids[3], listing_ids[0], listing_ids[7]]
+    assert all(len(item["images"]) == 3 for item in body["items"])
+    assert body["missing"] == [unknown]
+
+    with assert_max_queries(db_engine, 1):
+        assert client.get("/listings/batch", params={"ids": requested}).json() == body
+
+
+def test_sparse_fields_narrow_query_and_payload(client: TestClient, db_session: Session, db_engine: Engine) -> None:
+    _seed_listings(db_session)
+
+    with assert_max_queries(db_engine, 2) as statements:
+        response = client.get("/listings", params={"fields": "title,price", "include_total": False})
+
+    assert response.status_code == 200
+    assert all(set(item) == {"id", "title", "price"} for item in response.json()["items"])
+    assert "description" not in statements[0]
+    assert not any("listing_images" in statement for statement in statements)
+
+    listing_id = response.json()["items"][0]["id"]
+    full = client.get(f"/listings/{listing_id}")
+    sparse = client.get(f"/listings/{listing_id}", params={"fields": "title"})
+    assert sparse.json() == {"id": listing_id, "title": full.json()["title"]}
+    assert sparse.headers["ETag"] != full.headers["ETag"]
+
+    assert client.get("/listings", params={"fields": "title,secret"}).status_code == 400
+
+
+def test_cover_image_follows_first_image(client: TestClient, db_session: Session) -> None:
+    user_id = _seed_listings(db_session, count=1, images_per_listing=0)
+    _authenticate_as(user_id)
+    listing_id = db_session.query(Listing.id).scalar()
+    headers = {"Authorization": "Bearer test"}
+
+    def cover() -> str | None:
+        return client.get(f"/listings/{listing_id}", params={"fields": "cover_image_url"}).json()["cover_image_url"]
+
+    client.post(f"/listings/{listing_id}/images", json={"url": "https://cdn.example.com/a.jpg"}, headers=headers)
+    assert cover() == "https://cdn.example.com/a.jpg"
+
+    front = client.post(
+        f"/listings/{listing_id}/images", json={"url": "https://cdn.example.com/b.jpg", "position": 0}, headers=headers
+    ).json()
+    assert cover() == "https://cdn.example.com/b.jpg"
+
+    client.delete(f"/listings/images/{front['id']}", headers=headers)
+    assert cover() == "https://cdn.example.com/a.jpg"
+
+
+def test_change_feed_returns_latest_state_and_tombstones(client: TestClient, db_session: Session) -> None:
+    user_id = _seed_listings(db_session, count=0)
+    _authenticate_as(user_id)
+    headers = {"Authorization": "Bearer test"}
+    payload = {"title": "Jacket", "condition": "good", "price": "80.00", "city": "Rabat"}
+    kept = client.post("/listings", json=payload, headers=headers).json()["id"]
+    removed = client.post("/listings", json=payload, headers=headers).json()["id"]
+    pending = client.post("/listings", json=payload, headers=headers).json()["id"]
+    client.post(f"/listings/{kept}/approve", headers=headers)
+    client.put(f"/listings/{kept}", json={"price": "70.00"}, headers=headers)
+    client.put(f"/listings/{pending}", json={"title": "Draft jacket"}, headers=headers)
+    client.delete(f"/listings/{removed}", headers=headers)
+
+    feed = client.get("/listings/changes", params={"since": 0}).json()
+
+    assert [(change["listing_id"], change["deleted"]) for change in feed["changes"]] == [
+        (kept, False),
+        (pending, True),
+        (removed, True),
+    ]
+    assert feed["changes"][0]["listing"]["price"] == "70.00"
+    # A listing that was never approved is only ever announced as a tombstone.
+    assert feed["changes"][1]["listing"] is None
+    assert feed["changes"][2]["listing"] is None
+    assert feed["has_more"] is False
+
+    assert client.get("/listings/changes", params={"since": feed["next_since"]}).json()["changes"] == []
+
+
+def test_proximity_search_filters_and_sorts_by_distance(client: TestClient, db_session: Session) -> None:
+    user_id = _seed_listings(db_session, count=0)
+    _authenticate_as(user_id)
+    headers = {"Authorization": "Bearer test"}
+    created = {}
+    for city in ("Casablanca", "Sale", "Rabat"):
+        payload = {"title": "Jacket", "condition": "good", "price": "80.00", "city": city}
+        created[city] = client.post("/listings", json=payload, headers=headers).json()["id"]
+    db_session.query(Listing).update({Listing.status: ListingStatus.approved})
+    db_session.commit()
+
+    response = client.get("/listings", params={"near": "Rabat", "radius_km": 30, "sort_by": "distance"})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == [created["Rabat"], created["Sale"]]
+    assert response.json()["items"][0]["latitude"] is not None
+    by_point = client.get("/listings", params={"near": "33.57,-7.59", "radius_km": 10}).json()["items"]
+    assert [item["id"] for item in by_point] == [created["Casablanca"]]
+    assert client.get("/listings", params={"sort_by": "distance"}).status_code == 400
+    assert client.get("/listings", params={"near": "Atlantis"}).status_code == 400
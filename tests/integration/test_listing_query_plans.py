@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import itertools
+import json
+import random
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.explain import Explain
+from app.db.models.category import Category
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.user import User
+from app.db.repositories.listing_repository import KEYSET_TYPES, ListingRepository, ListingSearchFilters
+from app.utils.gazetteer import resolve_city
+from tests.conftest import POSTGRES_URL, postgres_schema
+
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+SEED_LISTINGS = 50_000
+# A top-N sort over at most this many estimated rows is cheaper than walking an index and is
+# what Postgres should pick for selective filters; a sort over more means no index served the order.
+MAX_SORTED_ROWS = 1_000
+CITIES = ["Casablanca", "Rabat", "Marrakech", "Fes", "Tanger", "Agadir", "Meknes", "Oujda"]
+
+
+@pytest.fixture(scope="module")
+def plan_session() -> Iterator[Session]:
+    with postgres_schema("plan_check") as engine:
+        with engine.begin() as connection:
+            category_ids = _seed(connection)
+            connection.execute(text("ANALYZE"))
+
+        # Plans are checked with the default planner settings against these statistics.
+        session = sessionmaker(bind=engine)()
+        session.info["category_ids"] = category_ids
+        try:
+            yield session
+        finally:
+            session.close()
+
+
+def _seed(connection: Any) -> list[uuid.UUID]:
+    rng = random.Random(8)
+    user_id = uuid.uuid4()
+    connection.execute(insert(User), [{"id": user_id, "name": "Seller", "email": "seller@example.com"}])
+    category_ids = [uuid.uuid4() for _ in range(12)]
+    connection.execute(
+        insert(Category),
+        [{"id": category_id, "name": f"Category {index}"} for index, category_id in enumerate(category_ids)],
+    )
+
+    now = datetime.now(timezone.utc)
+    statuses = [ListingStatus.approved] * 8 + [ListingStatus.pending, ListingStatus.sold]
+    rows = []
+    for index in range(SEED_LISTINGS):
+        status = rng.choice(statuses)
+        city = rng.choice(CITIES)
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "title": f"{rng.choice(['Veste', 'Robe', 'Chaussures', 'Sac', 'Jean'])} {index}",
+                "brand": rng.choice(["Nike", "Zara", "Adidas", None]),
+                "category_id": rng.choice(category_ids),
+                "condition": rng.choice(list(ListingCondition)),
+                "price": Decimal(rng.randint(20, 5000)),
+                "city": city,
+                "latitude": resolve_city(city)[0],
+                "longitude": resolve_city(city)[1],
+                "status": status,
+                "is_locked": status == ListingStatus.sold,
+                "sold_at": now if status == ListingStatus.sold else None,
+                "created_at": now - timedelta(minutes=index),
+            }
+        )
+    connection.execute(insert(Listing), rows)
+    return category_ids
+
+
+def _filter_combinations(category_id: uuid.UUID) -> Iterator[ListingSearchFilters]:
+    options: dict[str, Any] = {
+        "category_id": category_id,
+        "city": "Rabat",
+        "min_price": Decimal("100"),
+        "max_price": Decimal("900"),
+        "condition": ListingCondition.good,
+        "q": "veste",
+        "near": (34.0209, -6.8416),
+    }
+    for size in range(len(options) + 1):
+        for names in itertools.combinations(options, size):
+            filters = {name: options[name] for name in names}
+            if "near" in filters:
+                filters["radius_km"] = 25.0
+            yield ListingSearchFilters(**filters)
+
+
+def _plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _explain(session: Session, query: Any, *, seqscan: bool = True) -> list[dict[str, Any]]:
+    try:
+        if not seqscan:
+            # SET LOCAL only lasts until the rollback below, so it never leaks into other plans.
+            session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = session.execute(Explain(query.statement)).scalar_one()
+    finally:
+        session.rollback()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(_plan_nodes(plan[0]["Plan"]))
+
+
+def _plan_problems(nodes: list[dict[str, Any]], *, sorted_by_index: bool) -> list[str]:
+    problems = [f"Seq Scan on {node['Relation Name']}" for node in nodes if node["Node Type"] == "Seq Scan"]
+    if sorted_by_index:
+        for node in nodes:
+            # An incremental sort only reorders within groups the index already produced in order.
+            if node["Node Type"] == "Sort" and node["Plans"][0]["Plan Rows"] > MAX_SORTED_ROWS:
+                problems.append(f"Sort of {node['Plans'][0]['Plan Rows']} rows")
+    return problems
+
+
+def _sample_key(sort_by: str) -> tuple[Any, ...]:
+    values = {
+        Decimal: Decimal("450"),
+        datetime: datetime.now(timezone.utc) - timedelta(days=3),
+        uuid.UUID: uuid.UUID(int=2**127),
+        float: 0.05,
+    }
+    if sort_by == "distance":
+        values[float] = 42.0
+    return tuple(values[kind] for kind in KEYSET_TYPES[sort_by])
+
+
+def test_search_plans_use_indexes_for_every_filter_and_sort(plan_session: Session) -> None:
+    repository = ListingRepository(plan_session)
+    failures = []
+    for filters in _filter_combinations(plan_session.info["category_ids"][0]):
+        for sort_by in KEYSET_TYPES:
+            if (sort_by == "rank" and not filters.q) or (sort_by == "distance" and not filters.near):
+                continue
+            # Text rank and distance are computed per row, so every match is read and sorted. When a
+            # filter matches a large share of the table a seq scan can rightly win there, so for these
+            # sorts alone the check is that an index is able to serve the filters, with seq scans off.
+            sorted_by_index = sort_by not in ("rank", "distance") and not (sort_by == "relevance" and filters.q)
+            for after in (None, _sample_key(sort_by)):
+                query = repository.search_page_query(filters, sort_by=sort_by, limit=21, after=after)
+                nodes = _explain(plan_session, query, seqscan=sorted_by_index)
+                problems = _plan_problems(nodes, sorted_by_index=sorted_by_index)
+                if problems:
+                    plan = [node["Node Type"] for node in nodes]
+                    failures.append(f"{filters} sort={sort_by} after={after is not None}: {problems} in {plan}")
+
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db.models.address import Address
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.order import Order, OrderStatus
+from app.db.models.user import KycStatus, User
+from app.jobs.listing_relevance import ListingRelevanceJob
+from app.utils.relevance import RELEVANCE_HALF_LIFE, recency_score
+
+
+BASE = datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+
+def _listing(db: Session, seller_id: uuid.UUID, title: str, created_at: datetime, **extra: object) -> Listing:
+    listing = Listing(
+        user_id=seller_id,
+        title=title,
+        condition=ListingCondition.good,
+        price=Decimal("100.00"),
+        city="Rabat",
+        status=extra.pop("status", ListingStatus.approved),
+        created_at=created_at,
+        **extra,
+    )
+    db.add(listing)
+    db.flush()
+    return listing
+
+
+def _completed_sales(db: Session, seller_id: uuid.UUID, count: int) -> None:
+    buyer = User(name="Buyer", email=f"{uuid.uuid4().hex}@example.com")
+    db.add(buyer)
+    db.flush()
+    address = Address(user_id=buyer.id, line1="1 Rue Test", city="Rabat")
+    db.add(address)
+    db.flush()
+    for _ in range(count):
+        sold = _listing(db, seller_id, "Sold", BASE - timedelta(days=60), status=ListingStatus.sold, is_locked=True)
+        db.add(
+            Order(
+                listing_id=sold.id,
+                buyer_id=buyer.id,
+                seller_id=seller_id,
+                shipping_address_id=address.id,
+                shipping_address_snapshot={"city": "Rabat"},
+                price_amount=Decimal("100.00"),
+                status=OrderStatus.completed,
+                idempotency_key=uuid.uuid4().hex,
+            )
+        )
+    db.flush()
+
+
+def test_relevance_sort_trades_recency_for_seller_quality(client: TestClient, db_session: Session) -> None:
+    trusted = User(name="Trusted", email=f"{uuid.uuid4().hex}@example.com", kyc_status=KycStatus.verified)
+    newcomer = User(name="Newcomer", email=f"{uuid.uuid4().hex}@example.com")
+    db_session.add_all([trusted, newcomer])
+    db_session.flush()
+    _completed_sales(db_session, trusted.id, 15)
+
+    # The trusted seller's listing is a week older but carries a verified, 15-sale track record.
+    trusted_listing = _listing(
+        db_session, trusted.id, "Trusted jacket", BASE, cover_image_url="https://cdn.example.com/a.jpg"
+    )
+    fresh = _listing(db_session, newcomer.id, "Fresh jacket", BASE + RELEVANCE_HALF_LIFE)
+    stale = _listing(db_session, newcomer.id, "Stale jacket", BASE - 4 * RELEVANCE_HALF_LIFE)
+    db_session.commit()
+    updated_at = trusted_listing.updated_at
+
+    # New rows start from recency alone.
+    assert fresh.relevance_score == recency_score(BASE + RELEVANCE_HALF_LIFE)
+    # Only the trusted seller's listing has quality signals, so only its score moves.
+    assert ListingRelevanceJob(db_session, batch_size=2).run() == 1
+    assert ListingRelevanceJob(db_session).run() == 0
+
+    db_session.expire_all()
+    assert db_session.get(Listing, trusted_listing.id).updated_at == updated_at
+    assert db_session.get(Listing, stale.id).relevance_score == recency_score(BASE - 4 * RELEVANCE_HALF_LIFE)
+
+    seen = []
+    params = {"sort_by": "relevance", "page_size": 1, "fields": "title"}
+    while True:
+        response = client.get("/listings", params=params)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(item["title"] for item in body["items"])
+        if not body["next_cursor"]:
+            break
+        params["cursor"] = body["next_cursor"]
+    assert seen == ["Trusted jacket", "Fresh jacket", "Stale jacket"]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import itertools
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.models.category import Category
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.user import User
+from app.db.repositories.listing_repository import ListingRepository, ListingSearchFilters
+
+pytest.importorskip("numpy")
+
+from app.services.listing_search_index import INDEXED_SORTS, ListingSearchIndex  # noqa: E402
+
+
+CITIES = ["Casablanca", "Rabat", "Marrakech"]
+
+
+def _seed(db: Session, *, count: int = 120) -> list[uuid.UUID]:
+    rng = random.Random(15)
+    user = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com")
+    categories = [Category(name=f"Category {index}") for index in range(3)]
+    db.add_all([user, *categories])
+    db.flush()
+
+    # Few distinct prices and timestamps so ties fall through to the later sort keys.
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for _ in range(count):
+        status = rng.choice([ListingStatus.approved] * 4 + [ListingStatus.pending, ListingStatus.sold])
+        db.add(
+            Listing(
+                user_id=user.id,
+                title="Listing",
+                category_id=rng.choice([None, *(category.id for category in categories)]),
+                condition=rng.choice(list(ListingCondition)),
+                price=Decimal(rng.choice(["50.00", "120.50", "300.00", "999.99"])),
+                city=rng.choice(CITIES),
+                status=status,
+                is_locked=status == ListingStatus.sold,
+                created_at=base + timedelta(hours=rng.randint(0, 10)),
+            )
+        )
+    db.commit()
+    return [category.id for category in categories]
+
+
+def _filters(category_id: uuid.UUID) -> list[ListingSearchFilters]:
+    options: dict[str, Any] = {
+        "category_id": category_id,
+        "city": "Rabat",
+        "min_price": Decimal("100"),
+        "max_price": Decimal("300"),
+        "condition": ListingCondition.good,
+    }
+    return [
+        ListingSearchFilters(**{name: options[name] for name in names})
+        for size in range(3)
+        for names in itertools.combinations(options, size)
+    ]
+
+
+def _walk(search: Any, filters: ListingSearchFilters, sort_by: str) -> list[list[uuid.UUID]]:
+    pages, after = [], None
+    while True:
+        listing_ids, after = search(filters, sort_by, after)
+        pages.append(listing_ids)
+        if after is None:
+            return pages
+
+
+def test_index_pages_match_sql_for_every_filter_and_sort(db_session: Session) -> None:
+    category_ids = _seed(db_session)
+    repository = ListingRepository(db_session)
+    index = ListingSearchIndex(refresh_seconds=0)
+
+    def sql(filters: ListingSearchFilters, sort_by: str, after: Any) -> tuple[list[uuid.UUID], Any]:
+        rows, next_key = repository.search_listings(filters, sort_by=sort_by, limit=7, after=after, fields=frozenset())
+        return [row.id for row in rows], next_key
+
+    def indexed(filters: ListingSearchFilters, sort_by: str, after: Any) -> tuple[list[uuid.UUID], Any]:
+        listing_ids, next_key, _ = index.search(repository, filters, sort_by=sort_by, limit=7, after=after)
+        return listing_ids, next_key
+
+    for filters in _filters(category_ids[0]):
+        _, _, total = index.search(repository, filters, sort_by="newest", limit=1)
+        assert total == repository.count_listings(filters)
+        for sort_by in INDEXED_SORTS:
+            assert _walk(indexed, filters, sort_by) == _walk(sql, filters, sort_by), (filters, sort_by)
+            offset_page, _, _ = index.search(repository, filters, sort_by=sort_by, limit=5, offset=5)
+            sql_page, _ = repository.search_listings(filters, sort_by=sort_by, limit=5, offset=5, fields=frozenset())
+            assert offset_page == [row.id for row in sql_page]
+
+
+def test_index_replays_listing_writes(db_session: Session) -> None:
+    _seed(db_session, count=20)
+    repository = ListingRepository(db_session)
+    index = ListingSearchIndex(refresh_seconds=0)
+    filters = ListingSearchFilters(city="Rabat")
+    index.search(repository, filters, sort_by="price", limit=50)
+
+    listing = db_session.query(Listing).filter(Listing.status == ListingStatus.approved).first()
+    repository.update_listing(listing, {"city": "Rabat", "price": Decimal("1.00")})
+    listing_ids, _, _ = index.search(repository, filters, sort_by="price", limit=50)
+    assert listing_ids[0] == listing.id
+
+    repository.delete_listing(listing)
+    listing_ids, _, total = index.search(repository, filters, sort_by="price", limit=50)
+    assert listing.id not in listing_ids
+    assert total == repository.count_listings(filters)
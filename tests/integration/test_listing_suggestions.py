@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterator
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.user import User
+from app.services.listing_suggestion_service import HotPrefixRefresher, listing_suggestion_cache
+from tests.query_counter import assert_max_queries
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache() -> Iterator[None]:
+    listing_suggestion_cache.clear()
+    yield
+    listing_suggestion_cache.clear()
+
+
+def _listings(db: Session, *rows: tuple[str, str | None, ListingStatus]) -> None:
+    seller = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com")
+    db.add(seller)
+    db.flush()
+    db.add_all(
+        Listing(
+            user_id=seller.id,
+            title=title,
+            brand=brand,
+            condition=ListingCondition.good,
+            price=Decimal("100.00"),
+            city="Rabat",
+            status=status,
+        )
+        for title, brand, status in rows
+    )
+    db.commit()
+
+
+def _suggest(client: TestClient, q: str, **params: object) -> list[tuple[str, str, int]]:
+    response = client.get("/listings/suggestions", params={"q": q, **params})
+    assert response.status_code == 200
+    return [(item["text"], item["kind"], item["count"]) for item in response.json()["suggestions"]]
+
+
+def test_suggestions_match_brand_and_title_prefixes(client: TestClient, db_session: Session) -> None:
+    _listings(
+        db_session,
+        ("Nike Air Max 90", "Nike", ListingStatus.approved),
+        ("Nike Dunk", "Nike", ListingStatus.approved),
+        ("Running shoes", "Nike", ListingStatus.approved),
+        ("Nikon camera", None, ListingStatus.approved),
+        ("Nike Cortez", "Nike", ListingStatus.pending),
+        ("100%_cotton tee", None, ListingStatus.approved),
+    )
+
+    # Brands group every listing of the brand; only live listings count.
+    assert _suggest(client, "  NIK ") == [
+        ("Nike", "brand", 3),
+        ("Nike Air Max 90", "title", 1),
+        ("Nike Dunk", "title", 1),
+        ("Nikon camera", "title", 1),
+    ]
+    assert _suggest(client, "nike d") == [("Nike Dunk", "title", 1)]
+    assert _suggest(client, "nik", limit=2) == [("Nike", "brand", 3), ("Nike Air Max 90", "title", 1)]
+    # LIKE wildcards in the prefix are matched literally.
+    assert _suggest(client, "100%_") == [("100%_cotton tee", "title", 1)]
+    assert _suggest(client, "100__") == []
+    assert client.get("/listings/suggestions", params={"q": "nik", "limit": 11}).status_code == 422
+
+
+def test_repeated_prefixes_are_served_from_memory(
+    client: TestClient, db_session: Session, db_engine: Engine
+) -> None:
+    _listings(db_session, ("Nike Dunk", "Nike", ListingStatus.approved))
+    first = _suggest(client, "nik")
+
+    with assert_max_queries(db_engine, 0):
+        assert _suggest(client, "NIK") == first
+        assert _suggest(client, "nik", limit=1) == first[:1]
+
+
+def test_refresher_reloads_hot_prefixes_only(client: TestClient, db_session: Session, db_engine: Engine) -> None:
+    _listings(
+        db_session,
+        ("Nike Dunk", "Nike", ListingStatus.approved),
+        ("Adidas Samba", "Adidas", ListingStatus.approved),
+    )
+    _suggest(client, "nik")
+    _suggest(client, "nik")
+    _suggest(client, "adi")
+    refresher = HotPrefixRefresher(
+        listing_suggestion_cache,
+        sessionmaker(bind=db_engine),
+        interval_seconds=30,
+        hot_prefixes=1,
+    )
+    _listings(db_session, ("Nike Air Force 1", "Nike", ListingStatus.approved))
+
+    assert refresher.run_once() == 1
+    with assert_max_queries(db_engine, 0):
+        assert _suggest(client, "nik")[0] == ("Nike", "brand", 2)
+        # Not among the hottest, so it keeps its cached value until it expires.
+        assert _suggest(client, "adi") == [("Adidas", "brand", 1), ("Adidas Samba", "title", 1)]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from redis.exceptions import RedisError
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.api.v1 import deps
+from app.core.cache import listing_detail_cache
+from app.core.trending import trending_listings
+from app.core.view_counter import listing_view_counter
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.user import User, UserRole
+from app.jobs import listing_view_flusher
+from app.jobs.listing_view_flusher import ListingViewFlusher
+from app.main import app
+from tests.fake_redis import InMemoryRedis
+from tests.query_counter import assert_max_queries
+
+
+@pytest.fixture(autouse=True)
+def _redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(listing_view_counter, "client", InMemoryRedis())
+    monkeypatch.setattr(trending_listings, "client", InMemoryRedis())
+    monkeypatch.setattr(listing_detail_cache, "client", InMemoryRedis())
+
+
+def _listing(db: Session, title: str = "Jacket") -> Listing:
+    seller = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com")
+    db.add(seller)
+    db.flush()
+    listing = Listing(
+        user_id=seller.id,
+        title=title,
+        condition=ListingCondition.good,
+        price=Decimal("100.00"),
+        city="Rabat",
+        status=ListingStatus.approved,
+    )
+    db.add(listing)
+    db.commit()
+    return listing
+
+
+def _views(client: TestClient, listing_id: uuid.UUID) -> dict:
+    response = client.get(f"/listings/{listing_id}/views", headers={"Authorization": "Bearer test"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_views_are_buffered_then_flushed_in_bulk(client: TestClient, db_session: Session, db_engine: Engine) -> None:
+    jacket = _listing(db_session)
+    boots = _listing(db_session, "Boots")
+    jacket_id, boots_id, seller_id = jacket.id, boots.id, jacket.user_id
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=seller_id, role=UserRole.user, is_active=True)
+
+    client.get(f"/listings/{jacket_id}")
+    # Reading a cached listing and counting the view stays off the database entirely.
+    with assert_max_queries(db_engine, 0):
+        for agent in ("phone", "phone", "laptop"):
+            assert client.get(f"/listings/{jacket_id}", headers={"User-Agent": agent}).status_code == 200
+    client.get(f"/listings/{boots_id}")
+    assert _views(client, jacket_id) == {
+        "listing_id": str(jacket_id),
+        "view_count": 0,
+        "unique_viewer_count": 0,
+        "updated_at": None,
+    }
+
+    # One existence check and one multi-row upsert for the whole batch.
+    with assert_max_queries(db_engine, 2):
+        assert ListingViewFlusher(db_session).flush() == 2
+    body = _views(client, jacket_id)
+    assert (body["view_count"], body["unique_viewer_count"]) == (4, 3)
+    assert trending_listings.page(offset=0, limit=10) == [jacket_id, boots_id]
+
+    client.get(f"/listings/{jacket_id}")
+    assert ListingViewFlusher(db_session).flush() == 1
+    assert ListingViewFlusher(db_session).flush() == 0
+    body = _views(client, jacket_id)
+    assert (body["view_count"], body["unique_viewer_count"]) == (5, 3)
+
+
+def test_failed_flush_is_retried_and_deleted_listings_are_dropped(db_session: Session) -> None:
+    jacket = _listing(db_session)
+    gone = uuid.uuid4()
+    listing_view_counter.record(jacket.id, "viewer-1")
+    listing_view_counter.record(gone, "viewer-1")
+
+    listing_view_counter.take_pending()
+    listing_view_counter.record(jacket.id, "viewer-2")
+    # The batch taken above was never finished, so it is flushed before the newer views.
+    assert ListingViewFlusher(db_session).flush() == 1
+    assert listing_view_counter.client.pfcount(f"{listing_view_counter.prefix}:viewers:{gone}") == 0
+    assert ListingViewFlusher(db_session).flush() == 1
+
+    db_session.expire_all()
+    counts = ListingViewFlusher(db_session).views.get(jacket.id)
+    assert (counts.view_count, counts.unique_viewer_count) == (2, 2)
+
+
+def test_idle_viewer_sketches_expire_without_losing_the_estimate(db_session: Session) -> None:
+    jacket = _listing(db_session)
+    viewers_key = f"{listing_view_counter.prefix}:viewers:{jacket.id}"
+    for viewer in ("viewer-1", "viewer-2", "viewer-3"):
+        listing_view_counter.record(jacket.id, viewer)
+    assert listing_view_counter.client.ttls[viewers_key] == listing_view_counter.viewers_ttl_seconds
+    ListingViewFlusher(db_session).flush()
+
+    # Nobody viewed it for the whole TTL; the next viewer starts a new sketch.
+    listing_view_counter.client.delete(viewers_key)
+    listing_view_counter.record(jacket.id, "viewer-4")
+    ListingViewFlusher(db_session).flush()
+
+    db_session.expire_all()
+    counts = ListingViewFlusher(db_session).views.get(jacket.id)
+    assert (counts.view_count, counts.unique_viewer_count) == (4, 3)
+
+
+def test_worker_keeps_running_after_a_failed_flush(
+    db_session: Session, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    jacket = _listing(db_session)
+    listing_view_counter.record(jacket.id, "viewer-1")
+    take_pending = listing_view_counter.take_pending
+    outcomes = iter([RedisError("connection reset"), None])
+
+    def flaky_take_pending() -> dict[uuid.UUID, int]:
+        error = next(outcomes)
+        if error:
+            raise error
+        return take_pending()
+
+    class Stop(Exception):
+        pass
+
+    passes = iter([None, Stop()])
+
+    def sleep(seconds: float) -> None:
+        stop = next(passes)
+        if stop:
+            raise stop
+
+    monkeypatch.setattr(listing_view_counter, "take_pending", flaky_take_pending)
+    monkeypatch.setattr(listing_view_flusher, "SessionLocal", lambda: db_session)
+    monkeypatch.setattr(listing_view_flusher.time, "sleep", sleep)
+    monkeypatch.setattr("sys.argv", ["listing_view_flusher"])
+
+    with pytest.raises(Stop):
+        listing_view_flusher.main()
+
+    assert "Flushing listing view counts failed" in caplog.text
+    db_session.expire_all()
+    assert ListingViewFlusher(db_session).views.get(jacket.id).view_count == 1
+
+
+def test_only_the_seller_sees_listing_views(client: TestClient, db_session: Session) -> None:
+    listing_id = _listing(db_session).id
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=uuid.uuid4(), role=UserRole.user, is_active=True)
+
+    response = client.get(f"/listings/{listing_id}/views", headers={"Authorization": "Bearer test"})
+
+    assert response.status_code == 403
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db.models.address import Address
+from app.db.models.category import Category
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.order import Order, OrderStatus
+from app.db.models.user import User
+from app.jobs.price_suggestions import PriceSuggestionsJob, group_quartiles
+from app.services.price_suggestion_service import price_suggestion_book
+
+
+NOW = datetime(2025, 12, 23, 3, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_book() -> None:
+    price_suggestion_book.clear()
+    yield
+    price_suggestion_book.clear()
+
+
+def _parties(db: Session) -> tuple[uuid.UUID, uuid.UUID, uuid.UUID]:
+    seller = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com")
+    buyer = User(name="Buyer", email=f"{uuid.uuid4().hex}@example.com")
+    db.add_all([seller, buyer])
+    db.flush()
+    address = Address(user_id=buyer.id, line1="1 Rue Test", city="Rabat")
+    db.add(address)
+    db.flush()
+    return seller.id, buyer.id, address.id
+
+
+def _sale(
+    db: Session,
+    parties: tuple[uuid.UUID, uuid.UUID, uuid.UUID],
+    category_id: uuid.UUID,
+    price: str,
+    *,
+    brand: str | None = None,
+    condition: ListingCondition = ListingCondition.good,
+    status: OrderStatus = OrderStatus.completed,
+    created_at: datetime = NOW - timedelta(days=1),
+) -> Order:
+    seller_id, buyer_id, address_id = parties
+    listing = Listing(
+        user_id=seller_id,
+        title="Sneakers",
+        brand=brand,
+        category_id=category_id,
+        condition=condition,
+        price=Decimal(price),
+        city="Rabat",
+        status=ListingStatus.sold,
+    )
+    db.add(listing)
+    db.flush()
+    order = Order(
+        listing_id=listing.id,
+        buyer_id=buyer_id,
+        seller_id=seller_id,
+        shipping_address_id=address_id,
+        shipping_address_snapshot={"city": "Rabat"},
+        price_amount=Decimal(price),
+        status=status,
+        idempotency_key=uuid.uuid4().hex,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+    db.add(order)
+    db.flush()
+    return order
+
+
+def _category(db: Session, name: str) -> uuid.UUID:
+    category = Category(name=name)
+    db.add(category)
+    db.flush()
+    return category.id
+
+
+def test_group_quartiles_match_numpy() -> None:
+    rng = np.random.default_rng(3)
+    codes = rng.integers(0, 7, size=500)
+    cents = rng.integers(1_000, 90_000, size=500)
+    counts, bands = group_quartiles(codes, cents, 7)
+
+    for code in range(7):
+        values = cents[codes == code]
+        assert counts[code] == len(values)
+        assert np.allclose(bands[code], np.quantile(values, [0.25, 0.5, 0.75]))
+
+
+def test_price_suggestion_falls_back_to_coarser_bands(client: TestClient, db_session: Session) -> None:
+    parties = _parties(db_session)
+    shoes = _category(db_session, "Shoes")
+    for price in ("100", "200", "300", "400", "500"):
+        _sale(db_session, parties, shoes, price, brand=" NIKE ")
+    for price in ("50", "60", "70", "80", "90"):
+        _sale(db_session, parties, shoes, price, condition=ListingCondition.fair)
+    _sale(db_session, parties, shoes, "9000", status=OrderStatus.canceled)
+    _sale(db_session, parties, shoes, "9000", created_at=NOW - timedelta(days=200))
+    db_session.commit()
+    PriceSuggestionsJob(db_session).run(now=NOW)
+
+    response = client.get(
+        "/listings/price-suggestion", params={"category_id": str(shoes), "condition": "good", "brand": "nike"}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["basis"] == "brand"
+    assert body["sample_size"] == 5
+    assert [Decimal(body[key]) for key in ("low", "median", "high")] == [Decimal("200"), Decimal("300"), Decimal("400")]
+
+    body = client.get(
+        "/listings/price-suggestion", params={"category_id": str(shoes), "condition": "fair", "brand": "Adidas"}
+    ).json()
+    assert body["basis"] == "condition"
+    assert Decimal(body["median"]) == Decimal("70")
+
+    body = client.get("/listings/price-suggestion", params={"category_id": str(shoes), "condition": "new"}).json()
+    assert body["basis"] == "category"
+    assert body["sample_size"] == 10
+
+    body = client.get("/listings/price-suggestion", params={"category_id": str(uuid.uuid4())}).json()
+    assert body["basis"] is None
+    assert body["median"] is None
+    assert body["sample_size"] == 0
+
+
+def test_incremental_run_recomputes_only_changed_categories(db_session: Session) -> None:
+    parties = _parties(db_session)
+    shoes = _category(db_session, "Shoes")
+    bags = _category(db_session, "Bags")
+    for price in ("100", "200", "300", "400", "500"):
+        _sale(db_session, parties, shoes, price, created_at=NOW - timedelta(days=5))
+    bag_orders = [
+        _sale(db_session, parties, bags, price, created_at=NOW - timedelta(days=5))
+        for price in ("10", "20", "30", "40", "50")
+    ]
+    db_session.commit()
+    job = PriceSuggestionsJob(db_session)
+    assert job.run(now=NOW) == 4
+
+    later = NOW + timedelta(hours=1)
+    bag_orders[0].status = OrderStatus.canceled
+    bag_orders[0].updated_at = later
+    db_session.commit()
+    # Shoes are untouched, so their band is left alone; bags drop below the minimum sample size.
+    assert job.run(now=later) == 0
+    assert price_suggestion_book.lookup(job.suggestions, shoes, "good", "")[0].median == Decimal("300")
+    assert price_suggestion_book.lookup(job.suggestions, bags, "good", "") is None
+
+    # Shoe sales ageing out of the window count as a change too.
+    assert job.run(now=NOW + timedelta(days=90)) == 0
+    price_suggestion_book.clear()
+    assert price_suggestion_book.lookup(job.suggestions, shoes, "good", "") is None
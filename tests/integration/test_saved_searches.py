@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.v1 import deps
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.notification import Notification, NotificationEvent
+from app.db.models.saved_search_alert import SavedSearchAlert
+from app.db.models.user import User, UserRole
+from app.jobs.saved_search_alerts import SavedSearchAlertsJob
+from app.main import app
+from app.services import saved_search_service
+from app.services.notification_service import NotificationService
+
+
+def _user(db: Session, role: UserRole = UserRole.user) -> uuid.UUID:
+    user = User(name="User", email=f"{uuid.uuid4().hex}@example.com", role=role)
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def _as(user_id: uuid.UUID, role: UserRole = UserRole.user) -> None:
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=user_id, role=role, is_active=True)
+
+
+def _save_search(client: TestClient, user_id: uuid.UUID, **filters: object) -> None:
+    _as(user_id)
+    response = client.post("/saved-searches", json=filters)
+    assert response.status_code == 201, response.json()
+
+
+def _pending_listing(db: Session, seller_id: uuid.UUID, *, city: str, price: str) -> uuid.UUID:
+    listing = Listing(
+        user_id=seller_id,
+        title="Veste en jean",
+        condition=ListingCondition.good,
+        price=Decimal(price),
+        city=city,
+        latitude=34.0384 if city == "Sale" else None,
+        longitude=-6.7985 if city == "Sale" else None,
+        status=ListingStatus.pending,
+    )
+    db.add(listing)
+    db.commit()
+    return listing.id
+
+
+def _alerted_users(db: Session) -> set[uuid.UUID]:
+    notifications = db.query(Notification).filter(Notification.event == NotificationEvent.saved_search_match).all()
+    return {notification.user_id for notification in notifications}
+
+
+def test_approval_alerts_each_matching_user_once(client: TestClient, db_session: Session) -> None:
+    admin_id = _user(db_session, UserRole.admin)
+    seller_id = _user(db_session)
+    by_city, by_distance, too_cheap, other_city = (_user(db_session) for _ in range(4))
+    _save_search(client, by_city, city="Sale", max_price="100")
+    _save_search(client, by_city, condition="good")
+    _save_search(client, by_distance, near="Rabat", radius_km=30)
+    _save_search(client, too_cheap, min_price="500")
+    _save_search(client, other_city, city="Rabat")
+    _save_search(client, seller_id)
+    listing_id = _pending_listing(db_session, seller_id, city="Sale", price="80.00")
+
+    _as(admin_id, UserRole.admin)
+    response = client.post(f"/listings/{listing_id}/approve")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "approved"
+    db_session.expire_all()
+    assert _alerted_users(db_session) == {by_city, by_distance}
+    assert db_session.query(Notification).count() == 2
+    assert db_session.get(User, by_city).has_unread_notifications is True
+    assert client.post(f"/listings/{listing_id}/approve").status_code == 409
+
+
+def test_approval_fans_out_in_batches(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(saved_search_service, "MATCH_NOTIFICATION_BATCH_SIZE", 2)
+    admin_id = _user(db_session, UserRole.admin)
+    seller_id = _user(db_session)
+    subscribers = {_user(db_session) for _ in range(5)}
+    for user_id in subscribers:
+        _save_search(client, user_id, city="Rabat")
+    listing_id = _pending_listing(db_session, seller_id, city="Rabat", price="40.00")
+
+    _as(admin_id, UserRole.admin)
+    client.post(f"/listings/{listing_id}/approve")
+
+    db_session.expire_all()
+    assert _alerted_users(db_session) == subscribers
+
+
+def test_saved_searches_are_private_and_capped(client: TestClient, db_session: Session) -> None:
+    owner_id, other_id = _user(db_session), _user(db_session)
+    _save_search(client, owner_id, name="Jackets", q="veste", near="Rabat")
+
+    saved = client.get("/saved-searches/me").json()
+    assert [(item["name"], item["q"], item["near"], item["radius_km"]) for item in saved] == [
+        ("Jackets", "veste", "Rabat", 25.0)
+    ]
+    _as(other_id)
+    assert client.get("/saved-searches/me").json() == []
+    assert client.delete(f"/saved-searches/{saved[0]['id']}").status_code == 404
+    assert client.post("/saved-searches", json={"near": "Atlantis"}).status_code == 400
+
+    for _ in range(saved_search_service.MAX_SAVED_SEARCHES):
+        client.post("/saved-searches", json={"city": "Rabat"})
+    assert client.post("/saved-searches", json={"city": "Rabat"}).status_code == 400
+
+
+def test_failed_fan_out_is_finished_by_the_job_without_repeats(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(saved_search_service, "MATCH_NOTIFICATION_BATCH_SIZE", 2)
+    admin_id = _user(db_session, UserRole.admin)
+    seller_id = _user(db_session)
+    subscribers = {_user(db_session) for _ in range(5)}
+    for user_id in subscribers:
+        _save_search(client, user_id, city="Rabat")
+    listing_id = _pending_listing(db_session, seller_id, city="Rabat", price="40.00")
+
+    notify = NotificationService.notify_saved_search_matches
+    calls = []
+
+    def fail_second_batch(self: NotificationService, listing: Listing, user_ids: list[uuid.UUID]) -> None:
+        calls.append(user_ids)
+        if len(calls) == 2:
+            raise RuntimeError("notification store unavailable")
+        notify(self, listing, user_ids)
+
+    monkeypatch.setattr(NotificationService, "notify_saved_search_matches", fail_second_batch)
+    _as(admin_id, UserRole.admin)
+    assert client.post(f"/listings/{listing_id}/approve").status_code == 200
+
+    db_session.expire_all()
+    assert _alerted_users(db_session) == set(sorted(subscribers)[:2])
+    assert db_session.get(SavedSearchAlert, listing_id).after_user_id == sorted(subscribers)[1]
+
+    monkeypatch.setattr(NotificationService, "notify_saved_search_matches", notify)
+    assert SavedSearchAlertsJob(db_session).run() == 3
+    db_session.expire_all()
+    assert _alerted_users(db_session) == subscribers
+    assert db_session.query(Notification).count() == 5
+    assert db_session.get(SavedSearchAlert, listing_id) is None
+    assert SavedSearchAlertsJob(db_session).run() == 0
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db.models.category import Category
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.listing_similarity import ListingSimilarity
+from app.db.models.user import User
+from app.db.repositories.listing_repository import record_listing_write
+
+pytest.importorskip("scipy")
+
+from app.jobs.similar_listings import SimilarListingsJob  # noqa: E402
+
+
+def _seller(db: Session) -> uuid.UUID:
+    user = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com")
+    db.add(user)
+    db.flush()
+    return user.id
+
+
+def _listing(db: Session, seller_id: uuid.UUID, title: str, category_id: uuid.UUID | None = None, **extra: object) -> uuid.UUID:
+    listing = Listing(
+        user_id=seller_id,
+        title=title,
+        category_id=category_id,
+        condition=ListingCondition.good,
+        price=Decimal("100.00"),
+        city="Rabat",
+        status=ListingStatus.approved,
+        **extra,
+    )
+    db.add(listing)
+    db.flush()
+    record_listing_write(db, listing.id)
+    return listing.id
+
+
+def _neighbours(db: Session) -> dict[uuid.UUID, list[uuid.UUID]]:
+    neighbours: dict[uuid.UUID, list[uuid.UUID]] = {}
+    for row in db.query(ListingSimilarity).order_by(ListingSimilarity.listing_id, ListingSimilarity.position):
+        neighbours.setdefault(row.listing_id, []).append(row.similar_listing_id)
+    return neighbours
+
+
+def test_similar_listings_stay_within_category(client: TestClient, db_session: Session) -> None:
+    seller_id = _seller(db_session)
+    shoes, bags = Category(name="Shoes"), Category(name="Bags")
+    db_session.add_all([shoes, bags])
+    db_session.flush()
+    air_max = _listing(db_session, seller_id, "Nike Air Max 90", shoes.id, brand="Nike")
+    air_max_white = _listing(db_session, seller_id, "Nike Air Max blanches", shoes.id, brand="Nike")
+    _listing(db_session, seller_id, "Stan Smith", shoes.id, brand="Adidas")
+    _listing(db_session, seller_id, "Sac Nike Air Max", bags.id, brand="Nike")
+    sold = _listing(db_session, seller_id, "Nike Air Max 95", shoes.id, brand="Nike")
+    db_session.commit()
+
+    SimilarListingsJob(db_session).run()
+    db_session.query(Listing).filter(Listing.id == sold).update({Listing.status: ListingStatus.sold})
+    db_session.commit()
+
+    response = client.get(f"/listings/{air_max}/similar", params={"fields": "title"})
+
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"id": str(air_max_white), "title": "Nike Air Max blanches"}]
+    assert client.get(f"/listings/{uuid.uuid4()}/similar").status_code == 404
+
+
+def test_incremental_run_follows_listing_changes(db_session: Session) -> None:
+    seller_id = _seller(db_session)
+    titles = ["veste jean bleu", "veste cuir noir", "robe soie rouge", "robe lin blanche", "sac toile vert", "sac paille"]
+    listing_ids = [_listing(db_session, seller_id, title) for title in titles]
+    db_session.commit()
+    job = SimilarListingsJob(db_session, top_k=2)
+    job.run()
+
+    twin = _listing(db_session, seller_id, "veste cuir noir")
+    db_session.query(Listing).filter(Listing.id == listing_ids[4]).update({Listing.title: "robe soie rouge"})
+    record_listing_write(db_session, listing_ids[4])
+    db_session.query(Listing).filter(Listing.id == listing_ids[3]).delete()
+    record_listing_write(db_session, listing_ids[3], deleted=True)
+    db_session.commit()
+
+    assert job.run() > 0
+    incremental = _neighbours(db_session)
+    assert incremental[listing_ids[1]][0] == twin
+    assert incremental[twin][0] == listing_ids[1]
+    assert incremental[listing_ids[2]][0] == listing_ids[4]
+    assert listing_ids[3] not in incremental
+    assert all(listing_ids[3] not in neighbours for neighbours in incremental.values())
+
+    job.run(full=True)
+    assert {key: value[0] for key, value in _neighbours(db_session).items()} == {
+        key: value[0] for key, value in incremental.items()
+    }
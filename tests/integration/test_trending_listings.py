@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.cache import listing_detail_cache
+from app.core.trending import TrendingEvent, trending_listings
+from app.db.models.listing import Listing, ListingCondition, ListingStatus
+from app.db.models.user import User
+from app.jobs.trending_listings import TrendingListingsJob
+from tests.fake_redis import InMemoryRedis
+
+
+T0 = 1_766_000_000.0
+HALF_LIFE = trending_listings.half_life_seconds
+
+
+@pytest.fixture(autouse=True)
+def _redis(monkeypatch: pytest.MonkeyPatch) -> InMemoryRedis:
+    redis = InMemoryRedis()
+    monkeypatch.setattr(trending_listings, "client", redis)
+    monkeypatch.setattr(listing_detail_cache, "client", InMemoryRedis())
+    return redis
+
+
+def _listings(db: Session, *titles: str, status: ListingStatus = ListingStatus.approved) -> list[uuid.UUID]:
+    seller = User(name="Seller", email=f"{uuid.uuid4().hex}@example.com")
+    db.add(seller)
+    db.flush()
+    listings = [
+        Listing(
+            user_id=seller.id,
+            title=title,
+            condition=ListingCondition.good,
+            price=Decimal("100.00"),
+            city="Rabat",
+            status=status,
+        )
+        for title in titles
+    ]
+    db.add_all(listings)
+    db.commit()
+    return [listing.id for listing in listings]
+
+
+def test_recent_events_outweigh_older_ones(client: TestClient, db_session: Session) -> None:
+    jacket, boots = _listings(db_session, "Jacket", "Boots")
+    (sold,) = _listings(db_session, "Bag", status=ListingStatus.sold)
+
+    for _ in range(3):
+        trending_listings.record(jacket, TrendingEvent.view, now=T0)
+    # Two half-lives later one favorite (weight 5, grown 4x) beats three old views.
+    trending_listings.record(boots, TrendingEvent.favorite, now=T0 + 2 * HALF_LIFE)
+    trending_listings.record(sold, TrendingEvent.order, now=T0 + 2 * HALF_LIFE)
+
+    assert TrendingListingsJob(db_session).run(now=T0 + 2 * HALF_LIFE) == 2
+    scores = trending_listings.client.sorted_sets[trending_listings.key]
+    assert scores == pytest.approx({str(boots): 5.0, str(jacket): 0.75})
+
+    first = client.get("/listings/trending", params={"page_size": 1, "fields": "title"}).json()
+    assert first == {"items": [{"id": str(boots), "title": "Boots"}], "page": 1, "page_size": 1, "has_more": True}
+    second = client.get("/listings/trending", params={"page": 2, "page_size": 1, "fields": "title"}).json()
+    assert [item["title"] for item in second["items"]] == ["Jacket"]
+    assert second["has_more"] is False
+
+
+def test_rescale_drops_decayed_scores(db_session: Session) -> None:
+    (jacket,) = _listings(db_session, "Jacket")
+    trending_listings.record(jacket, TrendingEvent.view, now=T0)
+
+    TrendingListingsJob(db_session).run(now=T0 + 10 * HALF_LIFE)
+
+    assert trending_listings.page(offset=0, limit=10) == []
+
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@contextmanager
+def assert_max_queries(engine: Engine, limit: int) -> Iterator[list[str]]:
+    with count_queries(engine) as statements:
+        yield statements
+    assert len(statements) <= limit, (
+        f"Expected at most {limit} SQL statements, got {len(statements)}:\n" + "\n".join(statements)
+    )
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from app.core.cache import GenerationalCache, VersionedCache
+from tests.fake_redis import InMemoryRedis
+
+
+def _cache() -> GenerationalCache:
+    cache = GenerationalCache(prefix="test", ttl_seconds=30, track_stats=True, generation_key="test:gen")
+    cache.client = InMemoryRedis()
+    return cache
+
+
+def test_fetch_uses_cached_value_until_invalidated() -> None:
+    cache = _cache()
+    calls: list[int] = []
+
+    def loader() -> str:
+        calls.append(1)
+        return f"value-{len(calls)}"
+
+    assert cache.fetch("key", loader) == "value-1"
+    assert cache.fetch("key", loader) == "value-1"
+
+    cache.invalidate()
+
+    assert cache.fetch("key", loader) == "value-2"
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+
+def test_entry_loaded_across_an_invalidation_is_not_served() -> None:
+    cache = _cache()
+
+    def racing_loader() -> str:
+        # A write commits while the value is being computed from the old rows.
+        cache.invalidate()
+        return "stale"
+
+    assert cache.fetch("key", racing_loader) == "stale"
+    assert cache.get("key") is None
+    assert cache.fetch("key", lambda: "fresh") == "fresh"
+    assert cache.get("key") == "fresh"
+
+
+def test_versioned_entry_loaded_across_a_write_is_not_served() -> None:
+    cache = VersionedCache(prefix="test:detail", ttl_seconds=30)
+    cache.client = InMemoryRedis()
+    cache.set("other", "kept")
+
+    def racing_loader() -> str:
+        # The write commits and drops the key after the loader has read the old row.
+        cache.delete("key")
+        return "stale"
+
+    assert cache.fetch("key", racing_loader) == "stale"
+    assert cache.get("key") is None
+    assert cache.fetch_many(["key", "other", "gone"], lambda missed: {"key": "fresh"}) == ["fresh", "kept", None]
+    assert cache.get_many(["key", "other"]) == ["fresh", "kept"]
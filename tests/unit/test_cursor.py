@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.utils.cursor import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    key = (Decimal("650.00"), datetime(2025, 1, 20, 13, 23, 11, tzinfo=timezone.utc), uuid4())
+    token = encode_cursor("price", key)
+    assert decode_cursor(token, sort_by="price", types=(Decimal, datetime, UUID)) == key
+
+
+def test_cursor_rejects_other_sort() -> None:
+    token = encode_cursor("newest", (datetime.now(timezone.utc), uuid4()))
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, sort_by="oldest", types=(datetime, UUID))
+
+
+def test_cursor_rejects_garbage() -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor", sort_by="newest", types=(datetime, UUID))
+
+
+def test_cursor_is_bound_to_its_scope() -> None:
+    key = (0.5, datetime.now(timezone.utc), uuid4())
+    token = encode_cursor("rank", key, scope="wool jacket")
+    assert decode_cursor(token, sort_by="rank", types=(float, datetime, UUID), scope="wool jacket") == key
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, sort_by="rank", types=(float, datetime, UUID), scope="leather boots")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, sort_by="rank", types=(float, datetime, UUID))
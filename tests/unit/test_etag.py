@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from app.utils.etag import etag_matches, strong_etag
+
+
+def test_etag_matches_any_listed_tag_including_weak_forms() -> None:
+    etag = strong_etag('{"id":1}')
+
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
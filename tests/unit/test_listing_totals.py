@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from app.api.v1.schemas.listings import ListingTotalKind
+from app.core.cache import GenerationalCache
+from app.db.repositories.listing_repository import ListingSearchFilters
+from app.services.listing_totals import ListingTotalsStrategy
+from tests.fake_redis import InMemoryRedis
+
+
+class _Repository:
+    def __init__(self, *, estimate: int | None, count: int) -> None:
+        self.estimate = estimate
+        self.count = count
+        self.calls: list[str] = []
+
+    def estimate_listing_count(self, filters: ListingSearchFilters) -> int | None:
+        self.calls.append("estimate")
+        return self.estimate
+
+    def count_listings(self, filters: ListingSearchFilters) -> int:
+        self.calls.append("count")
+        return self.count
+
+
+def _strategy(repository: _Repository) -> ListingTotalsStrategy:
+    cache = GenerationalCache(prefix="test:count", ttl_seconds=30, generation_key="test:generation")
+    cache.client = InMemoryRedis()
+    return ListingTotalsStrategy(repository, cache=cache, estimate_threshold=1_000)
+
+
+def test_broad_filters_are_estimated_once() -> None:
+    repository = _Repository(estimate=50_000, count=49_871)
+    strategy = _strategy(repository)
+
+    assert strategy.resolve(ListingSearchFilters(), include_total=True) == (50_000, ListingTotalKind.estimated)
+    assert strategy.resolve(ListingSearchFilters(), include_total=True) == (50_000, ListingTotalKind.estimated)
+    assert repository.calls == ["estimate"]
+
+
+def test_narrow_filters_are_counted_once() -> None:
+    repository = _Repository(estimate=40, count=37)
+    strategy = _strategy(repository)
+    filters = ListingSearchFilters(city="Rabat")
+
+    assert strategy.resolve(filters, include_total=True) == (37, ListingTotalKind.exact)
+    assert strategy.resolve(filters, include_total=True) == (37, ListingTotalKind.exact)
+    assert repository.calls == ["estimate", "count"]
+
+
+def test_without_a_planner_estimate_the_total_is_counted() -> None:
+    repository = _Repository(estimate=None, count=5_000)
+
+    assert _strategy(repository).resolve(ListingSearchFilters(), include_total=True) == (5_000, ListingTotalKind.exact)
+
+
+def test_skipped_totals_touch_neither_cache_nor_database() -> None:
+    repository = _Repository(estimate=50_000, count=49_871)
+
+    assert _strategy(repository).resolve(ListingSearchFilters(), include_total=False) == (None, None)
+    assert repository.calls == []
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+
+from app.utils import minhash
+
+
+TITLE = "iPhone 12 Pro Max 256Go bleu pacifique, très bon état, batterie 89%, boîte et chargeur"
+
+
+def test_similarity_estimates_shingle_overlap() -> None:
+    original = minhash.signature(TITLE)
+    reposted = minhash.signature(TITLE.replace("89%", "88%").upper())
+    unrelated = minhash.signature("Robe d'été en lin blanc, taille M, jamais portée")
+
+    assert minhash.similarity(original, minhash.signature(TITLE)) == 1.0
+    assert minhash.similarity(original, reposted) >= 0.8
+    assert minhash.similarity(original, unrelated) < 0.2
+
+
+def test_band_keys_are_stable_and_namespaced() -> None:
+    signature = minhash.signature(TITLE)
+    seller, other_seller = uuid.uuid4().bytes, uuid.uuid4().bytes
+
+    keys = minhash.band_keys(signature, namespace=seller)
+
+    assert len(keys) == minhash.LSH_BANDS
+    assert keys == minhash.band_keys(minhash.signature(TITLE), namespace=seller)
+    assert not set(keys) & set(minhash.band_keys(signature, namespace=other_seller))
+    assert all(-(2**63) <= key < 2**63 for key in keys)